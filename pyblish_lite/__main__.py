@@ -1,14 +1,51 @@
-from .app import show
-
-
 if __name__ == '__main__':
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--headless", action="store_true",
+                        help="Publish without a window, "
+                             "exiting with 1 on failure")
+    parser.add_argument("--output",
+                        help="Write summary of --headless to this file, "
+                             "rather than stdout")
+    parser.add_argument("--invalidate-discovery", action="store_true",
+                        help="Clear the cache of discovered plug-ins")
+    parser.add_argument("--time-discovery", action="store_true",
+                        help="Discover plug-ins, printing time spent "
+                             "importing each module")
+    parser.add_argument("--generate-manifest", nargs="*", metavar="PATH",
+                        help="Describe plug-ins of each path for lazy "
+                             "loading, defaulting to registered paths")
 
     args = parser.parse_args()
 
+    if args.invalidate_discovery:
+        from . import discovery
+        discovery.invalidate()
+        sys.exit(0)
+
+    if args.time_discovery:
+        from . import discovery
+
+        discovery.discover()
+        for path, timing in discovery.timings():
+            print("%.4fs %s (%s)" % (
+                sum(timing.values()),
+                path,
+                ", ".join("%s %.4fs" % item for item in sorted(timing.items()))
+            ))
+        sys.exit(0)
+
+    if args.generate_manifest is not None:
+        from . import manifest
+        import pyblish.api
+
+        for path in args.generate_manifest or pyblish.api.plugin_paths():
+            manifest.generate(path)
+        sys.exit(0)
+
     if args.debug:
         from . import mock
         import pyblish.api
@@ -16,4 +53,9 @@ if __name__ == '__main__':
         for Plugin in mock.plugins:
             pyblish.api.register_plugin(Plugin)
 
+    if args.headless:
+        from . import headless
+        sys.exit(headless.publish(args.output))
+
+    from .app import show
     show()
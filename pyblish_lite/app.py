@@ -1,6 +1,7 @@
 from __future__ import print_function
 
 import contextlib
+import functools
 import os
 import sys
 
@@ -12,6 +13,15 @@ self = sys.modules[__name__]
 # Maintain reference to currently opened window
 self._window = None
 
+# Stylesheet of window, read once
+self._css = None
+
+# Fonts and translator are installed once per application
+self._installed = None
+
+# Remaining steps of `prewarm`, run at idle time
+self._steps = []
+
 
 @contextlib.contextmanager
 def application():
@@ -65,40 +75,110 @@ def install_fonts():
             sys.stdout.write("Installed %s\n" % font)
 
 
-def on_destroyed():
-    """Remove internal reference to window on window destroyed"""
-    self._window = None
+def install(app):
+    """Install fonts and translator into `app`, unless already installed"""
+    if self._installed is app:
+        return
 
+    compat.init()
+    install_fonts()
+    install_translator(app)
 
-def show(parent=None):
-    with open(util.get_asset("app.css")) as f:
-        css = f.read()
+    self._installed = app
 
-        # Make relative paths absolute
-        root = util.get_asset("").replace("\\", "/")
-        css = css.replace("url(\"", "url(\"%s" % root)
 
-    with application() as app:
-        compat.init()
+def load_css():
+    if self._css is None:
+        with open(util.get_asset("app.css")) as f:
+            css = f.read()
+
+            # Make relative paths absolute
+            root = util.get_asset("").replace("\\", "/")
+            self._css = css.replace("url(\"", "url(\"%s" % root)
+
+    return self._css
+
+
+def on_destroyed(window):
+    """Remove internal reference to `window` on destroyed, unless replaced"""
+    if self._window is window:
+        self._window = None
 
-        install_fonts()
-        install_translator(app)
 
+def create_window(parent=None):
+    """Return window, creating it hidden unless it already exists"""
+
+    # Closed, yet to be destroyed
+    if self._window is not None and self._window.state["is_closing"]:
+        self._window = None
+
+    if self._window is None:
         ctrl = control.Controller()
 
-        if self._window is None:
-            self._window = window.Window(ctrl, parent)
-            self._window.destroyed.connect(on_destroyed)
+        self._window = window.Window(ctrl, parent)
+        self._window.destroyed.connect(
+            functools.partial(on_destroyed, self._window)
+        )
+
+        font = QtGui.QFont("Open Sans", 8, QtGui.QFont.Normal)
+        self._window.setFont(font)
+        self._window.setStyleSheet(load_css())
+
+    return self._window
+
+
+def prewarm(parent=None):
+    """Prepare window and plug-ins ahead of :func:`show`
+
+    Fonts, stylesheet, window and plug-ins are prepared one step at a
+    time whenever the host is otherwise idle, such that a subsequent
+    :func:`show` need only run collectors. Call this once the host has
+    started its QApplication.
 
+    """
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        print("No QApplication to prewarm..")
+        return
+
+    def preload():
+        create_window(parent).controller.preload()
+
+    self._steps[:] = [
+        lambda: install(app),
+        load_css,
+        lambda: create_window(parent),
+        preload,
+    ]
+
+    QtCore.QTimer.singleShot(0, _next_step)
+
+
+def _next_step():
+    if not self._steps:
+        return
+
+    self._steps.pop(0)()
+
+    if self._steps:
+        QtCore.QTimer.singleShot(0, _next_step)
+
+
+def show(parent=None):
+    with application() as app:
+
+        # Anything not yet prewarmed is done right away
+        self._steps[:] = []
+
+        install(app)
+
+        create_window(parent)
         self._window.show()
         self._window.activateWindow()
         self._window.resize(*settings.WindowSize)
         self._window.setWindowTitle(settings.WindowTitle)
 
-        font = QtGui.QFont("Open Sans", 8, QtGui.QFont.Normal)
-        self._window.setFont(font)
-        self._window.setStyleSheet(css)
-
         self._window.reset()
 
         return self._window
@@ -0,0 +1,261 @@
+"""Persistent cache of plug-in results
+
+Plug-ins declaring `cacheable = True` are taken to be pure functions of
+the data they declare in `cache_data`, along with the files whose paths
+are held by the data keys of `requires_files`. Plug-ins without
+`cache_data` are keyed by their `requires_data` instead. Note that
+`requires_data` also schedules a plug-in by the dependency graph, where
+it may be processed off the main thread; plug-ins calling a host API
+such as that of Maya should declare `cache_data`. Successful results
+of such plug-ins are stored on disk, keyed by plug-in identity, version
+and source along with a hash of these inputs. Subsequent runs with the
+same inputs replay the stored result and records rather than processing
+the plug-in again, across resets and sessions alike.
+
+Cacheable plug-ins must not modify any data, as there is nothing to
+modify when replaying a result.
+
+Usage:
+    >>> import pyblish.api
+    >>> class ValidateResolution(pyblish.api.InstancePlugin):
+    ...     order = pyblish.api.ValidatorOrder
+    ...     cacheable = True
+    ...     cache_data = ["resolution"]
+    ...     requires_files = ["sourcePath"]
+
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+
+from collections import OrderedDict
+
+import pyblish.lib
+
+from . import pool
+
+
+class ResultCache(object):
+    """Size-bounded cache of results on disk, evicting least recently used
+
+    Arguments:
+        directory (str): Where to store results
+        size (int): Total size of stored results, in bytes
+
+    """
+
+    extension = ".result"
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # Size of each stored result by path, least recently used first,
+        # read from disk once and kept up to date from then on
+        self._entries = None
+        self._total = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def replay(self, key, plugin, context, instance):
+        """Return stored result of `key`, or None if not cached"""
+        path = self.path(key)
+
+        try:
+            with open(path, "rb") as f:
+                stored = pickle.load(f)
+
+            # Most recently used
+            os.utime(path, None)
+
+            with self._lock:
+                if self._entries is not None and path in self._entries:
+                    self._entries[path] = self._entries.pop(path)
+
+        except Exception:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        # Records were emitted on behalf of this thread
+        thread = threading.current_thread()
+        records = []
+        for attributes in stored["records"]:
+            record = logging.makeLogRecord(attributes)
+            record.thread = thread.ident
+            record.threadName = thread.name
+            records.append(record)
+
+        result = {
+            "success": True,
+            "plugin": plugin,
+            "instance": instance,
+            "action": None,
+            "error": None,
+            "records": records,
+            "duration": 0,
+            "progress": 0,
+            "context": context,
+            "cached": True,
+        }
+
+        context.data.setdefault("results", list()).append(result)
+        pyblish.lib.emit("pluginProcessed", result=result)
+
+        return result
+
+    def store(self, key, result):
+        """Store successful `result` under `key`"""
+        if not result["success"]:
+            return
+
+        stored = {
+            "records": [
+                pool._record(record) for record in result["records"]
+            ],
+        }
+
+        with self._lock:
+            try:
+                if not os.path.isdir(self.directory):
+                    os.makedirs(self.directory)
+
+                path = self.path(key)
+                temp = "%s.%d.tmp" % (path, threading.current_thread().ident)
+                with open(temp, "wb") as f:
+                    pickle.dump(stored, f, pickle.HIGHEST_PROTOCOL)
+
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(temp, path)
+
+                if self._entries is None:
+                    self._scan()
+                else:
+                    size = os.path.getsize(path)
+                    self._total += size - self._entries.pop(path, 0)
+                    self._entries[path] = size
+
+                self.evict()
+
+            except (IOError, OSError):
+                # Caching is merely an optimisation
+                pass
+
+    def evict(self):
+        """Remove least recently used results in excess of `size`"""
+        if self._entries is None:
+            self._scan()
+
+        while self._total > self.size and self._entries:
+            path, size = self._entries.popitem(last=False)
+            self._total -= size
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _scan(self):
+        """Read size and last use of every stored result from disk"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.extension):
+                continue
+
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        self._entries = OrderedDict(
+            (path, size) for _, size, path in sorted(entries)
+        )
+        self._total = sum(self._entries.values())
+
+    def clear(self):
+        """Remove every stored result"""
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return
+
+            for name in os.listdir(self.directory):
+                if name.endswith(self.extension):
+                    os.remove(os.path.join(self.directory, name))
+
+            self._entries = OrderedDict()
+            self._total = 0
+
+
+def is_cacheable(plugin):
+    return bool(getattr(plugin, "cacheable", False))
+
+
+def data_keys(plugin):
+    """Return keys of data a result of `plugin` depends on"""
+    keys = getattr(plugin, "cache_data", None)
+    if keys is None:
+        keys = getattr(plugin, "requires_data", None)
+    return keys or []
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime, stat.st_size
+
+
+def key(plugin, context, instance):
+    """Return key of result of `plugin` with its inputs, or None
+
+    None is returned when any input may not be hashed.
+
+    """
+
+    entity = context if instance is None else instance
+
+    inputs = {
+        "plugin": pool.plugin_key(plugin),
+        "version": list(getattr(plugin, "version", ())),
+        "source": _stat(plugin.__module__),
+        "name": entity.data.get("name"),
+        "families": entity.data.get("families"),
+        "family": entity.data.get("family"),
+        "data": dict(
+            (name, entity.data.get(name)) for name in data_keys(plugin)
+        ),
+        "files": {},
+    }
+
+    for name in getattr(plugin, "requires_files", None) or []:
+        paths = entity.data.get(name)
+        if not isinstance(paths, (list, tuple)):
+            paths = [paths]
+
+        inputs["files"][name] = [(path, _stat(path)) for path in paths]
+
+    try:
+        serialized = json.dumps(inputs, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def default_directory():
+    return os.path.join(
+        os.path.expanduser("~"), ".cache", "pyblish_lite", "results"
+    )
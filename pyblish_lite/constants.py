@@ -56,8 +56,15 @@ Roles = roles(
 
     "TerminalItemTypeRole",
 
+    # Title and lines of each value cut short in a detail
+    "TerminalRemainderRole",
+
     "IntentItemValue",
 
+    # Seconds spent processing, in total
+    "WallTimeRole",
+    "CpuTimeRole",
+
     type_name="ModelRoles"
 )
 
@@ -77,6 +84,7 @@ PluginStates = flags(
     "WasSkipped",
     "HasWarning",
     "HasError",
+    "WasCached",
     type_name="PluginState"
 )
 
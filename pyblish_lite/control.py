@@ -7,9 +7,14 @@ an active window manager; such as via Travis-CI.
 """
 import os
 import sys
+import time
+import threading
 import traceback
+import collections
+import multiprocessing
 
 from .vendor.Qt import QtCore
+from .vendor.six.moves import queue
 
 import pyblish.api
 import pyblish.util
@@ -17,7 +22,10 @@ import pyblish.logic
 import pyblish.lib
 import pyblish.version
 
-from . import util
+from . import (
+    cache, discovery, families, manifest, pool, profiler, records, settings,
+    util, watchdog
+)
 from .constants import InstanceStates
 try:
     from pypeapp.lib.config import get_presets
@@ -29,6 +37,242 @@ class IterationBreak(Exception):
     pass
 
 
+class ParallelPairs(list):
+    """Pairs to be processed concurrently
+
+    Pairs of plug-ins declaring `parallel = True` are each processed on
+    their own, whereas the pairs of any other plug-in are processed one
+    after the other, as though processed alone.
+
+    """
+
+    def lanes(self):
+        """Return pairs grouped by what must be processed in sequence"""
+        lanes = collections.OrderedDict()
+        for plugin, instance in self:
+            if getattr(plugin, "parallel", False):
+                key = (plugin, id(instance))
+            else:
+                key = plugin
+            lanes.setdefault(key, []).append((plugin, instance))
+
+        return list(lanes.values())
+
+
+class DependencyCycle(Exception):
+    """Plug-ins require data provided by one another"""
+
+    def __init__(self, plugins):
+        super(DependencyCycle, self).__init__(
+            "Cyclic dependency between %s" % ", ".join(
+                plugin.__name__ for plugin in plugins
+            )
+        )
+        self.plugins = plugins
+
+
+def registration():
+    """Return paths, plug-ins and more registered, by which to discover"""
+    return (
+        list(pyblish.api.plugin_paths()),
+        [plugin.id for plugin in pyblish.api.registered_plugins()],
+        list(pyblish.logic.registered_targets()),
+        sorted(pyblish.api.registered_hosts()),
+        [id(f) for f in pyblish.api.registered_discovery_filters()],
+        id(pyblish.logic.registered_test()),
+    )
+
+
+def is_declared(plugin):
+    """Return whether `plugin` declares the data it requires or provides"""
+    return bool(
+        getattr(plugin, "requires_data", None)
+        or getattr(plugin, "provides_data", None)
+    )
+
+
+def dependency_waves(plugins):
+    """Return indices of `plugins` in waves, in order of processing
+
+    Plug-ins of a wave only require data provided by earlier waves,
+    such that every plug-in of a wave may be processed at once.
+
+    Raises:
+        DependencyCycle: If plug-ins require data provided by one another
+
+    """
+
+    providers = {}
+    for index, plugin in enumerate(plugins):
+        for key in getattr(plugin, "provides_data", None) or []:
+            providers.setdefault(key, set()).add(index)
+
+    dependencies = []
+    for index, plugin in enumerate(plugins):
+        required = set()
+        for key in getattr(plugin, "requires_data", None) or []:
+            required.update(providers.get(key, ()))
+        required.discard(index)
+        dependencies.append(required)
+
+    waves = []
+    done = set()
+    remaining = list(range(len(plugins)))
+    while remaining:
+        wave = [
+            index for index in remaining
+            if dependencies[index] <= done
+        ]
+
+        if not wave:
+            raise DependencyCycle([plugins[index] for index in remaining])
+
+        waves.append(wave)
+        done.update(wave)
+        remaining = [index for index in remaining if index not in done]
+
+    return waves
+
+
+# A plug-in of an execution plan, along with its pairs, or None if skipped,
+# and the (current, next) group orders entered before it, if any.
+PlanStep = collections.namedtuple("PlanStep", ["plugin", "group", "pairs"])
+
+
+class ExecutionPlan(object):
+    """Pairs of each plug-in left to process once collection is done
+
+    Compiled once from the instances as they were at the time, and
+    recompiled only when invalidated; e.g. by an instance being toggled,
+    or instances being added to or removed from the context.
+
+    Attributes:
+        start (int): Index of the first plug-in of the plan
+        steps (tuple): One `PlanStep` per remaining plug-in
+        size (int): Number of instances in the context when compiled
+        version (int): Version of the family index when compiled
+
+    """
+
+    def __init__(self, start, steps, size, version=None):
+        self.start = start
+        self.steps = tuple(steps)
+        self.size = size
+        self.version = version
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def step(self, index):
+        """Return step of plug-in at `index` of all plug-ins"""
+        return self.steps[index - self.start]
+
+    def pairs(self):
+        """Return every pair of the plan, in order of processing"""
+        return [
+            pair
+            for step in self.steps
+            for pair in (step.pairs or [])
+        ]
+
+
+class ProcessRunnable(QtCore.QRunnable):
+    """Process pairs on a thread pool, putting each outcome on `results`"""
+
+    def __init__(self, process, pairs, results, notify):
+        super(ProcessRunnable, self).__init__()
+        self.process = process
+        self.pairs = pairs
+        self.results = results
+        self.notify = notify
+
+        # Index of pair in progress
+        self.current = None
+        self.abandoned = False
+        self.lock = threading.Lock()
+
+    def run(self):
+        for index, (plugin, instance) in enumerate(self.pairs):
+            with self.lock:
+                if self.abandoned:
+                    return
+                self.current = index
+
+            outcome = self.process_pair(plugin, instance)
+
+            with self.lock:
+                if self.abandoned:
+                    return
+                self.current = None
+                self.results.put(outcome)
+
+            self.notify()
+
+    def abandon(self, plugin, instance):
+        """Stop at pair in progress, returning the pairs left after it
+
+        Returns None if the pair is not in progress.
+
+        """
+
+        with self.lock:
+            if self.abandoned or self.current is None:
+                return None
+
+            current_plugin, current_instance = self.pairs[self.current]
+            if current_plugin is not plugin or (
+                current_instance is not instance
+            ):
+                return None
+
+            self.abandoned = True
+            return self.pairs[self.current + 1:]
+
+    def process_pair(self, plugin, instance):
+        try:
+            result = self.process(plugin, instance)
+        except Exception:
+            return None, sys.exc_info()
+
+        # The root logger is shared by all concurrent pairs,
+        # so only keep records emitted from this thread.
+        ident = threading.current_thread().ident
+        result["records"] = [
+            record for record in result["records"]
+            if getattr(record, "thread", ident) == ident
+        ]
+        return result, None
+
+
+class ProcessWorker(QtCore.QObject):
+    """Process plug-ins away from the GUI thread
+
+    The worker lives in its own QThread. Pairs are requested and results
+    are returned through queued signals, such that neither the GUI nor
+    the host application is blocked whilst a plug-in is running.
+
+    """
+
+    # Emitted with the result, or with exception info on failure
+    was_processed = QtCore.Signal(object, object)
+
+    def __init__(self, process):
+        super(ProcessWorker, self).__init__()
+        self.process = process
+
+    @QtCore.Slot(object, object)
+    def on_requested(self, plugin, instance):
+        try:
+            result = self.process(plugin, instance)
+        except Exception:
+            self.was_processed.emit(None, sys.exc_info())
+        else:
+            self.was_processed.emit(result, None)
+
+
 class Controller(QtCore.QObject):
     # Emitted when the GUI is about to start processing;
     # e.g. resetting, validating or publishing.
@@ -50,6 +294,9 @@ class Controller(QtCore.QObject):
     # On action finished
     was_acted = QtCore.Signal(dict)
 
+    # Emitted with the pairs re-run by `revalidate`, once finished
+    was_revalidated = QtCore.Signal(object)
+
     # Emitted when processing has stopped
     was_stopped = QtCore.Signal()
 
@@ -59,6 +306,27 @@ class Controller(QtCore.QObject):
     # Emitted when plugin was skipped
     was_skipped = QtCore.Signal(object)
 
+    # Emitted with changes to the context since last emitted, as taken
+    # from `families.ContextChanges`, ahead of the pair or action after
+    # which they were noticed
+    context_changed = QtCore.Signal(object)
+
+    # Emitted ahead of a pair expected to hold up the GUI thread past the
+    # current frame, such that what is about to be processed is shown first
+    about_to_block = QtCore.Signal()
+
+    # Emitted to request processing of a pair on the worker thread
+    process_requested = QtCore.Signal(object, object)
+
+    # Emitted from the thread pool as parallel pairs finish
+    parallel_processed = QtCore.Signal()
+
+    # Emitted with the `watchdog.Watch` of a pair over its time budget
+    was_overdue = QtCore.Signal(object)
+
+    # Emitted when processing ran out of time, and is being stopped
+    was_expired = QtCore.Signal()
+
     # store OrderGroups - now it is a singleton
     order_groups = util.OrderGroups
 
@@ -68,16 +336,98 @@ class Controller(QtCore.QObject):
         self.plugins = {}
         self.optional_default = {}
 
+        # Interleaves processing with the event loop
+        self.scheduler = util.FrameScheduler(settings.FrameBudget)
+
+        # Process plug-ins on a worker thread rather than the GUI thread
+        self.use_worker_thread = settings.ProcessInThread
+        self.worker = None
+        self.worker_thread = None
+        self.on_finished = None
+
+        # Process instances of `parallel` plug-ins on a thread pool
+        self.parallel_workers = settings.ParallelWorkers
+        self.thread_pool = None
+        self.parallel_results = None
+        self.parallel_pending = 0
+        self.parallel_processed.connect(
+            self._on_parallel_processed, QtCore.Qt.QueuedConnection
+        )
+
+        # Process `multiprocess` plug-ins in a pool of worker processes
+        self.process_pool_workers = settings.ProcessPoolWorkers
+
+        # Schedule plug-ins declaring `requires_data` and `provides_data`
+        # by the data they exchange
+        self.use_dependency_graph = settings.DependencyGraph
+
+        # Replay stored results of `cacheable` plug-ins
+        self.result_cache = None
+        if settings.CacheDirectory is not False:
+            self.result_cache = cache.ResultCache(
+                settings.CacheDirectory or cache.default_directory(),
+                settings.CacheSize
+            )
+
+        # Registration by which plug-ins were discovered ahead of the
+        # next reset, see `registration`
+        self.preloaded = None
+
+        # Notice pairs over their time budget, from another thread
+        self.watchdog = watchdog.Watchdog(
+            self.was_overdue.emit, self._on_expired
+        )
+        self.processing_timeout = settings.ProcessingTimeout
+        self.was_overdue.connect(
+            self._on_overdue, QtCore.Qt.QueuedConnection
+        )
+
+        # Worker threads left behind processing an overdue pair
+        self.abandoned_workers = []
+        self.parallel_runnables = []
+
+        # Profiles of pairs, when enabled
+        self.profiler = profiler.Profiler()
+
+        # Log records shown of this session, spilled to disk beyond budget
+        self.record_store = records.RecordStore()
+
+        # Guards timings, noted from any thread processing pairs
+        self.timings_lock = threading.Lock()
+
+        # Wall time of the last pair of each plug-in, by id, across resets
+        self.durations = {}
+
+        # Instances of each family, as they are added, removed and toggled
+        self.family_index = families.FamilyIndex()
+
     def reset_variables(self):
         # Data internal to the GUI itself
         self.is_running = False
         self.stopped = False
         self.errored = False
 
+        # Exceptions raised by the controller itself, rather than plug-ins
+        self.unexpected_errors = []
+
         # Active producer of pairs
         self.pair_generator = None
         # Active pair
         self.current_pair = None
+        # Plan of what is left to process, once collected
+        self.plan = None
+
+        # Pairs which failed, by (plugin id, instance or context id)
+        self.pair_errors = {}
+
+        # Wall and CPU time of each pair, by plug-in and instance id,
+        # and their totals by plug-in id and by instance id
+        self.timings = {}
+        self.timing_totals = ({}, {})
+
+        # Data touched by actions since last validated
+        self.dirty_context = False
+        self.dirty_instances = set()
 
         # Orders which changes GUI
         # - passing collectors order disables plugin/instance toggle
@@ -136,7 +486,8 @@ class Controller(QtCore.QObject):
         return result
 
     def reset_context(self):
-        self.context = pyblish.api.Context()
+        self.family_index.reset()
+        self.context = families.ObservedContext(index=self.family_index)
 
         self.context._publish_states = InstanceStates.ContextType
         self.context.optional = False
@@ -157,16 +508,33 @@ class Controller(QtCore.QObject):
 
         self.context.families = ("__context__",)
 
+        # Shown as of `was_reset`
+        self.context.changes.take()
+
+    def emit_changes(self):
+        """Emit changes to the context since last emitted, if any"""
+        if self.context is None or not self.context.changes:
+            return
+
+        self.context_changed.emit(self.context.changes.take())
+
     def reset(self):
         """Discover plug-ins and run collection."""
 
         self.reset_context()
         self.reset_variables()
+        self.profiler.reset()
+        self.record_store.reset()
 
         self.possible_presets = self.presets_by_hosts()
 
-        # Load plugins and set pair generator
-        self.load_plugins()
+        # Load plugins, unless preloaded as still registered
+        if self.preloaded != registration():
+            self.load_plugins()
+        self.preloaded = None
+
+        self.boundaries = self._group_boundaries(self.plugins)
+        self.batches = self._batches(self.plugins, self.boundaries)
         self.pair_generator = self._pair_yielder(self.plugins)
 
         self.was_reset.emit()
@@ -174,13 +542,24 @@ class Controller(QtCore.QObject):
         # Process collectors load rest of plugins with collected instances
         self.collect()
 
+    def preload(self):
+        """Discover plug-ins ahead of the next reset"""
+        self.load_plugins()
+        self.preloaded = registration()
+
     def load_plugins(self):
         self.test = pyblish.logic.registered_test()
         self.optional_default = {}
 
-        plugins = pyblish.api.discover()
-
         targets = pyblish.logic.registered_targets() or ["default"]
+
+        if settings.DiscoveryCache or settings.LazyPlugins:
+            self.plugins = discovery.discover(
+                targets=targets, lazy=settings.LazyPlugins
+            )
+            return
+
+        plugins = pyblish.api.discover()
         self.plugins = pyblish.logic.plugins_by_targets(plugins, targets)
 
     def on_published(self):
@@ -191,16 +570,149 @@ class Controller(QtCore.QObject):
     def stop(self):
         self.stopped = True
 
+        if self.context is not None and "cancelToken" in self.context.data:
+            self.context.data["cancelToken"].cancel()
+
     def act(self, plugin, action):
         def on_next():
-            result = pyblish.plugin.process(
-                plugin, self.context, None, action.id
-            )
+            before = self._snapshot()
+            with util.debug_logging():
+                result = pyblish.plugin.process(
+                    manifest.load(plugin),
+                    self.context,
+                    None,
+                    manifest.load_action(plugin, action).id
+                )
+            result["plugin"] = plugin
+            self._mark_dirty(before)
             self.is_running = False
+            self.emit_changes()
             self.was_acted.emit(result)
 
         self.is_running = True
-        util.defer(100, on_next)
+        util.schedule(on_next)
+
+    def _snapshot(self):
+        """Return picklable data of context and instances, by id"""
+        snapshot = {self.context.id: pool.pickled(self.context.data)}
+        for instance in self.context:
+            snapshot[instance.id] = pool.pickled(instance.data)
+        return snapshot
+
+    def _mark_dirty(self, before):
+        """Remember what changed since snapshot `before`"""
+        changed, removed = pool.changes(
+            before[self.context.id], self.context.data
+        )
+        if changed or removed:
+            self.dirty_context = True
+
+        for instance in self.context:
+            if instance.id not in before:
+                self.dirty_instances.add(instance.id)
+                continue
+
+            changed, removed = pool.changes(
+                before[instance.id], instance.data
+            )
+            if changed or removed:
+                self.dirty_instances.add(instance.id)
+
+        if self.is_dirty():
+            self.invalidate_plan()
+
+    def is_dirty(self):
+        """Return whether actions touched anything since last validated"""
+        return bool(self.dirty_context or self.dirty_instances)
+
+    def _dirty_pairs(self):
+        """Return pairs of processed validators involving touched data
+
+        Context plug-ins are re-run when anything was touched, as the
+        context holds every instance, whereas instance plug-ins are
+        only re-run with the instances touched.
+
+        """
+
+        if not self.is_dirty():
+            return []
+
+        last_order = self.processing["last_plugin_order"]
+        if last_order is None:
+            return []
+
+        families = self.family_index.families()
+
+        batches = []
+        for plugin in self.plugins:
+            if not self.collectors_order < plugin.order <= min(
+                last_order, self.validators_order
+            ):
+                continue
+
+            pairs = self._resolve_pairs(plugin, families)
+            if not pairs:
+                continue
+
+            if plugin.__instanceEnabled__:
+                pairs = [
+                    pair for pair in pairs
+                    if pair[1].id in self.dirty_instances
+                ]
+
+            if pairs:
+                batches.append(ParallelPairs(pairs))
+
+        return batches
+
+    def revalidate(self):
+        """Re-run validators of instances and context touched by actions
+
+        Unlike a reset, nothing is discovered nor collected again and
+        processing may carry on from where it was once validated.
+
+        """
+
+        if self.is_running:
+            return
+
+        batches = self._dirty_pairs()
+        dirty = self.dirty_context, set(self.dirty_instances)
+        self.dirty_context = False
+        self.dirty_instances.clear()
+
+        def pairs():
+            for batch in batches:
+                # Stop if was stopped, leaving what is left to revalidate
+                if self.stopped:
+                    self.stopped = False
+                    self.pair_generator = generator
+                    self.dirty_context |= dirty[0]
+                    self.dirty_instances |= dirty[1]
+                    yield IterationBreak("Stopped")
+                    return
+
+                if len(batch.lanes()) > 1:
+                    yield batch
+                    continue
+
+                for pair in batch:
+                    yield pair
+
+        generator = self.pair_generator
+
+        def on_finished():
+            self.pair_generator = generator
+            self.processing["ordersWithError"] = set(
+                self.pair_errors.values()
+            )
+            self.errored = bool(self.pair_errors)
+            self.was_revalidated.emit(
+                [pair for batch in batches for pair in batch]
+            )
+
+        self.pair_generator = pairs()
+        self.iterate_and_process(on_finished)
 
     def emit_(self, signal, kwargs):
         pyblish.api.emit(signal, **kwargs)
@@ -217,38 +729,259 @@ class Controller(QtCore.QObject):
 
         self.processing["nextOrder"] = plugin.order
 
+        watch = self.watchdog.watch(plugin, instance)
+
+        started = time.time()
+        cpu_started = util.cpu_time()
+
         try:
-            result = pyblish.plugin.process(plugin, self.context, instance)
-            # Make note of the order at which the
-            # potential error error occured.
-            if result["error"] is not None:
-                self.processing["ordersWithError"].add(plugin.order)
+            result = None
+            cache_key = None
+            if self.result_cache is not None and cache.is_cacheable(plugin):
+                cache_key = cache.key(plugin, self.context, instance)
+                if cache_key is not None:
+                    result = self.result_cache.replay(
+                        cache_key, plugin, self.context, instance
+                    )
+
+            if result is None:
+                if self.process_pool_workers and pool.is_supported(plugin):
+                    try:
+                        result = pool.process(
+                            plugin,
+                            self.context,
+                            instance,
+                            self.process_pool_workers,
+                            watch.budget
+                        )
+                    except multiprocessing.TimeoutError:
+                        result = watchdog.timeout_result(watch, self.context)
+
+                if result is None:
+                    result = self._run_process(
+                        manifest.load(plugin), instance
+                    )
+
+                    # Stand-ins remain what the models know of
+                    result["plugin"] = plugin
+
+                if cache_key is not None:
+                    self.result_cache.store(cache_key, result)
+
+            timing = {
+                "wall": time.time() - started,
+                "cpu": util.cpu_time() - cpu_started,
+            }
+
+            # E.g. spent by a worker process
+            timing.update(result.get("timing") or {})
+            result["timing"] = timing
+
+            # Reported by `_abandon` instead
+            if not watch.abandoned:
+                self._note_result(plugin, instance, result)
 
         except Exception as exc:
             raise Exception("Unknown error({}): {}".format(
                 plugin.__name__, str(exc)
             ))
 
+        finally:
+            self.watchdog.unwatch(watch)
+
         return result
 
-    def _pair_yielder(self, plugins):
+    def _run_process(self, plugin, instance):
+        with util.debug_logging():
+            if not self.profiler.enabled:
+                return pyblish.plugin.process(plugin, self.context, instance)
+
+            entity = self.context if instance is None else instance
+            return self.profiler.call(
+                (plugin.id, entity.id),
+                "%s_%s" % (plugin.__name__, entity),
+                pyblish.plugin.process,
+                plugin, self.context, instance
+            )
+
+    def save_profile(self):
+        """Write merged profile of this session, returning its path"""
+        if not self.profiler.enabled:
+            return None
+        return self.profiler.save()
+
+    def _note_result(self, plugin, instance, result):
+        # Make note of the order at which the
+        # potential error error occured.
+        entity = self.context if instance is None else instance
+        key = (plugin.id, entity.id)
+        if result["error"] is not None:
+            self.processing["ordersWithError"].add(plugin.order)
+            self.pair_errors[key] = plugin.order
+        else:
+            self.pair_errors.pop(key, None)
+
+        timing = result.get("timing")
+        if timing is not None:
+            with self.timings_lock:
+                # Re-processed pairs replace their previous time
+                previous = self.timings.get(key, (0.0, 0.0))
+                self.timings[key] = (timing["wall"], timing["cpu"])
+                self.durations[plugin.id] = timing["wall"]
+
+                for index, totals in enumerate(self.timing_totals):
+                    wall, cpu = totals.get(key[index], (0.0, 0.0))
+                    totals[key[index]] = (
+                        wall + timing["wall"] - previous[0],
+                        cpu + timing["cpu"] - previous[1],
+                    )
+
+    def plugin_timing(self, plugin_id):
+        """Return wall and CPU time spent processing plug-in, in seconds"""
+        return self._timing(0, plugin_id)
+
+    def instance_timing(self, instance_id):
+        """Return wall and CPU time spent processing instance, in seconds
+
+        Pass the id of the context for time spent on context plug-ins.
+
+        """
+
+        return self._timing(1, instance_id)
+
+    def _timing(self, index, object_id):
+        return self.timing_totals[index].get(object_id, (0.0, 0.0))
+
+    def _group_boundaries(self, plugins):
+        """Return (current, next) group orders entered before each plug-in
+
+        Plug-ins not entering a new group are given None.
+
+        """
+
+        orders = list(self.order_groups.groups().keys())
+        following = dict(zip(orders, orders[1:] + [None]))
+
+        current_group_order = self.processing["current_group_order"]
+        next_group_order = self.processing["next_group_order"]
+
+        boundaries = []
         for plugin in plugins:
+            group = None
             if (
-                self.processing["current_group_order"] is not None
-                and plugin.order > self.processing["current_group_order"]
+                current_group_order is not None
+                and plugin.order > current_group_order
             ):
-                new_next_group_order = None
-                new_current_group_order = self.processing["next_group_order"]
-                if new_current_group_order is not None:
-                    current_next_order_found = False
-                    for order in self.order_groups.groups().keys():
-                        if current_next_order_found:
-                            new_next_group_order = order
-                            break
-
-                        if order == new_current_group_order:
-                            current_next_order_found = True
+                current_group_order, next_group_order = (
+                    next_group_order, following.get(next_group_order)
+                )
+                group = (current_group_order, next_group_order)
+
+            boundaries.append(group)
+
+        return boundaries
+
+    def _resolve_pairs(self, plugin, families=None):
+        """Return pairs of `plugin` to process, or None to skip it"""
+        if not plugin.active:
+            pyblish.logic.log.debug("%s was inactive, skipping.." % plugin)
+            return None
+
+        if plugin.__instanceEnabled__:
+            instances = self.family_index.instances_by_plugin(plugin)
+            if not instances:
+                return None
+
+            pairs = []
+            for instance in instances:
+                if instance.data.get("publish") is False:
+                    pyblish.logic.log.debug(
+                        "%s was inactive, skipping.." % instance
+                    )
+                    continue
+                pairs.append((plugin, instance))
+
+            return pairs
+
+        if families is None:
+            families = self.family_index.families()
 
+        if not pyblish.logic.plugins_by_families([plugin], families):
+            return None
+
+        return [(plugin, None)]
+
+    def compile_plan(self, plugins, boundaries, start=0):
+        """Compile plan of `plugins` from `start`, with current instances"""
+        families = self.family_index.families()
+
+        self.plan = ExecutionPlan(start, [
+            PlanStep(plugin, group, self._resolve_pairs(plugin, families))
+            for plugin, group in zip(plugins[start:], boundaries[start:])
+        ], len(self.context), self.family_index.version)
+
+        return self.plan
+
+    def invalidate_plan(self):
+        """Recompile the plan before processing the next plug-in"""
+        self.plan = None
+
+    def _batches(self, plugins, boundaries):
+        """Return plug-ins to process together, as (group, start, indices)
+
+        Each batch is given the group entered before it, if any, and the
+        index of the first plug-in of its run of declared plug-ins. With
+        `use_dependency_graph`, consecutive plug-ins of a group declaring
+        their data are batched in waves, whereas any other plug-in is a
+        barrier processed on its own.
+
+        """
+
+        batches = []
+        segment = []
+
+        def flush():
+            if not segment:
+                return
+
+            try:
+                waves = dependency_waves(
+                    [plugins[index] for index in segment]
+                )
+            except DependencyCycle as e:
+                util.u_print(u"%s, processing in order instead" % e)
+                waves = [[position] for position in range(len(segment))]
+
+            group = boundaries[segment[0]]
+            for wave in waves:
+                batches.append((
+                    group, segment[0], [segment[i] for i in wave]
+                ))
+                group = None
+
+            del segment[:]
+
+        for index, plugin in enumerate(plugins):
+            if boundaries[index] is not None:
+                flush()
+
+            if self.use_dependency_graph and is_declared(plugin):
+                segment.append(index)
+                continue
+
+            flush()
+            batches.append((boundaries[index], index, [index]))
+
+        flush()
+
+        return batches
+
+    def _pair_yielder(self, plugins):
+        boundaries = self.boundaries
+
+        for group, start, indices in self.batches:
+            if group is not None:
+                new_current_group_order, new_next_group_order = group
                 self.processing["next_group_order"] = new_next_group_order
                 self.processing["current_group_order"] = (
                     new_current_group_order
@@ -258,6 +991,7 @@ class Controller(QtCore.QObject):
                     self.collect_state = 1
                     self.switch_toggleability.emit(True)
                     self.passed_group.emit(new_current_group_order)
+                    self.compile_plan(plugins, boundaries, start)
                     yield IterationBreak("Collected")
 
                 self.passed_group.emit(new_current_group_order)
@@ -268,7 +1002,10 @@ class Controller(QtCore.QObject):
                 self.collect_state = 2
                 self.switch_toggleability.emit(False)
 
-            if not self.validated and plugin.order > self.validators_order:
+            batch = [plugins[index] for index in indices]
+            order = max(plugin.order for plugin in batch)
+
+            if not self.validated and order > self.validators_order:
                 self.validated = True
                 if self.processing["stop_on_validation"]:
                     yield IterationBreak("Validated")
@@ -279,52 +1016,185 @@ class Controller(QtCore.QObject):
                 yield IterationBreak("Stopped")
 
             # check test if will stop
-            self.processing["nextOrder"] = plugin.order
-            message = self.test(**self.processing)
-            if message:
-                yield IterationBreak("Stopped due to \"{}\"".format(message))
-
-            self.processing["last_plugin_order"] = plugin.order
-            if not plugin.active:
-                pyblish.logic.log.debug("%s was inactive, skipping.." % plugin)
-                self.was_skipped.emit(plugin)
-                continue
+            for plugin in batch:
+                self.processing["nextOrder"] = plugin.order
+                message = self.test(**self.processing)
+                if message:
+                    yield IterationBreak(
+                        "Stopped due to \"{}\"".format(message)
+                    )
+
+            self.processing["last_plugin_order"] = order
+
+            # Instances were added, removed, toggled or given families
+            if self.collect_state != 0 and (
+                self.plan is None
+                or self.plan.size != len(self.context)
+                or self.plan.version != self.family_index.version
+            ):
+                self.compile_plan(plugins, boundaries, start)
 
-            if plugin.__instanceEnabled__:
-                instances = pyblish.logic.instances_by_plugin(
-                    self.context, plugin
-                )
-                if not instances:
-                    self.was_skipped.emit(plugin)
-                    continue
+            pairs = ParallelPairs()
+            for index, plugin in zip(indices, batch):
+                if self.collect_state == 0:
+                    # Collectors may yet add instances
+                    plugin_pairs = self._resolve_pairs(plugin)
+                else:
+                    plugin_pairs = self.plan.step(index).pairs
 
-                for instance in instances:
-                    if instance.data.get("publish") is False:
-                        pyblish.logic.log.debug(
-                            "%s was inactive, skipping.." % instance
-                        )
-                        continue
-                    yield (plugin, instance)
-            else:
-                families = util.collect_families_from_instances(
-                    self.context, only_active=True
-                )
-                plugins = pyblish.logic.plugins_by_families(
-                    [plugin], families
-                )
-                if not plugins:
+                if plugin_pairs is None:
                     self.was_skipped.emit(plugin)
                     continue
-                yield (plugin, None)
+
+                pairs.extend(plugin_pairs)
+
+            if len(pairs.lanes()) > 1:
+                yield pairs
+                continue
+
+            for pair in pairs:
+                yield pair
 
         self.passed_group.emit(self.processing["next_group_order"])
 
+    def start_worker(self):
+        """Start the worker thread, unless already running"""
+        if self.worker_thread is not None:
+            return
+
+        self.worker = ProcessWorker(self._process)
+        self.worker_thread = QtCore.QThread()
+        self.worker.moveToThread(self.worker_thread)
+
+        self.process_requested.connect(self.worker.on_requested)
+        self.worker.was_processed.connect(self._on_processed)
+
+        self.worker_thread.start()
+
+    def stop_worker(self):
+        """Stop the worker thread, waiting on any pair in progress"""
+        if self.worker_thread is None:
+            return
+
+        self.process_requested.disconnect(self.worker.on_requested)
+        self.worker.was_processed.disconnect(self._on_processed)
+
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
+        self.worker = None
+        self.worker_thread = None
+
+    def abandon_worker(self):
+        """Leave the worker behind on the pair in progress, unwaited"""
+        self.process_requested.disconnect(self.worker.on_requested)
+        self.worker.was_processed.disconnect(self._on_processed)
+
+        # Quits once the pair is done, if ever
+        self.worker_thread.quit()
+
+        self.abandoned_workers = [
+            (worker, thread) for worker, thread in self.abandoned_workers
+            if thread.isRunning()
+        ] + [(self.worker, self.worker_thread)]
+
+        self.worker = None
+        self.worker_thread = None
+
+    def _on_overdue(self, watch):
+        abandoned = self._abandon(watch)
+
+        if abandoned == "parallel":
+            self._on_parallel_processed()
+
+        elif abandoned == "worker":
+            result = watchdog.timeout_result(watch, self.context)
+            self._note_result(watch.plugin, watch.instance, result)
+            self._on_processed(result, None)
+
+    def _abandon(self, watch):
+        """Abandon pair of `watch` where it runs on a thread of its own
+
+        Returns where the pair was abandoned; "worker" or "parallel",
+        or None if it could not be.
+
+        """
+
+        if (
+            self.worker is not None
+            and isinstance(self.current_pair, tuple)
+            and self.current_pair[0] is watch.plugin
+            and self.current_pair[1] is watch.instance
+        ):
+            if not self.watchdog.abandon(watch):
+                return None
+
+            self.abandon_worker()
+            self.start_worker()
+            return "worker"
+
+        for runnable in self.parallel_runnables:
+            remaining = runnable.abandon(watch.plugin, watch.instance)
+            if remaining is None:
+                continue
+
+            self.watchdog.abandon(watch)
+
+            result = watchdog.timeout_result(watch, self.context)
+            self._note_result(watch.plugin, watch.instance, result)
+            self.parallel_results.put((result, None))
+
+            # In place of the thread left behind
+            self.thread_pool.setMaxThreadCount(
+                self.thread_pool.maxThreadCount() + 1
+            )
+
+            if remaining:
+                self._start_runnable(remaining)
+
+            return "parallel"
+
+        return None
+
+    def _on_expired(self):
+        """Stop processing out of time, from the thread of the watchdog"""
+        if self.is_running:
+            self.stop()
+            self.was_expired.emit()
+
     def iterate_and_process(self, on_finished=lambda: None):
         """ Iterating inserted plugins with current context.
         Collectors do not contain instances, they are None when collecting!
         This process don't stop on one
+
+        Pairs are produced on the GUI thread, such that `about_to_process`,
+        `was_skipped` and `passed_group` are emitted from there. With
+        `use_worker_thread` only processing itself is handed to the worker.
         """
-        def on_next():
+        if self.use_worker_thread:
+            self.start_worker()
+        else:
+            self.stop_worker()
+
+        # Polled by plug-ins, cancelled on stop
+        self.context.data["cancelToken"] = watchdog.CancelToken()
+        self.watchdog.start(self.processing_timeout)
+
+        self.on_finished = on_finished
+        self.is_running = True
+        self.scheduler.schedule(self._on_next)
+
+    def _on_next(self):
+        """Process pairs until the frame budget is spent"""
+        if self.pair_generator is None:
+            # Cleaned up in the meantime
+            return
+
+        self.scheduler.start()
+        self._iterate()
+
+    def _iterate(self):
+        while True:
             try:
                 self.current_pair = next(self.pair_generator)
                 if isinstance(self.current_pair, IterationBreak):
@@ -332,13 +1202,15 @@ class Controller(QtCore.QObject):
 
             except IterationBreak:
                 self.is_running = False
+                self.save_profile()
                 self.was_stopped.emit()
                 return
 
             except StopIteration:
                 self.is_running = False
+                self.save_profile()
                 # All pairs were processed successfully!
-                return util.defer(500, on_finished)
+                return self.scheduler.schedule(self.on_finished)
 
             except Exception:
                 # This is a bug
@@ -346,37 +1218,176 @@ class Controller(QtCore.QObject):
                 traceback.print_exception(exc_type, exc_msg, exc_tb)
                 self.is_running = False
                 self.was_stopped.emit()
-                return util.defer(
-                    500, lambda: on_unexpected_error(error=exc_msg)
+                return self.scheduler.schedule(
+                    lambda: self._on_unexpected_error(error=exc_msg)
                 )
 
+            self.emit_changes()
+
+            if isinstance(self.current_pair, ParallelPairs):
+                for pair in self.current_pair:
+                    self.about_to_process.emit(*pair)
+
+                if util.delay_multiplier():
+                    return self.scheduler.schedule(self._on_process_parallel)
+
+                # No event loop to return to, wait for the batch right here
+                self._start_parallel()
+                if not self._take_parallel_results(block=True):
+                    return
+                continue
+
             self.about_to_process.emit(*self.current_pair)
-            util.defer(100, on_process)
 
-        def on_process():
-            try:
-                result = self._process(*self.current_pair)
-                if result["error"] is not None:
-                    self.errored = True
+            # The worker reports back through `_on_processed`
+            if self.worker is not None:
+                return self.process_requested.emit(*self.current_pair)
 
-                self.was_processed.emit(result)
+            # Let the GUI catch up before processing any further
+            if self.scheduler.expired():
+                return self.scheduler.schedule(self._on_process)
 
-            except Exception:
-                # TODO this should be handled much differently
-                exc_type, exc_msg, exc_tb = sys.exc_info()
-                traceback.print_exception(exc_type, exc_msg, exc_tb)
-                return util.defer(
-                    500, lambda: on_unexpected_error(error=exc_msg)
+            # Otherwise shown only once the pair has finished
+            if self.outlasts_frame(self.current_pair[0]):
+                self.about_to_block.emit()
+
+            if not self._process_current():
+                return
+
+    def outlasts_frame(self, plugin):
+        """Return whether `plugin` is expected to run past this frame
+
+        Plug-ins not processed before are expected to.
+
+        """
+
+        with self.timings_lock:
+            duration = self.durations.get(plugin.id)
+
+        if duration is None:
+            return True
+
+        return duration * 1000 > self.scheduler.remaining()
+
+    def _on_process(self):
+        if self.pair_generator is None:
+            return
+
+        self.scheduler.start()
+        if self._process_current():
+            self._iterate()
+
+    def _process_current(self):
+        try:
+            result = self._process(*self.current_pair)
+        except Exception:
+            return self._handle_result(None, sys.exc_info())
+
+        return self._handle_result(result, None)
+
+    @QtCore.Slot(object, object)
+    def _on_processed(self, result, exc_info):
+        if self._handle_result(result, exc_info):
+            self.scheduler.schedule(self._on_next)
+
+    def _handle_result(self, result, exc_info):
+        """Report `result`, returning whether processing may continue"""
+        if exc_info is not None:
+            traceback.print_exception(*exc_info)
+            self.scheduler.schedule(
+                lambda: self._on_unexpected_error(error=exc_info[1])
+            )
+            return False
+
+        try:
+            if result["error"] is not None:
+                self.errored = True
+
+            self.emit_changes()
+            self.was_processed.emit(result)
+
+        except Exception:
+            # TODO this should be handled much differently
+            exc_type, exc_msg, exc_tb = sys.exc_info()
+            traceback.print_exception(exc_type, exc_msg, exc_tb)
+            self.scheduler.schedule(
+                lambda: self._on_unexpected_error(error=exc_msg)
+            )
+            return False
+
+        return True
+
+    def _on_process_parallel(self):
+        self._start_parallel()
+        self._on_parallel_processed()
+
+    def _start_parallel(self):
+        if self.thread_pool is None:
+            self.thread_pool = QtCore.QThreadPool()
+        self.thread_pool.setMaxThreadCount(self.parallel_workers)
+
+        self.parallel_results = queue.Queue()
+        self.parallel_pending = len(self.current_pair)
+        self.parallel_runnables = []
+        for pairs in self.current_pair.lanes():
+            self._start_runnable(pairs)
+
+    def _start_runnable(self, pairs):
+        runnable = ProcessRunnable(
+            self._process,
+            pairs,
+            self.parallel_results,
+            self.parallel_processed.emit
+        )
+
+        # Owned by the controller, such that it may be abandoned
+        runnable.setAutoDelete(False)
+        self.parallel_runnables.append(runnable)
+        self.thread_pool.start(runnable)
+
+    def _on_parallel_processed(self):
+        """Report results in the order pairs finish"""
+        if not self.parallel_pending:
+            return
+
+        if self._take_parallel_results(block=False):
+            self.scheduler.schedule(self._on_next)
+
+    def _take_parallel_results(self, block):
+        """Handle results of parallel pairs finished so far
+
+        With `block`, wait for every pair to finish. Returns True once
+        all results are handled and processing may carry on.
+
+        """
+
+        while self.parallel_pending:
+            try:
+                result, exc_info = self.parallel_results.get(
+                    block=block, timeout=self.watchdog.interval
                 )
+            except queue.Empty:
+                if not block:
+                    # Woken up again by `parallel_processed`
+                    return False
+
+                # No event loop to deliver `was_overdue` either
+                for watch in self.watchdog.overdue():
+                    self._abandon(watch)
+                continue
 
-            util.defer(10, on_next)
+            self.parallel_pending -= 1
 
-        def on_unexpected_error(error):
-            util.u_print(u"An unexpected error occurred:\n %s" % error)
-            return util.defer(500, on_finished)
+            if not self._handle_result(result, exc_info):
+                self.parallel_pending = 0
+                return False
 
-        self.is_running = True
-        util.defer(10, on_next)
+        return True
+
+    def _on_unexpected_error(self, error):
+        self.unexpected_errors.append(error)
+        util.u_print(u"An unexpected error occurred:\n %s" % error)
+        return self.scheduler.schedule(self.on_finished)
 
     def collect(self):
         """ Iterate and process Collect plugins
@@ -395,20 +1406,58 @@ class Controller(QtCore.QObject):
         self.iterate_and_process(self.on_published)
 
     def cleanup(self):
-        """Forcefully delete objects from memory
-        In an ideal world, this shouldn't be necessary. Garbage
-        collection guarantees that anything without reference
-        is automatically removed.
-        However, because this application is designed to be run
-        multiple times from the same interpreter process, extra
-        case must be taken to ensure there are no memory leaks.
-        Explicitly deleting objects shines a light on where objects
-        may still be referenced in the form of an error. No errors
-        means this was uneccesary, but that's ok.
+        """Release everything of this session, ahead of being deleted
+
+        This application is designed to be run multiple times from the
+        same interpreter process, where anything left behind by a session
+        adds up. Processing is stopped, threads are joined, and the
+        context, plug-ins and connections of this controller let go of,
+        such that each may be collected. The controller is of no further
+        use once cleaned up.
+
         """
 
-        for instance in self.context:
-            del(instance)
+        self.stop()
+        self.is_running = False
 
-        for plugin in self.plugins:
-            del(plugin)
+        self.stop_worker()
+        self.watchdog.stop()
+
+        # Abandoned pairs may never finish
+        abandoned = any(
+            runnable.abandoned for runnable in self.parallel_runnables
+        )
+
+        if self.thread_pool is not None and not abandoned:
+            self.thread_pool.waitForDone()
+
+        # Receivers, such as lambdas of the window, are held on to by Qt
+        # and out of reach of the garbage collector
+        for name, signal in vars(Controller).items():
+            if not isinstance(signal, QtCore.Signal):
+                continue
+
+            try:
+                getattr(self, name).disconnect()
+            except (TypeError, RuntimeError):
+                # Nothing was connected
+                pass
+
+        if self.pair_generator is not None:
+            self.pair_generator.close()
+
+        self.reset_variables()
+        self.profiler.reset()
+        self.record_store.close()
+        self.family_index.reset()
+
+        self.context = None
+        self.plugins = []
+        self.optional_default = {}
+        self.boundaries = None
+        self.batches = None
+        self.on_finished = None
+
+        self.thread_pool = None
+        self.parallel_results = None
+        self.parallel_runnables = []
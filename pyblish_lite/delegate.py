@@ -2,7 +2,7 @@ import platform
 
 from .vendor.Qt import QtWidgets, QtGui, QtCore
 
-from . import model
+from . import model, settings, util
 from .awesome import tags as awesome
 from .constants import (
     PluginStates, InstanceStates, PluginActionStates, GroupStates, Roles
@@ -19,7 +19,11 @@ colors = {
     "hover": QtGui.QColor(255, 255, 255, 10),
     "selected": QtGui.QColor(255, 255, 255, 20),
     "outline": QtGui.QColor("#333"),
-    "group": QtGui.QColor("#333")
+    "group": QtGui.QColor("#333"),
+    "detail": QtGui.QColor("#333"),
+    "detailHover": QtGui.QColor("#353535"),
+    "detailBorder": QtGui.QColor("#222"),
+    "detailText": QtGui.QColor("#aaa")
 }
 
 scale_factors = {"darwin": 1.5}
@@ -40,6 +44,7 @@ font_metrics = {
 }
 icons = {
     "action": awesome["adn"],
+    "cached": awesome["bolt"],
     "angle-right": awesome["angle-right"],
     "angle-left": awesome["angle-left"],
     "plus-sign": awesome['plus'],
@@ -47,6 +52,32 @@ icons = {
 }
 
 
+def format_seconds(seconds):
+    """Return `seconds` for humans, e.g. 12ms, 1.5s or 2m03s"""
+    if seconds < 1:
+        return "%dms" % (seconds * 1000)
+    if seconds < 60:
+        return "%.1fs" % seconds
+    return "%dm%02ds" % divmod(int(seconds), 60)
+
+
+def draw_duration(painter, rect, index):
+    """Draw wall time of `index` right-aligned in `rect`, if processed"""
+    wall = index.data(Roles.WallTimeRole)
+    if wall is None:
+        return
+
+    painter.save()
+    painter.setFont(fonts["h4"])
+    painter.setPen(QtGui.QPen(colors["inactive"]))
+    painter.drawText(
+        rect,
+        QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter,
+        format_seconds(wall)
+    )
+    painter.restore()
+
+
 class PluginItemDelegate(QtWidgets.QStyledItemDelegate):
     """Generic delegate for model items"""
 
@@ -99,11 +130,16 @@ class PluginItemDelegate(QtWidgets.QStyledItemDelegate):
 
         assert label_rect.width() > 0
 
+        # Leave room for duration
+        elided_width = label_rect.width() - 20
+        if index.data(Roles.WallTimeRole) is not None:
+            elided_width -= 60
+
         label = index.data(QtCore.Qt.DisplayRole)
         label = font_metrics["h4"].elidedText(
             label,
             QtCore.Qt.ElideRight,
-            label_rect.width() - 20
+            elided_width
         )
 
         font_color = colors["idle"]
@@ -149,6 +185,32 @@ class PluginItemDelegate(QtWidgets.QStyledItemDelegate):
 
             painter.restore()
 
+        # Draw duration, left of cache and action icons
+        duration_rect = QtCore.QRectF(body_rect)
+        duration_rect.setRight(
+            body_rect.left()
+            + label_rect.width()
+            - perspective_rect.width() * 1.5
+            - 4
+        )
+        draw_duration(painter, duration_rect, index)
+
+        # Draw cache icon, left of action icon
+        if publish_states & PluginStates.WasCached:
+            painter.save()
+            painter.setFont(fonts["smallAwesome"])
+            painter.setPen(QtGui.QPen(colors["ok"]))
+
+            icon_rect = QtCore.QRectF(
+                option.rect.adjusted(
+                    label_rect.width() - perspective_rect.width() * 1.5,
+                    label_rect.height() / 3, 0, 0
+                )
+            )
+            painter.drawText(icon_rect, icons["cached"])
+
+            painter.restore()
+
         # Draw checkbox
         pen = QtGui.QPen(check_color, 1)
         painter.setPen(pen)
@@ -227,11 +289,16 @@ class InstanceItemDelegate(QtWidgets.QStyledItemDelegate):
 
         assert label_rect.width() > 0
 
+        # Leave room for duration
+        elided_width = label_rect.width() - 20
+        if index.data(Roles.WallTimeRole) is not None:
+            elided_width -= 40
+
         label = index.data(QtCore.Qt.DisplayRole)
         label = font_metrics["h4"].elidedText(
             label,
             QtCore.Qt.ElideRight,
-            label_rect.width() - 20
+            elided_width
         )
 
         font_color = colors["idle"]
@@ -251,6 +318,11 @@ class InstanceItemDelegate(QtWidgets.QStyledItemDelegate):
         painter.setPen(QtGui.QPen(font_color))
         painter.drawText(label_rect, label)
 
+        # Draw duration, left of perspective icon
+        duration_rect = QtCore.QRectF(body_rect)
+        duration_rect.setRight(perspective_rect.left() - 4)
+        draw_duration(painter, duration_rect, index)
+
         # Draw checkbox
         pen = QtGui.QPen(check_color, 1)
         painter.setPen(pen)
@@ -410,7 +482,10 @@ class ArtistDelegate(QtWidgets.QStyledItemDelegate):
         icon_rect.setHeight(35)
 
         duration_rect = QtCore.QRectF(content_rect)
-        duration_rect.translate(content_rect.width() - 50, 0)
+        duration_rect.setRight(perspective_rect.left())
+        duration_rect.setLeft(duration_rect.right() - 50)
+
+        wall = index.data(Roles.WallTimeRole)
 
         # Colors
         check_color = colors["idle"]
@@ -478,6 +553,9 @@ class ArtistDelegate(QtWidgets.QStyledItemDelegate):
             - label_x_offset
             - perspective_rect.width()
         )
+        if wall is not None:
+            label_rect.setRight(duration_rect.left())
+
         # Elide label
         label = index.data(QtCore.Qt.DisplayRole)
         label = metrics.elidedText(
@@ -499,6 +577,24 @@ class ArtistDelegate(QtWidgets.QStyledItemDelegate):
 
         painter.drawText(families_rect, families)
 
+        # Draw wall and CPU time
+        if wall is not None:
+            cpu = index.data(Roles.CpuTimeRole) or 0.0
+
+            duration_rect.setHeight(label_rect.height())
+            painter.drawText(
+                duration_rect,
+                QtCore.Qt.AlignRight,
+                format_seconds(wall)
+            )
+
+            duration_rect.translate(0, label_rect.height() + spacing)
+            painter.drawText(
+                duration_rect,
+                QtCore.Qt.AlignRight,
+                "cpu " + format_seconds(cpu)
+            )
+
         painter.setFont(fonts["largeAwesome"])
         painter.setPen(QtGui.QPen(perspective_color))
         painter.drawText(perspective_rect, perspective_icon)
@@ -535,13 +631,68 @@ class ArtistDelegate(QtWidgets.QStyledItemDelegate):
 
 
 class TerminalItem(QtWidgets.QStyledItemDelegate):
-    """Delegate used exclusively for the Terminal"""
+    """Delegate used exclusively for the Terminal
+
+    Details are painted from their text rather than shown in a widget of
+    their own, with an editor created only for the detail clicked.
+
+    Arguments:
+        editor (type, optional): Read-only editor of details, taking
+            their text and parent
+
+    """
+
+    # Pixels around text of details, and of their border
+    detail_padding = 5
+    detail_border = 2
+    detail_radius = 7
+
+    def __init__(self, editor=None, parent=None):
+        super(TerminalItem, self).__init__(parent)
+        self.editor = editor
+
+        # Labels are one line each, of equal height
+        self._label_size = None
+
+        # Laid out details, by text, width and font
+        self._documents = util.LRUCache(settings.TerminalDetailCache)
+
+    def detail_document(self, option, index):
+        """Return laid out document of detail of `index`"""
+        text = index.data(QtCore.Qt.DisplayRole) or ""
+
+        # Width of view, as rows may not be laid out yet
+        width = option.rect.width()
+        if option.widget is not None:
+            width = option.widget.viewport().width()
+
+        key = (text, width, option.font.key())
+        document = self._documents.get(key)
+        if document is not None:
+            return document
+
+        document = QtGui.QTextDocument()
+        document.setDefaultFont(option.font)
+        document.setDocumentMargin(0)
+
+        text_option = document.defaultTextOption()
+        text_option.setWrapMode(
+            QtGui.QTextOption.WrapAtWordBoundaryOrAnywhere
+        )
+        document.setDefaultTextOption(text_option)
+
+        document.setHtml(text)
+        document.setTextWidth(max(width - 2 * self.detail_padding, 1))
+
+        self._documents.put(key, document)
+        return document
 
     def paint(self, painter, option, index):
-        super(TerminalItem, self).paint(painter, option, index)
         item_type = index.data(Roles.TypeRole)
         if item_type == model.TerminalDetailType:
-            return
+            return self.paint_detail(painter, option, index)
+
+        super(TerminalItem, self).paint(painter, option, index)
 
         hover = QtGui.QPainterPath()
         hover.addRect(QtCore.QRectF(option.rect).adjusted(0, 0, -1, -1))
@@ -550,3 +701,73 @@ class TerminalItem(QtWidgets.QStyledItemDelegate):
 
         if option.state & QtWidgets.QStyle.State_MouseOver:
             painter.fillPath(hover, colors["hover"])
+
+    def paint_detail(self, painter, option, index):
+        document = self.detail_document(option, index)
+
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+
+        background = colors["detail"]
+        if option.state & QtWidgets.QStyle.State_MouseOver:
+            background = colors["detailHover"]
+
+        margin = self.detail_border / 2.0
+        body_rect = QtCore.QRectF(option.rect).adjusted(
+            margin, margin, -margin, -margin
+        )
+
+        painter.setPen(QtGui.QPen(colors["detailBorder"], self.detail_border))
+        painter.setBrush(background)
+        painter.drawRoundedRect(
+            body_rect, self.detail_radius, self.detail_radius
+        )
+
+        painter.translate(
+            option.rect.left() + self.detail_padding,
+            option.rect.top() + self.detail_padding
+        )
+
+        context = QtGui.QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QtGui.QPalette.Text, colors["detailText"])
+        document.documentLayout().draw(painter, context)
+
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        # Called for every row on each layout of the view, and so
+        # details are told apart by their parent rather than their type
+        if index.parent().isValid():
+            document = self.detail_document(option, index)
+            return QtCore.QSize(
+                int(document.idealWidth()) + 2 * self.detail_padding,
+                int(document.size().height()) + 2 * self.detail_padding
+            )
+
+        if self._label_size is None:
+            self._label_size = super(TerminalItem, self).sizeHint(
+                option, index
+            )
+
+        return self._label_size
+
+    def createEditor(self, parent, option, index):
+        if self.editor is None:
+            return None
+
+        return self.editor(
+            index.data(QtCore.Qt.DisplayRole),
+            parent,
+            remainder=index.data(Roles.TerminalRemainderRole)
+        )
+
+    def setEditorData(self, editor, index):
+        # Text is given on creation, and never changes
+        pass
+
+    def setModelData(self, editor, item_model, index):
+        # Read-only
+        pass
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
@@ -0,0 +1,477 @@
+"""Cached discovery of plug-ins
+
+Equivalent to `pyblish.api.discover` followed by
+`pyblish.logic.plugins_by_targets`, for plug-in paths where discovery is
+slow, such as on a network share.
+
+Files are listed and stat'ed only, via `os.scandir` where available.
+Modules are imported once and reused for as long as their modification
+time and size remain the same, such that only modified modules are
+imported again on reset.
+
+The names and targets of the plug-ins of each file are also stored on
+disk. A file none of whose plug-ins match the registered targets is not
+imported at all in subsequent sessions, until modified.
+
+Sources of modules to import are read and compiled on a pool of threads,
+and then executed one at a time in the order pyblish would, such that
+the resulting plug-ins and their order remain the same. Time spent on
+each module is available via :func:`timings`.
+
+Usage:
+    $ python -m pyblish_lite --invalidate-discovery
+
+"""
+import copy
+import json
+import logging
+import os
+import sys
+import time
+import types
+
+from multiprocessing.pool import ThreadPool
+
+import pyblish.api
+import pyblish.logic
+import pyblish.plugin
+
+from . import manifest, settings
+from .vendor import six
+
+self = sys.modules[__name__]
+
+log = logging.getLogger("pyblish_lite.discovery")
+
+# Imported plug-ins, by path of module
+self._modules = {}
+
+# Plug-ins of each file, as stored on disk
+self._index = None
+
+# Inputs and result of the last discovery
+self._last = None
+
+# Seconds spent reading, compiling and executing each module, by path
+self._timings = {}
+
+# Attributes of plug-ins changed by the GUI, such as when toggled
+gui_attributes = ("active", "optional", "actions")
+
+# Those attributes of each imported plug-in, as imported
+self._defaults = {}
+
+# Copies of registered plug-ins, as of the last discovery
+self._registered = []
+
+
+def index_path():
+    return settings.DiscoveryCacheFile or os.path.join(
+        os.path.expanduser("~"), ".cache", "pyblish_lite", "discovery.json"
+    )
+
+
+def invalidate():
+    """Forget every discovered plug-in, in memory and on disk"""
+    self._modules.clear()
+    self._defaults.clear()
+    self._registered = []
+    self._index = {}
+    self._last = None
+    self._timings.clear()
+
+    try:
+        os.remove(index_path())
+    except OSError:
+        pass
+
+
+def _load_index():
+    if self._index is None:
+        try:
+            with open(index_path()) as f:
+                self._index = json.load(f)
+        except (IOError, OSError, ValueError):
+            self._index = {}
+
+    return self._index
+
+
+def _save_index():
+    path = index_path()
+
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        temp = "%s.%d.tmp" % (path, os.getpid())
+        with open(temp, "w") as f:
+            json.dump(self._index, f)
+
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temp, path)
+
+    except (IOError, OSError) as e:
+        log.debug("Could not store discovery cache: %s", e)
+
+
+def _plugin_files(path):
+    """Yield path and signature of plug-in files in `path`, in listed order
+
+    Only the directory is read, along with a stat of each file.
+
+    """
+
+    if hasattr(os, "scandir"):
+        entries = (
+            (entry.name, entry.path, entry)
+            for entry in os.scandir(path)
+        )
+    else:
+        entries = (
+            (fname, os.path.join(path, fname), None)
+            for fname in os.listdir(path)
+        )
+
+    for fname, abspath, entry in entries:
+        if fname.startswith("_") or not fname.endswith(".py"):
+            continue
+
+        try:
+            if entry is not None:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            else:
+                if not os.path.isfile(abspath):
+                    continue
+                stat = os.stat(abspath)
+        except OSError:
+            continue
+
+        yield fname, abspath, [stat.st_mtime, stat.st_size]
+
+
+def timings():
+    """Return path and timings of each imported module, slowest first"""
+    return sorted(
+        self._timings.items(),
+        key=lambda item: sum(item[1].values()),
+        reverse=True
+    )
+
+
+def _compile(abspath):
+    """Return code of module at `abspath`, or the exception raised"""
+    timing = self._timings.setdefault(abspath, {})
+
+    try:
+        start = time.time()
+        with open(abspath, "rb") as f:
+            source = f.read()
+        timing["read"] = time.time() - start
+
+        start = time.time()
+        code = compile(source, abspath, "exec")
+        timing["compile"] = time.time() - start
+
+    except Exception as err:
+        return err
+
+    return code
+
+
+def _compile_all(abspaths):
+    """Return code of each module in `abspaths`, by path"""
+    workers = min(settings.DiscoveryThreads, len(abspaths))
+    if workers < 2:
+        return dict((abspath, _compile(abspath)) for abspath in abspaths)
+
+    pool = ThreadPool(workers)
+    try:
+        return dict(zip(abspaths, pool.map(_compile, abspaths)))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def load_module(abspath, fname, code=None):
+    """Import module at `abspath` as pyblish does, or return None
+
+    Arguments:
+        abspath (str): Absolute path to module
+        fname (str): Name of file, from which the module is named
+        code (optional): Compiled source of module, or exception raised
+            compiling it, as returned by :func:`_compile`
+
+    """
+
+    mod_name = os.path.splitext(fname)[0]
+    module = types.ModuleType(mod_name)
+    module.__file__ = abspath
+
+    try:
+        if code is None:
+            code = _compile(abspath)
+
+        if isinstance(code, Exception):
+            raise code
+
+        start = time.time()
+        try:
+            six.exec_(code, module.__dict__)
+        finally:
+            self._timings[abspath]["execute"] = time.time() - start
+
+        # Store reference to original module, to avoid
+        # garbage collection from collecting it's global
+        # imports, such as `import os`.
+        sys.modules[abspath] = module
+
+    except Exception as err:
+        log.error("Skipped: \"%s\" (%s)", mod_name, err)
+        return None
+
+    return module
+
+
+def _import(abspath, fname, code=None):
+    """Return plug-ins of module at `abspath`, or None on failure"""
+    module = load_module(abspath, fname, code)
+    if module is None:
+        return None
+
+    plugins = pyblish.plugin.plugins_from_module(module)
+    for plugin in plugins:
+        plugin.__module__ = abspath
+
+    return plugins
+
+
+def _save_defaults(plugins):
+    for plugin in plugins:
+        self._defaults[plugin] = dict(
+            (name, copy.copy(plugin.__dict__[name]))
+            for name in gui_attributes
+            if name in plugin.__dict__
+        )
+
+
+def _forget(abspath):
+    _, plugins = self._modules.pop(abspath, (None, ()))
+    for plugin in plugins:
+        self._defaults.pop(plugin, None)
+
+
+def _restore(plugins):
+    """Undo changes made by the GUI to imported `plugins`
+
+    Plug-ins are reused across resets and windows, whereas
+    `pyblish.api.discover` would import them anew.
+
+    """
+
+    for plugin in plugins:
+        defaults = self._defaults.get(plugin)
+        if defaults is None:
+            continue
+
+        for name in gui_attributes:
+            if name in defaults:
+                setattr(plugin, name, copy.copy(defaults[name]))
+            elif name in plugin.__dict__:
+                delattr(plugin, name)
+
+
+def _matches(match, plugin_targets, targets):
+    algorithm = pyblish.logic._algorithms.get(match)
+    return bool(algorithm and algorithm(plugin_targets, targets))
+
+
+def discover(paths=None, targets=None, lazy=False):
+    """Return plug-ins of `paths` compatible with `targets`
+
+    Arguments:
+        paths (list, optional): Paths to discover plug-ins from,
+            defaults to every registered path.
+        targets (list, optional): Targets to filter plug-ins by,
+            defaults to the registered targets.
+        lazy (bool, optional): Return stand-ins of plug-ins described
+            by an up to date manifest, see :mod:`manifest`
+
+    """
+
+    paths = [
+        os.path.normpath(path)
+        for path in paths or pyblish.api.plugin_paths()
+    ]
+    targets = targets or pyblish.logic.registered_targets() or ["default"]
+    hosts = sorted(pyblish.api.registered_hosts())
+
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            log.debug("Skipped: \"%s\", path is not a valid folder", path)
+            continue
+
+        files.extend(_plugin_files(path))
+
+    manifests = {}
+    if lazy:
+        manifests = dict((path, manifest.read(path)) for path in paths)
+
+    state = (
+        paths,
+        files,
+        lazy,
+        manifests,
+        list(targets),
+        hosts,
+        [plugin.id for plugin in pyblish.api.registered_plugins()],
+        [id(f) for f in pyblish.api.registered_discovery_filters()],
+    )
+
+    if self._last is not None and self._last[0] == state:
+        _restore(self._last[1])
+        return list(self._last[1])
+
+    index = _load_index()
+    changed = False
+
+    plugins = dict()
+    plugin_names = []
+
+    def add(name, plugin=None, key=None):
+        if not pyblish.plugin.ALLOW_DUPLICATES and name in plugin_names:
+            log.debug("Duplicate plug-in found: %s", name)
+            return
+
+        plugin_names.append(name)
+
+        if plugin is not None:
+            plugins[key] = plugin
+
+    # Decide what to do with each file, before importing any
+    steps = []
+    for fname, abspath, signature in files:
+        entry = index.get(abspath)
+        cached = self._modules.get(abspath)
+        is_current = bool(
+            entry
+            and entry["signature"] == signature
+            and entry["hosts"] == hosts
+        )
+
+        if is_current and cached is not None and cached[0] == [
+            signature, lazy
+        ]:
+            steps.append((fname, abspath, signature, "cached", cached[1]))
+
+        elif is_current and not any(
+            _matches(stored["match"], stored["targets"], targets)
+            for stored in entry["plugins"]
+        ):
+            # Nothing of interest, no need to import
+            steps.append((fname, abspath, signature, "skipped", entry))
+
+        else:
+            stubs = None
+            if lazy:
+                stubs = manifest.stubs(
+                    manifests.get(os.path.dirname(abspath)),
+                    fname,
+                    abspath,
+                    signature
+                )
+
+            # Not described by an up to date manifest
+            if stubs is None:
+                steps.append((fname, abspath, signature, "import", None))
+            else:
+                steps.append((fname, abspath, signature, "stubbed", stubs))
+
+    code = _compile_all([
+        abspath for _, abspath, _, step, _ in steps if step == "import"
+    ])
+
+    # Execute in listed order, as pyblish does
+    for fname, abspath, signature, step, value in steps:
+        if step == "cached":
+            module_plugins = value
+
+        elif step == "skipped":
+            for stored in value["plugins"]:
+                add(stored["name"])
+            continue
+
+        else:
+            if step == "stubbed":
+                module_plugins = value
+            else:
+                module_plugins = _import(abspath, fname, code[abspath])
+
+            if module_plugins is None:
+                continue
+
+            _forget(abspath)
+            _save_defaults(module_plugins)
+            self._modules[abspath] = ([signature, lazy], module_plugins)
+            index[abspath] = {
+                "signature": signature,
+                "hosts": hosts,
+                "plugins": [
+                    {
+                        "name": plugin.__name__,
+                        "match": plugin.match,
+                        "targets": list(plugin.targets),
+                    }
+                    for plugin in module_plugins
+                ],
+            }
+            changed = True
+
+        for plugin in module_plugins:
+            add(
+                plugin.__name__,
+                plugin,
+                "{0}.{1}".format(plugin.__module__, plugin.__name__)
+            )
+
+    # Forget about files removed from the paths discovered
+    listed = set(abspath for _, abspath, _ in files)
+    for abspath in list(index):
+        if os.path.dirname(abspath) in paths and abspath not in listed:
+            index.pop(abspath)
+            _forget(abspath)
+            changed = True
+
+    if changed:
+        _save_index()
+
+    # Include plug-ins from registration.
+    # Directly registered plug-ins take precedence.
+    registered = pyblish.api.registered_plugins()
+    for plugin in registered:
+        add(plugin.__name__, plugin, plugin.__name__)
+
+    # Copies of registered plug-ins are reused until registered anew
+    for plugin in self._registered:
+        self._defaults.pop(plugin, None)
+    _save_defaults(registered)
+    self._registered = registered
+
+    plugins = list(plugins.values())
+    pyblish.plugin.sort(plugins)  # In-place
+
+    # In-place user-defined filter
+    for filter_ in pyblish.api.registered_discovery_filters():
+        filter_(plugins)
+
+    plugins = pyblish.logic.plugins_by_targets(plugins, targets)
+
+    self._last = (state, plugins)
+    _restore(plugins)
+
+    return list(plugins)
@@ -0,0 +1,521 @@
+"""Instances of each family, kept up to date as they change
+
+Rather than walking every instance of the context whenever asked which
+families are active, the controller keeps an index of each family to its
+instances, counting those active. The context tells the index whenever
+an instance is added or removed, and the data of each instance whenever
+its family, families or publish state changes; including additions to
+and removals from its list of families.
+
+The context also gathers what changed since last asked, for the GUI to
+apply rather than compare every instance with what it knows of.
+
+Usage:
+    >>> index = FamilyIndex()
+    >>> context = ObservedContext(index=index)
+    >>> instance = context.create_instance("A", family="model")
+    >>> index.families()
+    ['model']
+    >>> instance.data["publish"] = False
+    >>> index.families()
+    []
+
+"""
+import threading
+
+from collections import OrderedDict
+
+import pyblish.api
+import pyblish.logic
+import pyblish.plugin
+
+# Members of instance data the index is kept up to date with
+observed_keys = ("family", "families", "publish")
+
+
+def families_of(instance):
+    """Return family and families of `instance`"""
+    family = instance.data.get("family")
+    families = [family] if family else []
+    families += instance.data.get("families") or []
+    return families
+
+
+def is_active(instance):
+    return instance.data.get("publish") is not False
+
+
+class FamilyIndex(object):
+    """Instances by family, along with a count of those active
+
+    Queried from the GUI thread, and updated from any thread processing
+    plug-ins.
+
+    Attributes:
+        version (int): Incremented with every change of any instance
+
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget every instance"""
+        with self._lock:
+            self._instances = {}
+
+            # Position of each instance in its context, by id
+            self._positions = {}
+
+            # Whether each instance is active, and its families, by id
+            self._states = {}
+
+            # Ids of instances of each family, and count of those active
+            self._members = {}
+            self._active = {}
+            self._active_count = 0
+
+            # Version at which each family last changed
+            self._changed = {}
+
+            self.version = 0
+
+    def __len__(self):
+        return len(self._instances)
+
+    def __contains__(self, instance):
+        return getattr(instance, "id", instance) in self._instances
+
+    def add(self, instance, position=None):
+        """Index `instance`, at `position` in its context or last"""
+        with self._lock:
+            if instance.id not in self._instances:
+                self._instances[instance.id] = instance
+                self._states[instance.id] = (False, frozenset())
+
+            if position is None:
+                position = len(self._positions)
+            self._positions[instance.id] = position
+
+            self.update(instance)
+
+    def remove(self, instance):
+        with self._lock:
+            if instance.id not in self._instances:
+                return
+
+            self._set_state(instance.id, (False, frozenset()))
+
+            self._instances.pop(instance.id)
+            self._positions.pop(instance.id)
+            self._states.pop(instance.id)
+
+    def update(self, instance):
+        """Re-read family, families and publish state of `instance`"""
+        with self._lock:
+            if instance.id not in self._instances:
+                return
+
+            self._set_state(instance.id, (
+                is_active(instance), frozenset(families_of(instance))
+            ))
+
+    def sync(self, instances):
+        """Index exactly `instances`, in this order
+
+        Returns instances added and removed.
+
+        """
+
+        with self._lock:
+            ids = set(instance.id for instance in instances)
+            removed = [
+                instance for instance in self._instances.values()
+                if instance.id not in ids
+            ]
+            added = [
+                instance for instance in instances
+                if instance.id not in self._instances
+            ]
+
+            for instance in removed:
+                self.remove(instance)
+
+            for position, instance in enumerate(instances):
+                self.add(instance, position)
+
+            return added, removed
+
+    def _set_state(self, instance_id, state):
+        before_active, before = self._states[instance_id]
+        active, after = state
+        if (before_active, before) == state:
+            return
+
+        self.version += 1
+        self._states[instance_id] = state
+
+        for family in before - after:
+            members = self._members[family]
+            members.discard(instance_id)
+            if not members:
+                del self._members[family]
+
+        for family in after - before:
+            self._members.setdefault(family, set()).add(instance_id)
+
+        if before_active:
+            self._active_count -= 1
+            for family in before:
+                self._active[family] -= 1
+                if not self._active[family]:
+                    del self._active[family]
+
+        if active:
+            self._active_count += 1
+            for family in after:
+                self._active[family] = self._active.get(family, 0) + 1
+
+        # Exact and Subset plug-ins of a family depend on every other
+        # family of its instances, so all of them changed
+        for family in before | after:
+            self._changed[family] = self.version
+
+    def families(self):
+        """Return families of active instances"""
+        with self._lock:
+            return list(self._active)
+
+    def count(self, family):
+        """Return number of active instances of `family`"""
+        return self._active.get(family, 0)
+
+    def changed_since(self, version):
+        """Return families whose instances changed after `version`"""
+        with self._lock:
+            return set(
+                family for family, changed in self._changed.items()
+                if changed > version
+            )
+
+    def instances(self, family=None, active_only=False):
+        """Return instances of `family`, or all, in order of the context"""
+        with self._lock:
+            if family is None:
+                ids = self._instances
+            else:
+                ids = self._members.get(family, ())
+
+            return self._ordered(
+                instance_id for instance_id in ids
+                if not active_only or self._states[instance_id][0]
+            )
+
+    def instances_by_plugin(self, plugin):
+        """Return instances compatible with `plugin`, active or not
+
+        As `pyblish.logic.instances_by_plugin`, looking only at instances
+        of the families of `plugin`.
+
+        """
+
+        with self._lock:
+            if "*" in plugin.families or not plugin.families:
+                # Any instance, or instances of no family at all
+                candidates = self._instances
+            else:
+                candidates = set()
+                for family in plugin.families:
+                    candidates.update(self._members.get(family, ()))
+
+            return pyblish.logic.instances_by_plugin(
+                self._ordered(candidates), plugin
+            )
+
+    def is_compatible(self, plugin):
+        """Return whether any active instance is compatible with `plugin`"""
+        with self._lock:
+            if "*" in plugin.families:
+                return self._active_count > 0
+
+            if plugin.match == pyblish.api.Intersection:
+                return any(
+                    self._active.get(family) for family in plugin.families
+                )
+
+            return any(
+                is_active(instance)
+                for instance in self.instances_by_plugin(plugin)
+            )
+
+    def _ordered(self, ids):
+        return [
+            self._instances[instance_id]
+            for instance_id in sorted(ids, key=self._positions.get)
+        ]
+
+
+class ContextChanges(object):
+    """Instances added and removed, and keys of data changed, until taken
+
+    Changes to the same instance are merged, such that an instance added
+    and removed again is not reported at all.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._added = OrderedDict()
+        self._removed = OrderedDict()
+        self._changed = OrderedDict()
+
+    def __len__(self):
+        return len(self._added) + len(self._removed) + len(self._changed)
+
+    def added(self, instance):
+        with self._lock:
+            if self._removed.pop(instance.id, None) is not None:
+                # Put back, possibly changed
+                self._changed[instance.id] = set([None])
+                return
+
+            self._added[instance.id] = instance
+
+    def removed(self, instance):
+        with self._lock:
+            self._changed.pop(instance.id, None)
+            if self._added.pop(instance.id, None) is None:
+                self._removed[instance.id] = instance
+
+    def changed(self, entity, keys):
+        with self._lock:
+            if entity.id in self._added:
+                return
+
+            self._changed.setdefault(entity.id, set()).update(keys)
+
+    def take(self):
+        """Return changes since last taken, and forget them
+
+        As a dictionary of instances "added", ids of instances "removed"
+        and of keys "changed" by id of instance or context. Keys are None
+        when unknown, e.g. with an instance put back into the context.
+
+        """
+
+        with self._lock:
+            changes = {
+                "added": list(self._added.values()),
+                "removed": list(self._removed),
+                "changed": dict(self._changed),
+            }
+
+            self._added.clear()
+            self._removed.clear()
+            self._changed.clear()
+
+        return changes
+
+
+class FamilyList(list):
+    """Families of an instance, telling its index when changed"""
+
+    def __init__(self, families=(), data=None):
+        super(FamilyList, self).__init__(families)
+        self._data = data
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as any other list
+        return list, (list(self),)
+
+    def _changed(self):
+        if self._data is not None:
+            self._data.changed("families")
+
+    def append(self, family):
+        super(FamilyList, self).append(family)
+        self._changed()
+
+    def extend(self, families):
+        super(FamilyList, self).extend(families)
+        self._changed()
+
+    def insert(self, index, family):
+        super(FamilyList, self).insert(index, family)
+        self._changed()
+
+    def remove(self, family):
+        super(FamilyList, self).remove(family)
+        self._changed()
+
+    def pop(self, *args):
+        family = super(FamilyList, self).pop(*args)
+        self._changed()
+        return family
+
+    def __setitem__(self, index, value):
+        super(FamilyList, self).__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super(FamilyList, self).__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, families):
+        super(FamilyList, self).extend(families)
+        self._changed()
+        return self
+
+
+class ObservedData(pyblish.plugin._Dict):
+    """Data of an instance or context, telling its context of changes"""
+
+    def __init__(self, parent, context, data=None):
+        super(ObservedData, self).__init__(parent)
+        self._context = context
+
+        for key, value in (data or {}).items():
+            dict.__setitem__(self, key, self._wrap(key, value))
+
+    def __reduce_ex__(self, protocol):
+        # Copied and pickled as a plain dictionary, without its context
+        return dict, (dict(self),)
+
+    def _wrap(self, key, value):
+        if key == "families" and isinstance(value, list) and not (
+            isinstance(value, FamilyList) and value._data is self
+        ):
+            value = FamilyList(value, self)
+        return value
+
+    def changed(self, *keys):
+        self._context.data_changed(self._parent, keys)
+
+    def __setitem__(self, key, value):
+        super(ObservedData, self).__setitem__(key, self._wrap(key, value))
+        self.changed(key)
+
+    def __delitem__(self, key):
+        super(ObservedData, self).__delitem__(key)
+        self.changed(key)
+
+    def pop(self, key, *args):
+        value = super(ObservedData, self).pop(key, *args)
+        self.changed(key)
+        return value
+
+    def popitem(self):
+        item = super(ObservedData, self).popitem()
+        self.changed(item[0])
+        return item
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+
+        self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        data = dict(*args, **kwargs)
+        for key, value in data.items():
+            dict.__setitem__(self, key, self._wrap(key, value))
+        self.changed(*data)
+
+    def clear(self):
+        keys = list(self)
+        super(ObservedData, self).clear()
+        self.changed(*keys)
+
+
+class ObservedContext(pyblish.api.Context):
+    """Context keeping its family index up to date, and its changes
+
+    Arguments:
+        index (FamilyIndex, optional): Index of instances of this
+            context, defaults to a new index
+
+    Attributes:
+        changes (ContextChanges): Changes since last taken
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.family_index = kwargs.pop("index", None)
+        if self.family_index is None:
+            self.family_index = FamilyIndex()
+
+        self.changes = ContextChanges()
+
+        super(ObservedContext, self).__init__(*args, **kwargs)
+
+        self._data = ObservedData(self, self, self._data)
+
+    def data_changed(self, entity, keys):
+        """Data of `entity`, an instance or this context, changed"""
+        self.changes.changed(entity, keys)
+
+        if entity is not self and any(key in observed_keys for key in keys):
+            self.family_index.update(entity)
+
+    def _observe(self, instance):
+        """Observe data of `instance`, returning False if no instance"""
+        data = getattr(instance, "_data", None)
+        if not isinstance(data, pyblish.plugin._Dict):
+            return False
+
+        if getattr(data, "_context", None) is not self:
+            instance._data = ObservedData(instance, self, data)
+
+        return True
+
+    def _sync(self):
+        added, removed = self.family_index.sync(
+            [instance for instance in self if self._observe(instance)]
+        )
+
+        for instance in removed:
+            self.changes.removed(instance)
+
+        for instance in added:
+            self.changes.added(instance)
+
+    def append(self, instance):
+        super(ObservedContext, self).append(instance)
+        if self._observe(instance):
+            self.family_index.add(instance, len(self) - 1)
+            self.changes.added(instance)
+
+    def extend(self, instances):
+        for instance in instances:
+            self.append(instance)
+
+    def __iadd__(self, instances):
+        self.extend(instances)
+        return self
+
+    def insert(self, index, instance):
+        super(ObservedContext, self).insert(index, instance)
+        self._sync()
+
+    def remove(self, instance):
+        super(ObservedContext, self).remove(instance)
+        self._sync()
+
+    def pop(self, *args):
+        instance = super(ObservedContext, self).pop(*args)
+        self._sync()
+        return instance
+
+    def __setitem__(self, index, value):
+        super(ObservedContext, self).__setitem__(index, value)
+        self._sync()
+
+    def __delitem__(self, index):
+        super(ObservedContext, self).__delitem__(index)
+        self._sync()
+
+    def clear(self):
+        super(ObservedContext, self).clear()
+        self._sync()
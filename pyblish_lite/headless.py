@@ -0,0 +1,164 @@
+"""Publish without a graphical user interface
+
+Drives the same :class:`control.Controller` as the window, such that
+collection, validation and publishing behave exactly as they would in
+the GUI, but with no display and no artificial delay.
+
+Usage:
+    $ python -m pyblish_lite --headless --output summary.json
+
+"""
+from __future__ import print_function
+
+import json
+import os
+import sys
+import time
+
+from . import control, util
+from .vendor.Qt import QtCore
+from .vendor.six import text_type
+
+
+def summarize(result):
+    """Return machine-readable summary of a single `result`"""
+    error = result["error"]
+    instance = result["instance"]
+
+    return {
+        "plugin": result["plugin"].__name__,
+        "order": result["plugin"].order,
+        "instance": None if instance is None else instance.data.get(
+            "name", instance.name
+        ),
+        "success": result["success"],
+        "duration": result["duration"],
+        "timing": result.get("timing"),
+        "error": None if error is None else text_type(error),
+        "traceback": None if error is None else getattr(
+            error, "formatted_traceback", None
+        ),
+        "records": [
+            {
+                "level": record.levelname,
+                "message": record.getMessage(),
+            }
+            for record in result["records"]
+        ],
+    }
+
+
+def run():
+    """Collect, validate and publish, returning a summary
+
+    Returns:
+        summary (dict): Success of the publish as a whole, along
+            with the summary of every pair processed and any
+            unexpected errors of the controller itself.
+
+    """
+
+    app = QtCore.QCoreApplication.instance()
+    if app is None:
+        app = QtCore.QCoreApplication(sys.argv)
+
+    # Every operation is synchronous, there is no event loop to return to
+    delay = os.environ.get("PYBLISH_DELAY")
+    multiplier = util._delay_multiplier
+
+    os.environ["PYBLISH_DELAY"] = "0"
+    util._delay_multiplier = None
+
+    try:
+        return _run()
+
+    finally:
+        if delay is None:
+            os.environ.pop("PYBLISH_DELAY", None)
+        else:
+            os.environ["PYBLISH_DELAY"] = delay
+
+        util._delay_multiplier = multiplier
+
+
+def _run():
+    controller = control.Controller()
+    controller.use_worker_thread = False
+
+    state = {
+        "results": [],
+        "skipped": [],
+        "stopped": False,
+        "finished": False,
+    }
+
+    def on_processed(result):
+        state["results"].append(summarize(result))
+
+    def on_stopped():
+        state["stopped"] = True
+
+    def on_finished():
+        state["finished"] = True
+
+    controller.was_processed.connect(on_processed)
+    controller.was_skipped.connect(
+        lambda plugin: state["skipped"].append(plugin.__name__)
+    )
+    controller.was_finished.connect(on_finished)
+
+    started = time.time()
+
+    controller.reset()
+
+    # Collection stops on its own, anything after means publishing halted
+    controller.was_stopped.connect(on_stopped)
+    controller.publish()
+
+    duration = (time.time() - started) * 1000
+
+    # Errors of the controller itself finish processing early
+    errors = list(controller.unexpected_errors)
+
+    controller.cleanup()
+
+    return {
+        "success": (
+            state["finished"]
+            and not state["stopped"]
+            and not errors
+            and all(result["success"] for result in state["results"])
+        ),
+        "duration": duration,
+        "results": state["results"],
+        "skipped": state["skipped"],
+        "errors": [text_type(error) for error in errors],
+    }
+
+
+def publish(output=None):
+    """Publish, writing summary to `output` or stdout
+
+    Arguments:
+        output (str, optional): Path to summary, defaults to stdout
+
+    Returns:
+        status (int): 0 on success, 1 otherwise
+
+    """
+
+    # Anything printed by plug-ins must not end up in the summary
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        summary = run()
+    finally:
+        sys.stdout = stdout
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(summary, f, indent=4)
+    else:
+        json.dump(summary, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    return 0 if summary["success"] else 1
@@ -0,0 +1,118 @@
+"""Report objects of closed sessions still alive
+
+Hosts show the window many times from one process, such that anything
+a session leaves behind adds up. With leak debugging enabled, the window,
+controller, models, context and instances of a session are tracked as it
+closes, and those still alive once the window is destroyed and garbage
+is collected are logged along with what refers to them.
+
+Enable with settings.DebugLeaks, or by setting PYBLISH_LITE_DEBUG_LEAKS=1.
+
+"""
+import gc
+import logging
+import os
+import sys
+import weakref
+
+from . import settings
+from .vendor.Qt import QtCore
+
+self = sys.modules[__name__]
+
+log = logging.getLogger("pyblish_lite.leaks")
+
+# Description and weak reference of each object tracked
+self._tracked = []
+
+
+def is_enabled():
+    return bool(
+        settings.DebugLeaks or os.environ.get("PYBLISH_LITE_DEBUG_LEAKS")
+    )
+
+
+def track(obj, description=None):
+    """Track `obj`, expected to be freed after its session"""
+    try:
+        ref = weakref.ref(obj)
+    except TypeError:
+        return
+
+    self._tracked.append((description or type(obj).__name__, ref))
+
+
+def track_session(window):
+    """Track `window` along with everything of its session"""
+    controller = window.controller
+
+    track(window, "Window")
+    track(controller, "Controller")
+
+    for name in ("instance_model",
+                 "artist_proxy",
+                 "plugin_model",
+                 "plugin_proxy",
+                 "terminal_model",
+                 "terminal_proxy",
+                 "intent_model"):
+        track(getattr(window, name, None), name)
+
+    if controller.context is not None:
+        track(controller.context, "Context")
+
+        for instance in controller.context:
+            track(instance, "Instance %s" % instance)
+
+
+def survivors():
+    """Return description and object of each tracked object still alive"""
+    gc.collect()
+
+    alive = []
+    for description, ref in self._tracked:
+        obj = ref()
+        if obj is not None:
+            alive.append((description, obj))
+
+    self._tracked[:] = [
+        (description, ref) for description, ref in self._tracked
+        if ref() is not None
+    ]
+
+    return alive
+
+
+def report(*args):
+    """Log tracked objects still alive, returning their descriptions"""
+    alive = survivors()
+    ignored = set(id(item) for item in alive)
+    ignored.update((id(alive), id(sys._getframe())))
+
+    for description, obj in alive:
+        referrers = sorted(set(
+            type(referrer).__name__
+            for referrer in gc.get_referrers(obj)
+            if id(referrer) not in ignored
+        ))
+
+        log.warning(
+            "%s outlived its session, referred to by: %s",
+            description, ", ".join(referrers) or "nothing Python knows of"
+        )
+
+    if not alive:
+        log.info("Session was freed")
+
+    return [description for description, _ in alive]
+
+
+def report_later(*args):
+    """Report shortly, e.g. on destroyed
+
+    Children of a window are deleted later than the window itself, and
+    objects deleted via `deleteLater` once the event loop gets to them.
+
+    """
+
+    QtCore.QTimer.singleShot(500, report)
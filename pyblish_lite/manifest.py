@@ -0,0 +1,213 @@
+"""Lazy loading of plug-ins from a manifest
+
+Listing plug-ins only requires their metadata; order, families, label
+and so forth. A manifest stores this metadata for every plug-in of a
+plug-in path, such that stand-ins may be built without importing any
+module along with its potentially heavy imports.
+
+The module of a stand-in is imported right before it is first processed,
+or an action of it is run. Files modified since the manifest was
+generated are imported as usual.
+
+Usage:
+    $ python -m pyblish_lite --generate-manifest /path/to/plugins
+
+"""
+import json
+import os
+import sys
+import threading
+
+import pyblish.api
+import pyblish.plugin
+
+self = sys.modules[__name__]
+
+# Name of manifest, stored alongside the plug-ins it describes
+filename = "pyblish_manifest.json"
+
+# Plug-ins loaded in place of stand-ins, by id of stand-in
+self._loaded = {}
+self._lock = threading.Lock()
+
+# Attributes built by pyblish, never stored
+ignored_attributes = ("id", "log", "actions")
+
+
+def _is_serializable(value):
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def describe(plugin):
+    """Return metadata of `plugin`, from which to build a stand-in"""
+    attributes = {}
+    for cls in reversed(plugin.__mro__):
+        if cls is object or cls.__module__ == pyblish.plugin.__name__:
+            continue
+
+        for name, value in vars(cls).items():
+            if name.startswith("_") or name in ignored_attributes:
+                continue
+
+            if callable(value) or not _is_serializable(value):
+                continue
+
+            attributes[name] = value
+
+    return {
+        "name": plugin.__name__,
+        "doc": plugin.__doc__,
+        "instanceEnabled": bool(plugin.__instanceEnabled__),
+        "attributes": attributes,
+        "actions": [
+            {
+                "name": action.__name__,
+                "type": action.__type__,
+                "label": getattr(action, "label", None),
+                "icon": getattr(action, "icon", None),
+                "on": action.on,
+            }
+            for action in plugin.actions or []
+        ],
+    }
+
+
+def generate(path):
+    """Write manifest of every plug-in in `path`, returning it"""
+    from . import discovery
+
+    files = {}
+    for fname, abspath, signature in discovery._plugin_files(path):
+        module = discovery.load_module(abspath, fname)
+        if module is None:
+            continue
+
+        plugins = []
+        for name in dir(module):
+            obj = getattr(module, name)
+            if (
+                name.startswith("_")
+                or not isinstance(obj, type)
+                or not issubclass(obj, pyblish.plugin.Plugin)
+                or not pyblish.plugin.plugin_is_valid(obj)
+            ):
+                continue
+
+            plugins.append(describe(obj))
+
+        files[fname] = {
+            "signature": signature,
+            "plugins": plugins,
+        }
+
+    manifest = {"version": 1, "files": files}
+
+    with open(os.path.join(path, filename), "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+    return manifest
+
+
+def read(path):
+    """Return manifest of `path`, or None"""
+    try:
+        with open(os.path.join(path, filename)) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _stub_action(metadata):
+    return type(str(metadata["name"]), (pyblish.api.Action,), {
+        "label": metadata["label"],
+        "icon": metadata["icon"],
+        "on": metadata["on"],
+        "__type__": metadata["type"],
+    })
+
+
+def _stub(metadata, abspath):
+    def process(self, *args, **kwargs):
+        raise RuntimeError("%s was not loaded" % type(self).__name__)
+
+    attributes = dict(metadata["attributes"])
+    attributes["__doc__"] = metadata["doc"]
+    attributes["__lazy__"] = True
+    attributes["actions"] = [
+        _stub_action(action) for action in metadata["actions"]
+    ]
+
+    if metadata["instanceEnabled"]:
+        base = pyblish.api.InstancePlugin
+        attributes["process"] = lambda self, instance: process(self)
+    else:
+        base = pyblish.api.ContextPlugin
+        attributes["process"] = lambda self, context: process(self)
+
+    stub = type(str(metadata["name"]), (base,), attributes)
+    stub.__module__ = abspath
+    return stub
+
+
+def stubs(manifest, fname, abspath, signature):
+    """Return stand-ins of plug-ins in `fname`, or None if not up to date"""
+    if manifest is None:
+        return None
+
+    entry = manifest.get("files", {}).get(fname)
+    if entry is None or entry["signature"] != signature:
+        return None
+
+    return [
+        stub for stub in (
+            _stub(metadata, abspath) for metadata in entry["plugins"]
+        )
+        if pyblish.plugin.version_is_compatible(stub)
+        and pyblish.plugin.host_is_compatible(stub)
+    ]
+
+
+def is_stub(plugin):
+    return bool(getattr(plugin, "__lazy__", False))
+
+
+def load(plugin):
+    """Return plug-in of stand-in `plugin`, importing it if need be"""
+    if not is_stub(plugin):
+        return plugin
+
+    with self._lock:
+        loaded = self._loaded.get(plugin.id)
+        if loaded is not None:
+            return loaded
+
+        from . import discovery
+
+        module = sys.modules.get(plugin.__module__)
+        if module is None:
+            module = discovery.load_module(
+                plugin.__module__, os.path.basename(plugin.__module__)
+            )
+
+        loaded = getattr(module, plugin.__name__, None)
+        if loaded is None:
+            raise ImportError(
+                "%s not found in %s" % (plugin.__name__, plugin.__module__)
+            )
+
+        loaded.__module__ = plugin.__module__
+        self._loaded[plugin.id] = loaded
+        return loaded
+
+
+def load_action(plugin, action):
+    """Return action of loaded `plugin` corresponding to stand-in `action`"""
+    loaded = load(plugin)
+    if loaded is plugin:
+        return action
+
+    return loaded.actions[plugin.actions.index(action)]
@@ -25,6 +25,8 @@ Roles:
 """
 from __future__ import unicode_literals
 
+import weakref
+
 import pyblish
 
 from . import settings, util
@@ -32,7 +34,6 @@ from .awesome import tags as awesome
 from .vendor import Qt
 from .vendor.Qt import QtCore, QtGui
 from .vendor.six import text_type
-from .vendor.six.moves import queue
 from .vendor import qtawesome
 from .constants import PluginStates, InstanceStates, GroupStates, Roles
 
@@ -74,6 +75,40 @@ class QAwesomeIconFactory:
         return cls.icons[icon_name][icon_color]
 
 
+def emit_changed(model, items):
+    """Emit one dataChanged per parent, spanning rows of changed `items`
+
+    For changes made with signals of `model` blocked, such that views and
+    proxies are told about many changes at once. Parents of items are
+    included, as flags of items propagate to their group.
+
+    """
+
+    rows = {}
+    for item in items:
+        if item is None or item.model() is not model:
+            # Removed since
+            continue
+
+        parent = item.parent()
+        if parent is None:
+            rows.setdefault(None, set()).add(item.row())
+            continue
+
+        rows.setdefault(None, set()).add(parent.row())
+        rows.setdefault(parent.row(), set()).add(item.row())
+
+    for parent_row, item_rows in rows.items():
+        parent = QtCore.QModelIndex()
+        if parent_row is not None:
+            parent = model.index(parent_row, 0)
+
+        model.dataChanged.emit(
+            model.index(min(item_rows), 0, parent),
+            model.index(max(item_rows), 0, parent)
+        )
+
+
 class IntentModel(QtGui.QStandardItemModel):
     """Model for QComboBox with intents.
 
@@ -419,9 +454,16 @@ class PluginModel(QtGui.QStandardItemModel):
         self.group_items = {}
         self.plugin_items = {}
 
+        # Version of the family index as of the last update of
+        # compatibility, and ids of plug-ins up to date as of then
+        self._index_version = 0
+        self._compatible_ids = set()
+
     def reset(self):
         self.group_items = {}
         self.plugin_items = {}
+        self._index_version = 0
+        self._compatible_ids = set()
         self.clear()
 
     def append(self, plugin):
@@ -502,59 +544,140 @@ class PluginModel(QtGui.QStandardItemModel):
         ):
             new_flag_states[PluginStates.HasError] = True
 
+        if result.get("cached"):
+            new_flag_states[PluginStates.WasCached] = True
+
         item.setData(new_flag_states, Roles.PublishFlagsRole)
 
-        records = item.data(Roles.LogRecordsRole) or []
-        records.extend(new_records)
+        # Ids of records in the record store of the controller
+        record_ids = item.data(Roles.LogRecordsRole) or []
+        record_ids.extend(result.get("record_ids") or [])
+
+        item.setData(record_ids, Roles.LogRecordsRole)
 
-        item.setData(records, Roles.LogRecordsRole)
+        wall, cpu = self.controller.plugin_timing(plugin.id)
+        item.setData(wall, Roles.WallTimeRole)
+        item.setData(cpu, Roles.CpuTimeRole)
 
         return item
 
-    def update_compatibility(self):
-        context = self.controller.context
+    def update_with_results(self, results):
+        """Update with many `results`, emitting their changes in one go"""
+        self.blockSignals(True)
+        try:
+            items = [self.update_with_result(result) for result in results]
+        finally:
+            self.blockSignals(False)
 
-        families = util.collect_families_from_instances(context, True)
-        for plugin_item in self.plugin_items.values():
-            publish_states = plugin_item.data(Roles.PublishFlagsRole)
-            if (
-                publish_states & PluginStates.WasProcessed
-                or publish_states & PluginStates.WasSkipped
-            ):
+        emit_changed(self, items)
+        return items
+
+    def update_errors(self, plugin_ids, failed_ids):
+        """Reflect errors of re-processed plug-ins in place
+
+        Arguments:
+            plugin_ids (set): Ids of re-processed plug-ins
+            failed_ids (set): Ids of plug-ins with any failed pair
+
+        """
+
+        for plugin_id in plugin_ids:
+            item = self.plugin_items.get(plugin_id)
+            if item is None:
                 continue
 
-            is_compatible = False
-            # A plugin should always show if it has processed.
-            if plugin_item.plugin.__instanceEnabled__:
-                compatible_instances = pyblish.logic.instances_by_plugin(
-                    context, plugin_item.plugin
-                )
-                for instance in context:
-                    if not instance.data.get("publish"):
-                        continue
+            item.setData(
+                {PluginStates.HasError: plugin_id in failed_ids},
+                Roles.PublishFlagsRole
+            )
 
-                    if instance in compatible_instances:
-                        is_compatible = True
-                        break
-            else:
-                plugins = pyblish.logic.plugins_by_families(
-                    [plugin_item.plugin], families
+        for group_item in self.group_items.values():
+            has_error = any(
+                group_item.child(row).data(Roles.PublishFlagsRole)
+                & PluginStates.HasError
+                for row in range(group_item.rowCount())
+            )
+            group_item.setData(
+                {GroupStates.HasError: has_error}, Roles.PublishFlagsRole
+            )
+
+    def update_compatibility(self):
+        """Update compatibility of plug-ins affected by changed instances
+
+        Plug-ins are only checked anew when first seen, or when instances
+        of their families have changed. Returns items whose compatibility
+        changed.
+
+        """
+
+        family_index = self.controller.family_index
+        version = family_index.version
+        changed_families = family_index.changed_since(self._index_version)
+        self._index_version = version
+
+        families = None
+        changed_items = []
+
+        self.blockSignals(True)
+        try:
+            for plugin_id, plugin_item in self.plugin_items.items():
+                publish_states = plugin_item.data(Roles.PublishFlagsRole)
+                if (
+                    publish_states & PluginStates.WasProcessed
+                    or publish_states & PluginStates.WasSkipped
+                ):
+                    # A plugin should always show if it has processed.
+                    self._compatible_ids.discard(plugin_id)
+                    continue
+
+                plugin = plugin_item.plugin
+                if plugin_id in self._compatible_ids and not (
+                    changed_families and (
+                        not plugin.families
+                        or "*" in plugin.families
+                        or changed_families.intersection(plugin.families)
+                    )
+                ):
+                    continue
+
+                self._compatible_ids.add(plugin_id)
+
+                if plugin.__instanceEnabled__:
+                    is_compatible = family_index.is_compatible(plugin)
+
+                else:
+                    if families is None:
+                        families = family_index.families()
+
+                    is_compatible = bool(pyblish.logic.plugins_by_families(
+                        [plugin], families
+                    ))
+
+                current_is_compatible = bool(
+                    publish_states & PluginStates.IsCompatible
                 )
-                if plugins:
-                    is_compatible = True
+                if is_compatible != current_is_compatible:
+                    new_flag = {
+                        PluginStates.IsCompatible: is_compatible
+                    }
+                    plugin_item.setData(new_flag, Roles.PublishFlagsRole)
+                    changed_items.append(plugin_item)
 
-            current_is_compatible = publish_states & PluginStates.IsCompatible
-            if (
-                (is_compatible and not current_is_compatible)
-                or (not is_compatible and current_is_compatible)
-            ):
-                new_flag = {
-                    PluginStates.IsCompatible: is_compatible
-                }
-                plugin_item.setData(new_flag, Roles.PublishFlagsRole)
+        finally:
+            self.blockSignals(False)
+
+        # Filtered anew by proxies, row by row
+        emit_changed(self, changed_items)
+        return changed_items
 
 
 class PluginFilterProxy(QtCore.QSortFilterProxyModel):
+    def __init__(self, *args, **kwargs):
+        super(PluginFilterProxy, self).__init__(*args, **kwargs)
+
+        # Filter anew as compatibility changes, off by default in Qt 4
+        self.setDynamicSortFilter(True)
+
     def filterAcceptsRow(self, source_row, source_parent):
         index = self.sourceModel().index(source_row, 0, source_parent)
         item_type = index.data(Roles.TypeRole)
@@ -803,15 +926,62 @@ class InstanceModel(QtGui.QStandardItemModel):
 
         item.setData(new_flag_states, Roles.PublishFlagsRole)
 
-        records = item.data(Roles.LogRecordsRole) or []
-        records.extend(new_records)
+        # Ids of records in the record store of the controller
+        record_ids = item.data(Roles.LogRecordsRole) or []
+        record_ids.extend(result.get("record_ids") or [])
+
+        item.setData(record_ids, Roles.LogRecordsRole)
 
-        item.setData(records, Roles.LogRecordsRole)
+        wall, cpu = self.controller.instance_timing(instance_id)
+        item.setData(wall, Roles.WallTimeRole)
+        item.setData(cpu, Roles.CpuTimeRole)
 
         return item
 
+    def update_with_results(self, results):
+        """Update with many `results`, emitting their changes in one go"""
+        self.blockSignals(True)
+        try:
+            items = [self.update_with_result(result) for result in results]
+        finally:
+            self.blockSignals(False)
+
+        emit_changed(self, items)
+        return items
+
+    def update_errors(self, instance_ids, failed_ids):
+        """Reflect errors of re-processed instances in place
+
+        Arguments:
+            instance_ids (set): Ids of re-processed instances and context
+            failed_ids (set): Ids of instances and context with any
+                failed pair
+
+        """
+
+        for instance_id in instance_ids:
+            item = self.instance_items.get(instance_id)
+            if item is None:
+                continue
+
+            item.setData(
+                {InstanceStates.HasError: instance_id in failed_ids},
+                Roles.PublishFlagsRole
+            )
+
+        for group_item in self.group_items.values():
+            has_error = any(
+                group_item.child(row).data(Roles.PublishFlagsRole)
+                & InstanceStates.HasError
+                for row in range(group_item.rowCount())
+            )
+            group_item.setData(
+                {GroupStates.HasError: has_error}, Roles.PublishFlagsRole
+            )
+
     def update_compatibility(self, context, instances):
-        families = util.collect_families_from_instances(context, True)
+        family_index = self.controller.family_index
+        families = family_index.families()
         for plugin_item in self.plugin_items.values():
             publish_states = plugin_item.data(Roles.PublishFlagsRole)
             if (
@@ -823,8 +993,8 @@ class InstanceModel(QtGui.QStandardItemModel):
             is_compatible = False
             # A plugin should always show if it has processed.
             if plugin_item.plugin.__instanceEnabled__:
-                compatibleInstances = pyblish.logic.instances_by_plugin(
-                    context, plugin_item.plugin
+                compatibleInstances = family_index.instances_by_plugin(
+                    plugin_item.plugin
                 )
                 for instance in instances:
                     if not instance.data.get("publish"):
@@ -1007,7 +1177,41 @@ class ArtistProxy(QtCore.QAbstractProxyModel):
         return QtCore.QModelIndex()
 
 
-class TerminalModel(QtGui.QStandardItemModel):
+class TerminalRow(object):
+    """A record of the terminal, as little of it as is needed to list it
+
+    Records with an id are read back from the record store once their
+    detail is shown, others are kept as-is.
+
+    """
+
+    __slots__ = (
+        "row", "label", "item_type", "record_type", "record_id", "record"
+    )
+
+    def __init__(self, row, label, item_type, record_type,
+                 record_id=None, record=None):
+        self.row = row
+        self.label = label
+        self.item_type = item_type
+        self.record_type = record_type
+        self.record_id = record_id
+        self.record = record
+
+
+class TerminalModel(QtCore.QAbstractItemModel):
+    """Records of a session, each a label with its detail as only child
+
+    Rows are `TerminalRow`, with nothing but the detail row pointing to
+    its row, such that hundreds of thousands of records take up little
+    memory. Details are rendered as they are asked for, i.e. once their
+    row is expanded and visible.
+
+    Records given by id alone, see :meth:`set_record_ids`, are read from
+    the store a page at a time, as the view scrolls down to them.
+
+    """
+
     key_label_record_map = (
         ("instance", "Instance"),
         ("msg", "Message"),
@@ -1046,13 +1250,136 @@ class TerminalModel(QtGui.QStandardItemModel):
 
     )
 
-    def __init__(self, *args, **kwargs):
-        super(TerminalModel, self).__init__(*args, **kwargs)
-        self.reset()
+    def __init__(self, store=None, parent=None):
+        super(TerminalModel, self).__init__(parent)
+
+        # Details of records with an id are read from here once shown
+        self.store = store
+
+        self._rows = []
+
+        # Ids of records yet to be listed, from `_unlisted_from` onwards
+        self._unlisted = []
+        self._unlisted_from = 0
+
+        # Rendered details, by row
+        self._details = util.LRUCache(settings.TerminalDetailCache)
 
     def reset(self):
-        self.items_to_set_widget = queue.Queue()
-        self.clear()
+        self.beginResetModel()
+        self._rows = []
+        self._unlisted = []
+        self._unlisted_from = 0
+        self._details.clear()
+        self.endResetModel()
+
+    def set_record_ids(self, record_ids):
+        """List records of `record_ids` in the store, as they are fetched"""
+        self.reset()
+        self._unlisted = list(record_ids)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._unlisted_from < len(self._unlisted)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+
+        first = self._unlisted_from
+        record_ids = self._unlisted[first:first + settings.TerminalPageSize]
+        self._unlisted_from += len(record_ids)
+
+        if self._unlisted_from >= len(self._unlisted):
+            self._unlisted = []
+            self._unlisted_from = 0
+
+        self.extend(self.store.page(record_ids), record_ids)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        # Called for every row on each layout of the view, and so
+        # bounds are checked here rather than via hasIndex()
+        if column != 0:
+            return QtCore.QModelIndex()
+
+        if parent.isValid():
+            if row != 0 or parent.internalPointer() is not None:
+                return QtCore.QModelIndex()
+
+            # Detail, pointing to its row
+            return self.createIndex(row, column, self._rows[parent.row()])
+
+        if not 0 <= row < len(self._rows):
+            return QtCore.QModelIndex()
+
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            # QObject.parent()
+            return super(TerminalModel, self).parent()
+
+        entry = index.internalPointer() if index.isValid() else None
+        if entry is None:
+            return QtCore.QModelIndex()
+
+        return self.createIndex(entry.row, 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self._rows)
+
+        # Only labels have a child, their detail
+        return 1 if parent.internalPointer() is None else 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        detail = index.internalPointer()
+        if detail is not None:
+            if role == QtCore.Qt.DisplayRole:
+                return self.detail_text(detail)
+
+            if role == Roles.TypeRole:
+                return TerminalDetailType
+
+            if role == Roles.TerminalRemainderRole:
+                return self.detail_remainder(
+                    self.record(detail), settings.TerminalDetailLines
+                )
+
+            return None
+
+        entry = self._rows[index.row()]
+
+        if role == QtCore.Qt.DisplayRole:
+            return entry.label
+
+        if role == QtCore.Qt.DecorationRole:
+            icon_color = self.item_icon_colors.get(entry.item_type)
+            icon_name = self.item_icon_name.get(entry.record_type)
+            if icon_color and icon_name:
+                return QAwesomeIconFactory.icon(icon_name, icon_color)
+            return None
+
+        if role == Roles.TypeRole:
+            return TerminalLabelType
+
+        if role == Roles.TerminalItemTypeRole:
+            return entry.item_type
+
+        return None
+
+    def record(self, entry):
+        """Return record of `entry`, reading it from the store if need be"""
+        if entry.record is not None:
+            return entry.record
+        return self.store.get(entry.record_id)
 
     def prepare_records(self, result):
         prepared_records = []
@@ -1061,6 +1388,17 @@ class TerminalModel(QtGui.QStandardItemModel):
         if instance is not None:
             instance_name = instance.data["name"]
 
+        if result.get("cached"):
+            cached_item = {
+                "label": "Replayed from cache",
+                "type": "info"
+            }
+
+            if instance_name is not None:
+                cached_item["instance"] = instance_name
+
+            prepared_records.append(cached_item)
+
         for record in result.get("records") or []:
             if isinstance(record, dict):
                 record_item = record
@@ -1103,67 +1441,95 @@ class TerminalModel(QtGui.QStandardItemModel):
 
         return prepared_records
 
-    def append(self, record_item):
+    def store_result(self, result):
+        """Return records of `result` prepared, along with ids in the store
+
+        The result is left as it is, being shared with the context, such
+        that records spilled by the store are no longer held in memory.
+
+        """
+
+        records = self.prepare_records(result)
+        if self.store is None:
+            return records, [None] * len(records)
+
+        return records, [self.store.add(record) for record in records]
+
+    def terminal_item_type(self, record_item):
         record_type = record_item["type"]
+        if record_type != "record":
+            return record_type
 
         terminal_item_type = None
-        if record_type == "record":
-            for level, _type in self.level_to_record:
-                if level > record_item["levelno"]:
-                    break
-                terminal_item_type = _type
+        for level, _type in self.level_to_record:
+            if level > record_item["levelno"]:
+                break
+            terminal_item_type = _type
 
-        else:
-            terminal_item_type = record_type
+        return terminal_item_type
 
-        icon_color = self.item_icon_colors.get(terminal_item_type)
-        icon_name = self.item_icon_name.get(record_type)
+    def append(self, record_item, record_id=None):
+        self.extend([record_item], [record_id])
 
-        top_item_icon = None
-        if icon_color and icon_name:
-            top_item_icon = QAwesomeIconFactory.icon(icon_name, icon_color)
+    def extend(self, records, record_ids=None):
+        """Append rows of `records`, with their ids in the store if any"""
+        if not records:
+            return
 
-        label = record_item["label"].split("\n")[0]
+        record_ids = record_ids or [None] * len(records)
+        first = len(self._rows)
 
-        top_item = QtGui.QStandardItem()
-        top_item.setData(TerminalLabelType, Roles.TypeRole)
-        top_item.setData(terminal_item_type, Roles.TerminalItemTypeRole)
-        top_item.setData(label, QtCore.Qt.DisplayRole)
-        top_item.setFlags(
-            QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled
-        )
+        rows = []
+        for row, (record_item, record_id) in enumerate(
+            zip(records, record_ids), first
+        ):
+            if record_id is None or self.store is None:
+                record_id, record = None, record_item
+            else:
+                record = None
+
+            rows.append(TerminalRow(
+                row,
+                record_item["label"].split("\n")[0],
+                self.terminal_item_type(record_item),
+                record_item["type"],
+                record_id,
+                record
+            ))
+
+        last = first + len(rows) - 1
+        self.beginInsertRows(QtCore.QModelIndex(), first, last)
+        self._rows.extend(rows)
+        self.endInsertRows()
 
-        if top_item_icon:
-            top_item.setData(top_item_icon, QtCore.Qt.DecorationRole)
+    def update_with_result(self, result):
+        self.extend(result["records"], result.get("record_ids"))
 
-        self.appendRow(top_item)
+    def prepare_detail_text(self, item_data, max_lines=None):
+        """Return HTML of detail of `item_data`
 
-        detail_text = self.prepare_detail_text(record_item)
-        detail_item = QtGui.QStandardItem(detail_text)
-        detail_item.setData(TerminalDetailType, Roles.TypeRole)
-        top_item.appendRow(detail_item)
-        self.items_to_set_widget.put(detail_item)
+        Values longer than `max_lines` lines are cut short, and end in a
+        note of how many lines were left out, see :meth:`detail_remainder`
 
-    def update_with_result(self, result):
-        for record in result["records"]:
-            self.append(record)
+        """
 
-    def prepare_detail_text(self, item_data):
         if item_data["type"] == "info":
             return item_data["label"]
 
-        html_text = ""
+        rows = []
         for key, title in self.key_label_record_map:
             if key not in item_data:
                 continue
-            value = item_data[key]
-            text = (
-                str(value)
-                .replace("<", "&#60;")
-                .replace(">", "&#62;")
-                .replace('\n', '<br/>')
-                .replace(' ', '&nbsp;')
-            )
+
+            value = text_type(item_data[key])
+            lines = value.split("\n")
+            if max_lines is not None and len(lines) > max_lines:
+                text = "{}<br/>{}".format(
+                    escape_detail("\n".join(lines[:max_lines])),
+                    detail_note(title, len(lines) - max_lines)
+                )
+            else:
+                text = escape_detail(value)
 
             title_tag = (
                 '<span style=\" font-size:8pt; font-weight:600;'
@@ -1171,15 +1537,57 @@ class TerminalModel(QtGui.QStandardItemModel):
                 ' color:#fff;\" >{}:</span> '
             ).format(title)
 
-            html_text += (
-                '<tr><td width="100%" align=left>{}</td></tr>'
-                '<tr><td width="100%">{}</td></tr>'
-            ).format(title_tag, text)
+            # Paragraphs rather than a table, which is laid out anew
+            # as a whole on every change, such as lines filled in
+            rows.append((
+                '<p style="margin:3px;">{}</p>'
+                '<p style="margin:3px;">{}</p>'
+            ).format(title_tag, text))
 
-        html_text = '<table width="100%" cellspacing="3">{}</table>'.format(
-            html_text
-        )
-        return html_text
+        return "".join(rows)
+
+    def detail_remainder(self, item_data, max_lines):
+        """Return title and lines of each value cut short in its detail"""
+        if item_data["type"] == "info":
+            return []
+
+        remainder = []
+        for key, title in self.key_label_record_map:
+            if key not in item_data:
+                continue
+
+            lines = text_type(item_data[key]).split("\n")
+            if len(lines) > max_lines:
+                remainder.append((title, lines[max_lines:]))
+
+        return remainder
+
+    def detail_text(self, entry):
+        """Return HTML of detail of `entry`, rendered once and cached"""
+        text = self._details.get(entry.row)
+        if text is None:
+            text = self.prepare_detail_text(
+                self.record(entry), settings.TerminalDetailLines
+            )
+            self._details.put(entry.row, text)
+
+        return text
+
+
+def detail_note(title, count):
+    """Return note standing in for `count` lines left out of `title`"""
+    return "[{} more lines of {}]".format(count, title)
+
+
+def escape_detail(text):
+    """Return `text` as HTML, keeping its whitespace and line breaks"""
+    return (
+        text
+        .replace("<", "&#60;")
+        .replace(">", "&#62;")
+        .replace("\n", "<br/>")
+        .replace(" ", "&nbsp;")
+    )
 
 
 class TerminalProxy(QtCore.QSortFilterProxyModel):
@@ -1193,11 +1601,12 @@ class TerminalProxy(QtCore.QSortFilterProxyModel):
         "error": settings.TerminalFilters.get("error", True)
     }
 
-    instances = []
+    # Every proxy alive, without keeping closed windows alive
+    instances = weakref.WeakSet()
 
     def __init__(self, view, *args, **kwargs):
         super(self.__class__, self).__init__(*args, **kwargs)
-        self.__class__.instances.append(self)
+        self.__class__.instances.add(self)
         # Store parent because by own `QSortFilterProxyModel` has `parent`
         # method not returning parent QObject in PySide and PyQt4
         self.view = view
@@ -1206,7 +1615,7 @@ class TerminalProxy(QtCore.QSortFilterProxyModel):
     def change_filter(cls, name, value):
         cls.filter_buttons_checks[name] = value
 
-        for instance in cls.instances:
+        for instance in list(cls.instances):
             try:
                 instance.invalidate()
                 if instance.view:
@@ -1214,7 +1623,7 @@ class TerminalProxy(QtCore.QSortFilterProxyModel):
 
             except RuntimeError:
                 # C++ Object was deleted
-                cls.instances.remove(instance)
+                cls.instances.discard(instance)
 
     def filterAcceptsRow(self, source_row, source_parent):
         index = self.sourceModel().index(source_row, 0, source_parent)
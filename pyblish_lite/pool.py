@@ -0,0 +1,278 @@
+"""Process-pool execution of plug-ins
+
+Threads are of little help to plug-ins bound by Python itself, due to
+the GIL. Instance plug-ins declaring `multiprocess = True` are instead
+processed by one of a pool of worker processes.
+
+Each worker discovers the registered plug-ins once, when started, and is
+then reused for every pair and across resets; import cost is paid once
+per session. A picklable snapshot of the instance and context is sent to
+the worker, and the result, log records and modified data are merged
+back into the live context.
+
+Workers are started as fresh interpreters rather than forked from the
+host, which may be running Qt and threads of its own. Plug-ins only
+registered in memory via `pyblish.api.register_plugin` are therefore
+unknown to workers. Such plug-ins, along with context plug-ins, are
+processed in this process as usual.
+
+"""
+import atexit
+import logging
+import multiprocessing
+import pickle
+import sys
+import threading
+
+import pyblish.api
+import pyblish.lib
+import pyblish.plugin
+
+from . import settings, util
+
+self = sys.modules[__name__]
+
+# Pool of worker processes, shared by every controller
+self._pool = None
+self._processes = None
+self._lock = threading.Lock()
+
+# Plug-ins discovered by a worker process, by key
+self._plugins = {}
+
+# Data of the context written by pyblish itself, never merged
+ignored_keys = ("results",)
+
+
+class RemoteError(Exception):
+    """Exception raised by a plug-in in a worker process"""
+
+
+def plugin_key(plugin):
+    return "{0}.{1}".format(plugin.__module__, plugin.__name__)
+
+
+def is_supported(plugin):
+    """Return whether `plugin` may be processed in a worker process"""
+    return bool(
+        getattr(plugin, "multiprocess", False)
+        and plugin.__instanceEnabled__
+    )
+
+
+def pickled(data):
+    """Return pickled copy of each picklable member of `data`"""
+    members = {}
+    for key, value in data.items():
+        if key in ignored_keys:
+            continue
+
+        try:
+            members[key] = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            continue
+
+    return members
+
+
+def snapshot(entity):
+    return {
+        "id": entity.id,
+        "name": entity.name,
+        "data": pickled(entity.data),
+    }
+
+
+def changes(before, data):
+    """Return members of `data` changed since `before`, and removed keys"""
+    after = pickled(data)
+    changed = dict(
+        (key, value) for key, value in after.items()
+        if before.get(key) != value
+    )
+    removed = [key for key in before if key not in data]
+    return changed, removed
+
+
+def _discover(paths=None):
+    self._plugins = dict(
+        (plugin_key(plugin), plugin)
+        for plugin in pyblish.api.discover(paths=paths)
+    )
+
+
+def _initialize(paths):
+    """Pre-warm worker process with the plug-ins of the session"""
+    _discover(paths)
+
+
+def _record(record):
+    """Return picklable attributes of log `record`"""
+    attributes = dict(vars(record))
+    attributes["msg"] = record.getMessage()
+    attributes["args"] = None
+    attributes["exc_info"] = None
+    return attributes
+
+
+def _process(key, paths, context_snapshot, instance_snapshot):
+    """Process `key` in worker process, returning picklable result
+
+    Returns None if the plug-in is unknown to this worker.
+
+    """
+
+    if key not in self._plugins:
+        # Plug-ins may have been added since the worker was started
+        _discover(paths)
+
+    plugin = self._plugins.get(key)
+    if plugin is None:
+        return None
+
+    context = pyblish.api.Context()
+    for data_key, value in context_snapshot["data"].items():
+        context.data[data_key] = pickle.loads(value)
+
+    instance = context.create_instance(instance_snapshot["name"])
+    for data_key, value in instance_snapshot["data"].items():
+        instance.data[data_key] = pickle.loads(value)
+
+    cpu_started = util.cpu_time()
+    result = pyblish.plugin.process(plugin, context, instance)
+    cpu = util.cpu_time() - cpu_started
+
+    error = result["error"]
+    if error is not None:
+        error = {
+            "message": str(error),
+            "traceback": tuple(str(part) for part in error.traceback),
+            "formatted_traceback": error.formatted_traceback,
+        }
+
+    return {
+        "success": result["success"],
+        "error": error,
+        "records": [_record(record) for record in result["records"]],
+        "duration": result["duration"],
+        "cpu": cpu,
+        "context": changes(context_snapshot["data"], context.data),
+        "instance": changes(instance_snapshot["data"], instance.data),
+    }
+
+
+def _context():
+    """Return multiprocessing context starting fresh interpreters
+
+    Python 2 has no choice of start method, and forks outside of Windows.
+
+    """
+
+    if not hasattr(multiprocessing, "get_context"):
+        return multiprocessing
+    return multiprocessing.get_context("spawn")
+
+
+def get_pool(processes):
+    """Return pool of `processes` workers, starting it if necessary"""
+    with self._lock:
+        if self._pool is not None and self._processes == processes:
+            return self._pool
+
+        shutdown()
+
+        context = _context()
+        if settings.ProcessPoolExecutable:
+            context.set_executable(settings.ProcessPoolExecutable)
+
+        self._pool = context.Pool(
+            processes,
+            initializer=_initialize,
+            initargs=(pyblish.api.plugin_paths(),)
+        )
+        self._processes = processes
+        return self._pool
+
+
+def shutdown():
+    """Terminate worker processes"""
+    if self._pool is None:
+        return
+
+    self._pool.terminate()
+    self._pool.join()
+
+    self._pool = None
+    self._processes = None
+
+
+atexit.register(shutdown)
+
+
+def _merge(entity, changed, removed):
+    for key, value in changed.items():
+        entity.data[key] = pickle.loads(value)
+
+    for key in removed:
+        entity.data.pop(key, None)
+
+
+def process(plugin, context, instance, processes, timeout=None):
+    """Produce `result` from `plugin` and `instance` in a worker process
+
+    Returns None if `plugin` could not be processed by a worker.
+
+    Raises:
+        multiprocessing.TimeoutError: If not done within `timeout` seconds,
+            in which case the pair is abandoned to its worker.
+
+    """
+
+    remote = get_pool(processes).apply_async(_process, (
+        plugin_key(plugin),
+        pyblish.api.plugin_paths(),
+        snapshot(context),
+        snapshot(instance),
+    )).get(timeout)
+
+    if remote is None:
+        return None
+
+    error = remote["error"]
+    if error is not None:
+        message = error["message"]
+        error = RemoteError(message)
+        error.traceback = remote["error"]["traceback"]
+        error.formatted_traceback = remote["error"]["formatted_traceback"]
+
+    # Records were emitted on behalf of this thread
+    thread = threading.current_thread()
+    records = []
+    for attributes in remote["records"]:
+        record = logging.makeLogRecord(attributes)
+        record.thread = thread.ident
+        record.threadName = thread.name
+        records.append(record)
+
+    _merge(context, *remote["context"])
+    _merge(instance, *remote["instance"])
+
+    result = {
+        "success": remote["success"],
+        "plugin": plugin,
+        "instance": instance,
+        "action": None,
+        "error": error,
+        "records": records,
+        "duration": remote["duration"],
+        "progress": 0,
+        "context": context,
+
+        # Spent by the worker, rather than this process
+        "timing": {"cpu": remote["cpu"]},
+    }
+
+    context.data.setdefault("results", list()).append(result)
+    pyblish.lib.emit("pluginProcessed", result=result)
+
+    return result
@@ -0,0 +1,113 @@
+"""Opt-in profiling of plug-ins with cProfile
+
+With profiling enabled, each pair processed in this process is run under
+its own profiler. Its statistics are stored as a .pstats file named after
+the plug-in and instance, alongside a merged profile of the whole session
+once processing is done.
+
+Enable with settings.Profile, or by setting PYBLISH_LITE_PROFILE=1.
+Files may be inspected with any pstats viewer, e.g. snakeviz.
+
+Usage:
+    $ python -m pstats /tmp/pyblish_lite_profile_xyz/session.pstats
+
+"""
+import cProfile
+import os
+import pstats
+import re
+import tempfile
+import threading
+
+from .vendor import six
+
+from . import settings
+
+
+def is_enabled():
+    return bool(settings.Profile or os.environ.get("PYBLISH_LITE_PROFILE"))
+
+
+def _slug(name):
+    return re.sub(r"[^\w\-]+", "_", name).strip("_")
+
+
+class Profiler(object):
+    """Profiles of pairs, by (plugin id, instance or context id)"""
+
+    session_name = "session.pstats"
+
+    def __init__(self):
+        self.enabled = is_enabled()
+        self.directory = None
+        self.paths = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Begin a new session, in a new directory"""
+        with self._lock:
+            self.directory = None
+            self.paths = {}
+
+    def call(self, key, name, func, *args):
+        """Return `func` called with `args`, profiled as `name`"""
+        profile = cProfile.Profile()
+
+        try:
+            return profile.runcall(func, *args)
+
+        finally:
+            with self._lock:
+                if self.directory is None:
+                    self.directory = settings.ProfileDirectory or (
+                        tempfile.mkdtemp(prefix="pyblish_lite_profile_")
+                    )
+
+                    if not os.path.isdir(self.directory):
+                        os.makedirs(self.directory)
+
+                path = os.path.join(self.directory, "%03d_%s.pstats" % (
+                    len(self.paths), _slug(name)
+                ))
+                self.paths[key] = path
+
+            profile.dump_stats(path)
+
+    def stats(self, keys=None):
+        """Return merged statistics of `keys`, defaulting to all, or None"""
+        with self._lock:
+            paths = [
+                path for key, path in sorted(self.paths.items(),
+                                             key=lambda item: item[1])
+                if keys is None or key in keys
+            ]
+
+        if not paths:
+            return None
+
+        return pstats.Stats(*paths)
+
+    def save(self):
+        """Write merged profile of the session, returning its path"""
+        stats = self.stats()
+        if stats is None:
+            return None
+
+        path = os.path.join(self.directory, self.session_name)
+        stats.dump_stats(path)
+        return path
+
+    def top(self, plugin_id, limit=20):
+        """Return hottest functions of plug-in, as printed by pstats"""
+        keys = [key for key in self.paths if key[0] == plugin_id]
+        stats = self.stats(keys)
+        if stats is None:
+            return None
+
+        stream = six.StringIO()
+        stats.stream = stream
+        stats.sort_stats("tottime").print_stats(limit)
+        return stream.getvalue()
+
+    def has_profile(self, plugin_id):
+        return any(key[0] == plugin_id for key in list(self.paths))
@@ -0,0 +1,189 @@
+"""Log records of a session, within a budget of memory
+
+A chatty publish may produce hundreds of thousands of records. Records
+are kept in memory up to a budget of bytes, beyond which the oldest are
+moved to an append-only file on local disk, ordinary records before
+warnings and errors. Each record is known by the id it was added as,
+and read back from disk whenever asked for.
+
+Records are the dictionaries of :meth:`model.TerminalModel.prepare_records`.
+
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from collections import OrderedDict
+
+from . import settings
+from .vendor import six
+
+
+def is_severe(record):
+    """Return whether `record` is a warning or worse, or an error"""
+    return (
+        record.get("type") == "error"
+        or record.get("levelno", 0) >= logging.WARNING
+    )
+
+
+def size_of(record):
+    """Return approximate bytes of memory taken up by `record`"""
+    size = 256
+    for value in record.values():
+        if isinstance(value, six.string_types):
+            size += 50 + len(value)
+        else:
+            size += 24
+    return size
+
+
+class RecordStore(object):
+    """Records by id, the oldest of which are spilled to disk
+
+    Arguments:
+        budget (int, optional): Bytes of records to keep in memory,
+            defaults to settings.RecordMemory
+        directory (str, optional): Where to spill records to, defaults
+            to settings.RecordDirectory or the temporary directory
+
+    """
+
+    def __init__(self, budget=None, directory=None):
+        self.budget = settings.RecordMemory if budget is None else budget
+        self.directory = directory or settings.RecordDirectory
+
+        self._lock = threading.Lock()
+        self._file = None
+        self.path = None
+
+        self.reset()
+
+    def reset(self):
+        """Forget every record"""
+        with self._lock:
+            # Ordinary and severe records in memory, oldest first
+            self._ordinary = OrderedDict()
+            self._severe = OrderedDict()
+            self._sizes = {}
+            self._size = 0
+
+            # Offset and length of spilled records, by id
+            self._offsets = {}
+            self._count = 0
+
+            if self._file is not None:
+                self._file.seek(0)
+                self._file.truncate()
+
+    def close(self):
+        """Forget every record, and remove the file spilled to"""
+        self.reset()
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+                self.path = None
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def size(self):
+        """Bytes of records in memory"""
+        return self._size
+
+    @property
+    def spilled(self):
+        """Number of records on disk"""
+        return len(self._offsets)
+
+    def add(self, record):
+        """Store `record`, returning its id"""
+        with self._lock:
+            record_id = self._count
+            self._count += 1
+
+            if is_severe(record):
+                self._severe[record_id] = record
+            else:
+                self._ordinary[record_id] = record
+
+            size = size_of(record)
+            self._sizes[record_id] = size
+            self._size += size
+
+            while self._size > self.budget and (
+                self._ordinary or self._severe
+            ):
+                self._spill(self._ordinary or self._severe)
+
+            return record_id
+
+    def get(self, record_id):
+        """Return record of `record_id`, reading it from disk if need be"""
+        return self.page([record_id])[0]
+
+    def page(self, record_ids):
+        """Return records of `record_ids`, in order"""
+        with self._lock:
+            records = {}
+            spilled = []
+
+            for record_id in record_ids:
+                record = self._ordinary.get(record_id)
+                if record is None:
+                    record = self._severe.get(record_id)
+
+                if record is not None:
+                    records[record_id] = record
+                elif record_id in self._offsets:
+                    spilled.append(record_id)
+                else:
+                    raise KeyError(record_id)
+
+            # Read in order of offset, one seek after another
+            for record_id in sorted(spilled, key=self._offsets.get):
+                offset, length = self._offsets[record_id]
+                self._file.seek(offset)
+                records[record_id] = json.loads(
+                    self._file.read(length).decode("utf-8")
+                )
+
+            return [records[record_id] for record_id in record_ids]
+
+    def _open(self):
+        directory = self.directory or tempfile.gettempdir()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        fd, self.path = tempfile.mkstemp(
+            prefix="pyblish_lite_records_", suffix=".jsonl", dir=directory
+        )
+
+        self._file = os.fdopen(fd, "w+b")
+
+    def _spill(self, records):
+        """Move oldest of `records` to disk"""
+        record_id, record = records.popitem(last=False)
+
+        if self._file is None:
+            self._open()
+
+        line = json.dumps(record, default=str).encode("utf-8")
+
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(line + b"\n")
+
+        self._offsets[record_id] = (offset, len(line))
+        self._size -= self._sizes.pop(record_id)
@@ -17,3 +17,107 @@ TerminalFilters = {
     "log_critical": True,
     "traceback": True,
 }
+
+# Customize where plug-ins are processed. When enabled, plug-ins run on a
+# background worker thread such that the GUI stays responsive. Leave this
+# disabled for hosts whose API may only be called from the main thread.
+ProcessInThread = False
+
+# Customize the number of threads used by plug-ins declaring `parallel = True`.
+# Instances of such plug-ins are processed concurrently, in any order.
+ParallelWorkers = 4
+
+# Customize the number of worker processes used by plug-ins declaring
+# `multiprocess = True`. Workers are started once and reused for the session.
+ProcessPoolWorkers = 2
+
+# Customize the Python interpreter of worker processes, which are started anew
+# rather than forked from the host. Hosts embedding Python should point this to
+# a standalone interpreter, e.g. "mayapy". On Python 2, workers are forked
+# outside of Windows, and this setting has no effect there.
+ProcessPoolExecutable = None
+
+# Customize the duration, in milliseconds, of processing done between
+# repaints of the GUI. Lower values make the GUI smoother, but publish slower.
+FrameBudget = 16.0
+
+# Customize whether plug-ins declaring `requires_data` and `provides_data` are
+# scheduled by the data they exchange rather than by order alone. Declared
+# plug-ins of a group with no dependency on one another are run concurrently.
+DependencyGraph = False
+
+# Customize where results of plug-ins declaring `cacheable = True` are stored,
+# defaulting to ~/.cache/pyblish_lite/results. Set to False to disable caching.
+CacheDirectory = None
+
+# Customize the total size, in bytes, of cached results. Least recently used
+# results are removed beyond this size.
+CacheSize = 64 * 1024 * 1024
+
+# Customize whether plug-ins are discovered through a cache, importing only
+# modules modified since last discovered. Useful for plug-in paths on slow
+# network shares. Modules are then no longer imported anew on each reset, and
+# are read and compiled on `DiscoveryThreads` threads.
+DiscoveryCache = False
+
+# Customize where the discovery cache is stored, defaulting to
+# ~/.cache/pyblish_lite/discovery.json
+DiscoveryCacheFile = None
+
+# Customize whether plug-ins described by a manifest are listed without
+# importing them, deferring each import until the plug-in is first processed.
+# Generate manifests with `python -m pyblish_lite --generate-manifest`
+LazyPlugins = False
+
+# Customize the number of threads reading and compiling plug-in modules. Only
+# used with `DiscoveryCache` or `LazyPlugins`, without which plug-ins are
+# discovered by pyblish itself, one module after another. Modules are still
+# executed one at a time, in order.
+DiscoveryThreads = 8
+
+# Customize the time budget, in seconds, of plug-ins without a `timeout` of
+# their own. Pairs over budget have their stack printed to the terminal, and
+# are abandoned when processed on a worker thread or process.
+PluginTimeout = None
+
+# Customize the time budget, in seconds, of each reset, validation or publish
+# as a whole. Processing is cancelled once out of time.
+ProcessingTimeout = None
+
+# Customize how often, in seconds, pairs are checked against their budget.
+WatchdogInterval = 0.5
+
+# Customize whether each plug-in is profiled with cProfile as it is processed,
+# storing a .pstats file per pair along with a merged profile of the session.
+# Also enabled by setting PYBLISH_LITE_PROFILE=1.
+Profile = False
+
+# Customize where profiles are stored, defaulting to a new temporary directory
+# for each reset.
+ProfileDirectory = None
+
+# Customize whether objects of a session still alive after its window closed
+# are reported, along with what refers to them. Also enabled by setting
+# PYBLISH_LITE_DEBUG_LEAKS=1.
+DebugLeaks = False
+
+# Customize how many bytes of log records to keep in memory. Beyond that, the
+# oldest records are moved to a file on local disk, warnings and errors last,
+# and read back whenever viewed.
+RecordMemory = 64 * 1024 ** 2
+
+# Customize where records beyond `RecordMemory` are stored, defaulting to the
+# temporary directory.
+RecordDirectory = None
+
+# Customize how many lines of each field of a record the terminal shows at
+# first. Longer fields, such as tracebacks, are filled in this many lines at a
+# time once their detail is clicked.
+TerminalDetailLines = 200
+
+# Customize how many rendered details of records the terminal keeps in memory.
+TerminalDetailCache = 256
+
+# Customize how many records the perspective reads back from the record store
+# at a time, as its list of records is scrolled.
+TerminalPageSize = 200
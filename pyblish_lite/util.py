@@ -3,16 +3,30 @@ from __future__ import (absolute_import, division, print_function,
 
 import os
 import sys
+import time
 import numbers
 import copy
+import logging
+import threading
+import contextlib
 import collections
 
 from .vendor.Qt import QtCore
 from .vendor.six import text_type
 import pyblish.api
 
+self = sys.modules[__name__]
+
 root = os.path.dirname(__file__)
 
+# Multiplier applied to every delay, read once from PYBLISH_DELAY
+self._delay_multiplier = None
+
+# Pairs processing with the root logger at DEBUG, and its level before
+self._debug_lock = threading.Lock()
+self._debug_count = 0
+self._debug_restore = None
+
 
 def get_asset(*path):
     """Return path to asset, relative the install directory
@@ -43,13 +57,167 @@ def defer(delay, func):
 
     """
 
-    delay *= float(os.getenv("PYBLISH_DELAY", 1))
+    delay *= delay_multiplier()
     if delay > 0:
-        return QtCore.QTimer.singleShot(delay, func)
+        return QtCore.QTimer.singleShot(int(delay), func)
+    else:
+        return func()
+
+
+def delay_multiplier():
+    """Return multiplier applied to every delay, see :func:`defer`
+
+    A multiplier of 0 means every operation is synchronous. The
+    environment variable is only read once, on first call.
+
+    """
+
+    if self._delay_multiplier is None:
+        self._delay_multiplier = float(os.getenv("PYBLISH_DELAY", 1))
+    return self._delay_multiplier
+
+
+def cpu_time():
+    """Return CPU time of the current thread, in seconds
+
+    Falls back to CPU time of the process where per-thread
+    time is unavailable, such as before Python 3.7.
+
+    """
+
+    if hasattr(time, "thread_time"):
+        return time.thread_time()
+    if hasattr(time, "process_time"):
+        return time.process_time()
+    return time.clock()
+
+
+@contextlib.contextmanager
+def debug_logging():
+    """Keep the root logger at DEBUG until every caller has left
+
+    Concurrent pairs each set and restore the level of the root
+    logger, and would otherwise restore it from under one another.
+
+    """
+
+    root_logger = logging.getLogger()
+
+    with self._debug_lock:
+        if not self._debug_count:
+            self._debug_restore = root_logger.level
+            root_logger.setLevel(logging.DEBUG)
+        self._debug_count += 1
+
+    try:
+        yield
+    finally:
+        with self._debug_lock:
+            self._debug_count -= 1
+            if not self._debug_count:
+                root_logger.setLevel(self._debug_restore)
+
+
+def schedule(func):
+    """Call `func` once control has returned to the event loop
+
+    Unlike :func:`defer`, no time is spent idle; pending events,
+    such as repaints, are processed and `func` is called right after.
+
+    Arguments:
+        func (callable): Any callable
+
+    """
+
+    if delay_multiplier() > 0:
+        return QtCore.QTimer.singleShot(0, func)
     else:
         return func()
 
 
+class FrameScheduler(object):
+    """Interleave work with the event loop, a frame budget at a time
+
+    Work started via :meth:`start` carries on until :meth:`expired`,
+    at which point it should :meth:`schedule` its continuation. The
+    time spent by the event loop in between is measured, and taken off
+    the budget of the next frame, such that the GUI keeps up with the
+    frame rate regardless of how busy it is.
+
+    Arguments:
+        budget (float): Duration of a frame, in milliseconds
+
+    """
+
+    # Least amount of work per frame, in milliseconds
+    minimum = 2.0
+
+    def __init__(self, budget=16.0):
+        self.budget = budget
+        self.latency = 0.0
+        self.started = None
+        self.yielded = None
+
+    def start(self):
+        """Start a frame"""
+        now = time.time()
+        if self.yielded is not None:
+            latency = (now - self.yielded) * 1000
+            self.latency += (latency - self.latency) * 0.5
+            self.yielded = None
+        self.started = now
+
+    def remaining(self):
+        """Return milliseconds left of the current frame"""
+        budget = max(self.minimum, self.budget - self.latency)
+        return budget - (time.time() - self.started) * 1000
+
+    def expired(self):
+        """Return whether work ought to return to the event loop"""
+        if not delay_multiplier():
+            return False
+        return self.remaining() <= 0
+
+    def schedule(self, func):
+        """Call `func` once the event loop has had its turn"""
+        if delay_multiplier() > 0:
+            self.yielded = time.time()
+        return schedule(func)
+
+
+class LRUCache(object):
+    """At most `size` items by key, least recently used dropped first"""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            return default
+
+        self._items[key] = value
+        return value
+
+    def put(self, key, value):
+        self._items.pop(key, None)
+        self._items[key] = value
+
+        while len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
 def u_print(msg, **kwargs):
     """`print` with encoded unicode.
 
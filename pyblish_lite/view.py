@@ -149,7 +149,21 @@ class TerminalView(QtWidgets.QTreeView):
         self.verticalScrollBar().setSingleStep(10)
         self.setRootIsDecorated(False)
 
+        # Scroll to bottom once for all rows inserted in one go, unless
+        # rows are rather fetched as they are scrolled down to
+        self.follow = True
+        self.scroll_timer = QtCore.QTimer(self)
+        self.scroll_timer.setSingleShot(True)
+        self.scroll_timer.setInterval(0)
+        self.scroll_timer.timeout.connect(self.scrollToBottom)
+
+        # Index of the detail shown in an editor, if any
+        self.editor_index = None
+
+        self.setMouseTracking(True)
+
         self.clicked.connect(self.item_expand)
+        self.entered.connect(self.prefetch_detail)
 
     def event(self, event):
         if not event.type() == QtCore.QEvent.KeyPress:
@@ -176,23 +190,51 @@ class TerminalView(QtWidgets.QTreeView):
         self.selectionModel().clear()
 
     def item_expand(self, index):
-        if index.data(Roles.TypeRole) == model.TerminalLabelType:
+        item_type = index.data(Roles.TypeRole)
+        if item_type == model.TerminalLabelType:
             if self.isExpanded(index):
                 self.collapse(index)
             else:
                 self.expand(index)
-                self.model().layoutChanged.emit()
             self.updateGeometry()
 
+        elif item_type == model.TerminalDetailType:
+            self.edit_detail(index)
+
+    def prefetch_detail(self, index):
+        """Render detail of `index` as it is hovered, ahead of expanding"""
+        if index.data(Roles.TypeRole) == model.TerminalLabelType:
+            index.model().index(0, 0, index).data(QtCore.Qt.DisplayRole)
+
+    def edit_detail(self, index):
+        """Show detail of `index` in an editor, for selecting text
+
+        Only one detail at a time has an editor, the rest are painted.
+
+        """
+
+        if self.editor_index is not None and self.editor_index.isValid():
+            self.closePersistentEditor(
+                QtCore.QModelIndex(self.editor_index)
+            )
+
+        self.editor_index = QtCore.QPersistentModelIndex(index)
+        self.openPersistentEditor(index)
+
     def rowsInserted(self, parent, start, end):
         """Automatically scroll to bottom on each new item added."""
         super(TerminalView, self).rowsInserted(parent, start, end)
         self.updateGeometry()
-        self.scrollToBottom()
+
+        if self.follow:
+            self.scroll_timer.start()
 
     def resizeEvent(self, event):
         super(self.__class__, self).resizeEvent(event)
-        self.model().layoutChanged.emit()
+
+        # Details wrap to the width of the view
+        if event.size().width() != event.oldSize().width():
+            self.scheduleDelayedItemsLayout()
 
     def sizeHint(self):
         size = super(TerminalView, self).sizeHint()
@@ -200,12 +242,21 @@ class TerminalView(QtWidgets.QTreeView):
             self.contentsMargins().top()
             + self.contentsMargins().bottom()
         )
-        for idx_i in range(self.model().rowCount()):
-            index = self.model().index(idx_i, 0)
+
+        # No taller than the screen, however many rows there are
+        desktop = QtWidgets.QApplication.desktop()
+        limit = desktop.availableGeometry(self).height()
+
+        item_model = self.model()
+        for idx_i in range(item_model.rowCount()):
+            if height > limit:
+                break
+
+            index = item_model.index(idx_i, 0)
             height += self.rowHeight(index)
             if self.isExpanded(index):
-                for idx_j in range(index.model().rowCount(index)):
-                    child_index = index.child(idx_j, 0)
+                for idx_j in range(item_model.rowCount(index)):
+                    child_index = item_model.index(idx_j, 0, index)
                     height += self.rowHeight(child_index)
 
         size.setHeight(height)
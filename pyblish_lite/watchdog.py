@@ -0,0 +1,243 @@
+"""Time budgets of plug-ins, and cooperative cancellation
+
+Each pair is given the time budget of its plug-in, `timeout` in seconds,
+or settings.PluginTimeout for plug-ins without one. A watchdog thread
+notices pairs running past their budget and captures the Python stack of
+the thread processing them, revealing where a plug-in is stuck.
+
+Plug-ins may poll the cancellation token of the context, which is
+cancelled when processing is stopped or has run out of time.
+
+Usage:
+    >>> import pyblish.api
+    >>> class ExtractMovie(pyblish.api.InstancePlugin):
+    ...     order = pyblish.api.ExtractorOrder
+    ...     timeout = 600
+    ...
+    ...     def process(self, instance):
+    ...         token = instance.context.data["cancelToken"]
+    ...         for frame in range(1000):
+    ...             token.check()
+
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+
+import pyblish.lib
+
+from . import settings
+
+log = logging.getLogger("pyblish_lite.watchdog")
+
+
+class Cancelled(Exception):
+    """Processing was cancelled"""
+
+
+class PairTimeout(Exception):
+    """Pair ran past its time budget, and was abandoned"""
+
+
+class CancelToken(object):
+    """Polled by plug-ins to find out whether to stop early"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def check(self):
+        """Raise `Cancelled` if cancelled"""
+        if self._event.is_set():
+            raise Cancelled("Processing was cancelled")
+
+
+class Watch(object):
+    """A pair in progress on a thread"""
+
+    def __init__(self, plugin, instance, budget):
+        self.plugin = plugin
+        self.instance = instance
+        self.budget = budget
+        self.ident = threading.current_thread().ident
+        self.started = time.time()
+        self.finished = False
+        self.abandoned = False
+
+        # Stack of thread, once over budget
+        self.stack = None
+        self.frame = None
+
+    @property
+    def elapsed(self):
+        return time.time() - self.started
+
+
+def budget(plugin):
+    """Return time budget of `plugin` in seconds, or None"""
+    return getattr(plugin, "timeout", None) or settings.PluginTimeout
+
+
+def timeout_result(watch, context):
+    """Return failed result of pair of `watch`, abandoned"""
+    error = PairTimeout("%s exceeded its time budget of %ss" % (
+        watch.plugin.__name__, watch.budget
+    ))
+
+    fname, line_no, func = watch.plugin.__module__, 0, "process"
+    if watch.frame is not None:
+        fname, line_no, func = watch.frame[:3]
+
+    error.traceback = (fname, line_no, func, str(error))
+    error.formatted_traceback = watch.stack or str(error)
+
+    result = {
+        "success": False,
+        "plugin": watch.plugin,
+        "instance": watch.instance,
+        "action": None,
+        "error": error,
+        "records": [],
+        "duration": watch.elapsed * 1000,
+        "progress": 0,
+        "context": context,
+        "timing": {"wall": watch.elapsed, "cpu": 0.0},
+    }
+
+    context.data.setdefault("results", list()).append(result)
+    pyblish.lib.emit("pluginProcessed", result=result)
+
+    return result
+
+
+class Watchdog(object):
+    """Notice pairs over budget, and processing out of time
+
+    Arguments:
+        on_overdue (callable): Called with each `Watch` over budget,
+            from the thread of the watchdog
+        on_expired (callable): Called once `deadline` has passed,
+            from the thread of the watchdog
+
+    """
+
+    def __init__(self, on_overdue, on_expired):
+        self.on_overdue = on_overdue
+        self.on_expired = on_expired
+        self.interval = settings.WatchdogInterval
+
+        # Time at which processing is out of time, if any
+        self.deadline = None
+
+        self._watches = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self, seconds=None):
+        """Begin a run of processing, `seconds` long at most"""
+        self.deadline = None
+        if seconds:
+            self.deadline = time.time() + seconds
+            self._ensure_running()
+
+    def watch(self, plugin, instance):
+        """Watch pair in progress on the current thread"""
+        watch = Watch(plugin, instance, budget(plugin))
+
+        if watch.budget:
+            with self._lock:
+                self._watches.append(watch)
+            self._ensure_running()
+
+        return watch
+
+    def unwatch(self, watch):
+        with self._lock:
+            watch.finished = True
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def abandon(self, watch):
+        """Abandon pair of `watch`, returning False if already finished"""
+        with self._lock:
+            if watch.finished or watch.abandoned:
+                return False
+
+            watch.abandoned = True
+            self._watches.remove(watch)
+            return True
+
+    def overdue(self):
+        """Return watches over budget, still in progress"""
+        with self._lock:
+            return [
+                watch for watch in self._watches
+                if watch.stack is not None
+            ]
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check(self):
+        """Report pairs over budget, and an expired deadline"""
+        now = time.time()
+
+        with self._lock:
+            overdue = [
+                watch for watch in self._watches
+                if watch.stack is None
+                and now - watch.started > watch.budget
+            ]
+
+            frames = sys._current_frames()
+            for watch in overdue:
+                watch.stack = ""
+
+                frame = frames.get(watch.ident)
+                if frame is not None:
+                    stack = traceback.extract_stack(frame)
+                    watch.frame = tuple(stack[-1])
+                    watch.stack = "".join(traceback.format_list(stack))
+
+            del frames
+
+        for watch in overdue:
+            log.warning(
+                "%s has been running for %.1fs, over its budget of %ss\n%s",
+                watch.plugin.__name__, watch.elapsed, watch.budget,
+                watch.stack
+            )
+
+            self.on_overdue(watch)
+
+        if self.deadline is not None and now > self.deadline:
+            self.deadline = None
+            self.on_expired()
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="pyblish_lite.watchdog"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
@@ -1,6 +1,6 @@
 import sys
 from .vendor.Qt import QtCore, QtWidgets, QtGui
-from . import model, delegate, view, awesome
+from . import model, delegate, view, awesome, settings
 from .constants import PluginStates, InstanceStates, Roles
 
 
@@ -118,12 +118,13 @@ class PerspectiveWidget(QtWidgets.QWidget):
 
         terminal_view = view.TerminalView()
         terminal_view.setObjectName("TerminalView")
-        terminal_model = model.TerminalModel()
+        terminal_view.follow = False
+        terminal_model = model.TerminalModel(parent.controller.record_store)
         terminal_proxy = model.TerminalProxy(terminal_view)
         terminal_proxy.setSourceModel(terminal_model)
 
         terminal_view.setModel(terminal_proxy)
-        terminal_delegate = delegate.TerminalItem()
+        terminal_delegate = delegate.TerminalItem(TerminalDetail)
         terminal_view.setItemDelegate(terminal_delegate)
         records.set_content(terminal_view)
 
@@ -209,9 +210,12 @@ class PerspectiveWidget(QtWidgets.QWidget):
                 return
 
             self.set_context(plugin_item.index())
-            return
+            return True
 
         if self.last_type == model.InstanceType:
+            if instance_item is None:
+                return
+
             if not self.last_id:
                 _item_id = instance_item.data(Roles.ObjectUIdRole)
                 if _item_id != self.last_item_id:
@@ -222,7 +226,13 @@ class PerspectiveWidget(QtWidgets.QWidget):
                 return
 
             self.set_context(instance_item.index())
-            return
+            return True
+
+    def update_contexts(self, items):
+        """Update with the latest of `items`, pairs of plug-in and instance"""
+        for plugin_item, instance_item in reversed(items):
+            if self.update_context(plugin_item, instance_item):
+                return True
 
     def set_context(self, index):
         if not index or not index.isValid():
@@ -310,22 +320,12 @@ class PerspectiveWidget(QtWidgets.QWidget):
         self.name_widget.setText(label)
         self.records.setVisible(True)
 
-        records = index.data(Roles.LogRecordsRole) or []
-        self.set_records(records)
-
-    def set_records(self, records):
-        len_records = 0
-        if records:
-            len_records += len(records)
+        self.set_records(index.data(Roles.LogRecordsRole) or [])
 
-        data = {"records": records}
-        self.terminal_model.reset()
-        self.terminal_model.update_with_result(data)
-        while not self.terminal_model.items_to_set_widget.empty():
-            item = self.terminal_model.items_to_set_widget.get()
-            widget = TerminalDetail(item.data(QtCore.Qt.DisplayRole))
-            index = self.terminal_proxy.mapFromSource(item.index())
-            self.terminal_view.setIndexWidget(index, widget)
+    def set_records(self, record_ids):
+        """Show records of `record_ids`, read back as they are scrolled to"""
+        len_records = len(record_ids)
+        self.terminal_model.set_record_ids(record_ids)
 
         self.records.button_toggle_text.setText(
             "{} ({})".format(self.l_rec, len_records)
@@ -485,7 +485,16 @@ class CommentBox(QtWidgets.QLineEdit):
 
 
 class TerminalDetail(QtWidgets.QTextEdit):
+    """Detail of a record, for selecting and copying its text
+
+    Lines left out of `text` are given as `remainder`, a list of the title
+    of each value cut short along with its lines left out. These are filled
+    in a chunk at a time, such that even huge tracebacks show at once.
+
+    """
+
     def __init__(self, text, *args, **kwargs):
+        remainder = kwargs.pop("remainder", None)
         super(self.__class__, self).__init__(*args, **kwargs)
 
         self.setReadOnly(True)
@@ -495,6 +504,53 @@ class TerminalDetail(QtWidgets.QTextEdit):
             QtGui.QTextOption.WrapAtWordBoundaryOrAnywhere
         )
 
+        self.remainder = list(remainder or [])
+        self.remainder_cursor = None
+
+        self.chunk_timer = QtCore.QTimer(self)
+        self.chunk_timer.setInterval(0)
+        self.chunk_timer.timeout.connect(self.fill_chunk)
+
+        if self.remainder:
+            self.chunk_timer.start()
+
+    def fill_chunk(self):
+        """Fill in the next chunk of lines left out"""
+        if not self.remainder:
+            self.chunk_timer.stop()
+            return
+
+        title, lines = self.remainder[0]
+        cursor = self.remainder_cursor
+
+        if cursor is None:
+            # Select the note standing in for lines
+            cursor = self.document().find(
+                model.detail_note(title, len(lines))
+            )
+            if cursor.isNull():
+                self.remainder.pop(0)
+                return
+
+        size = settings.TerminalDetailLines
+        chunk, lines = lines[:size], lines[size:]
+
+        cursor.insertHtml(model.escape_detail("\n".join(chunk)))
+
+        if lines:
+            # Stand in for the rest, until the next chunk, with each
+            # chunk a block of its own to lay out
+            cursor.insertBlock()
+            position = cursor.position()
+            cursor.insertText(model.detail_note(title, len(lines)))
+            cursor.setPosition(position, QtGui.QTextCursor.KeepAnchor)
+
+            self.remainder[0] = (title, lines)
+            self.remainder_cursor = cursor
+        else:
+            self.remainder.pop(0)
+            self.remainder_cursor = None
+
     def sizeHint(self):
         content_margins = (
             self.contentsMargins().top()
@@ -556,3 +612,31 @@ class TerminalFilterWidget(QtWidgets.QWidget):
         self.setLayout(layout)
 
         self.filter_buttons = filter_buttons
+
+
+class ProfileView(QtWidgets.QDialog):
+    """Hottest functions of a profiled plug-in"""
+
+    def __init__(self, title, text, parent=None):
+        super(ProfileView, self).__init__(parent)
+
+        self.setWindowTitle(title)
+        self.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+
+        body = QtWidgets.QPlainTextEdit()
+        body.setObjectName("ProfileView")
+        body.setReadOnly(True)
+        body.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+
+        # QFontDatabase.systemFont is new in Qt 5
+        font = QtGui.QFont("Monospace")
+        font.setStyleHint(QtGui.QFont.TypeWriter)
+        body.setFont(font)
+
+        body.setPlainText(text)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(body)
+
+        self.resize(800, 400)
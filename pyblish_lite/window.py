@@ -39,9 +39,10 @@ Todo:
     the first time to understand how to actually to it!
 
 """
+import logging
 from functools import partial
 
-from . import delegate, model, settings, util, view, widgets
+from . import delegate, leaks, model, settings, util, view, widgets
 from .awesome import tags as awesome
 
 from .vendor.Qt import QtCore, QtGui, QtWidgets
@@ -225,12 +226,12 @@ class Window(QtWidgets.QDialog):
         terminal_container = QtWidgets.QWidget()
 
         terminal_view = view.TerminalView()
-        terminal_model = model.TerminalModel()
+        terminal_model = model.TerminalModel(controller.record_store)
         terminal_proxy = model.TerminalProxy(terminal_view)
         terminal_proxy.setSourceModel(terminal_model)
 
         terminal_view.setModel(terminal_proxy)
-        terminal_delegate = delegate.TerminalItem()
+        terminal_delegate = delegate.TerminalItem(widgets.TerminalDetail)
         terminal_view.setItemDelegate(terminal_delegate)
 
         layout = QtWidgets.QVBoxLayout(terminal_container)
@@ -501,6 +502,7 @@ class Window(QtWidgets.QDialog):
         controller.switch_toggleability.connect(self.change_toggleability)
 
         controller.was_reset.connect(self.on_was_reset)
+        controller.context_changed.connect(self.on_context_changed)
         # This is called synchronously on each process
         controller.was_processed.connect(self.on_was_processed)
         controller.passed_group.connect(self.on_passed_group)
@@ -509,12 +511,19 @@ class Window(QtWidgets.QDialog):
 
         controller.was_skipped.connect(self.on_was_skipped)
         controller.was_acted.connect(self.on_was_acted)
+        controller.was_revalidated.connect(self.on_was_revalidated)
+        controller.was_overdue.connect(self.on_was_overdue)
+        controller.was_expired.connect(self.on_was_expired)
 
         # NOTE: Listeners to this signal are run in the main thread
         controller.about_to_process.connect(
             self.on_about_to_process,
             QtCore.Qt.DirectConnection
         )
+        controller.about_to_block.connect(
+            self.on_about_to_block,
+            QtCore.Qt.DirectConnection
+        )
 
         artist_view.toggled.connect(self.on_item_toggled)
         overview_instance_view.toggled.connect(self.on_item_toggled)
@@ -589,6 +598,17 @@ class Window(QtWidgets.QDialog):
             "current_page": current_page
         }
 
+        # Results and changes since the last frame, applied in one go
+        self.pending_results = []
+        self.pending_items = []
+        self.pending_records = []
+        self.pending_record_ids = []
+
+        self.pending_timer = QtCore.QTimer(self)
+        self.pending_timer.setSingleShot(True)
+        self.pending_timer.setInterval(0)
+        self.pending_timer.timeout.connect(self.apply_pending)
+
         self.tabs[current_page].setChecked(True)
 
     # -------------------------------------------------------------------------
@@ -617,6 +637,8 @@ class Window(QtWidgets.QDialog):
 
             plugin_item.setData(value, QtCore.Qt.CheckStateRole)
 
+        self.controller.invalidate_plan()
+
     def toggle_perspective_widget(self, index=None):
         show = False
         if index:
@@ -630,13 +652,16 @@ class Window(QtWidgets.QDialog):
         self.terminal_filters_widget.setVisible(show)
 
     def change_toggleability(self, enable_value):
-        for plugin_item in self.plugin_model.plugin_items.values():
-            plugin_item.setData(enable_value, Roles.IsEnabledRole)
-
-        for instance_item in (
-            self.instance_model.instance_items.values()
+        for item_model, items in (
+            (self.plugin_model, self.plugin_model.plugin_items),
+            (self.instance_model, self.instance_model.instance_items),
         ):
-            instance_item.setData(enable_value, Roles.IsEnabledRole)
+            item_model.blockSignals(True)
+            for item in items.values():
+                item.setData(enable_value, Roles.IsEnabledRole)
+            item_model.blockSignals(False)
+
+            model.emit_changed(item_model, items.values())
 
     def on_item_toggled(self, index, state=None):
         """An item is requesting to be toggled"""
@@ -650,6 +675,7 @@ class Window(QtWidgets.QDialog):
             state = not index.data(QtCore.Qt.CheckStateRole)
 
         index.model().setData(index, state, QtCore.Qt.CheckStateRole)
+        self.controller.invalidate_plan()
         self.update_compatibility()
 
     def on_tab_changed(self, target):
@@ -668,6 +694,10 @@ class Window(QtWidgets.QDialog):
         self.comment_box.setEnabled(False)
         self.intent_box.setEnabled(False)
 
+        # Only re-run what actions have touched since validating
+        if self.controller.is_dirty() and self.controller.collect_state == 2:
+            return self.revalidate()
+
         self.validate()
 
     def on_play_clicked(self):
@@ -714,42 +744,71 @@ class Window(QtWidgets.QDialog):
         instance_item = (
             self.instance_model.instance_items[instance_id]
         )
-        instance_item.setData(
-            {InstanceStates.InProgress: True},
-            Roles.PublishFlagsRole
-        )
-
         plugin_item = self.plugin_model.plugin_items[plugin._id]
-        plugin_item.setData(
-            {PluginStates.InProgress: True},
-            Roles.PublishFlagsRole
-        )
+
+        # Shown along with results, once the frame is over
+        self.instance_model.blockSignals(True)
+        self.plugin_model.blockSignals(True)
+
+        try:
+            instance_item.setData(
+                {InstanceStates.InProgress: True},
+                Roles.PublishFlagsRole
+            )
+            plugin_item.setData(
+                {PluginStates.InProgress: True},
+                Roles.PublishFlagsRole
+            )
+
+        finally:
+            self.instance_model.blockSignals(False)
+            self.plugin_model.blockSignals(False)
+
+        self.pending_items.extend((instance_item, plugin_item))
+        self.pending_timer.start()
 
         self.info("{} {}".format(
             self.tr("Processing"), plugin_item.data(QtCore.Qt.DisplayRole)
         ))
 
+    def on_about_to_block(self):
+        """Show the pair about to be processed, ahead of a long wait
+
+        The event loop gets no turn until the pair has finished, and
+        so the pending batch is applied and painted right away.
+
+        """
+
+        if not self.pending_timer.isActive():
+            return
+
+        self.apply_pending()
+        self.repaint()
+
     def on_plugin_action_menu_requested(self, pos):
         """The user right-clicked on a plug-in
-         __________
-        |          |
-        | Action 1 |
-        | Action 2 |
-        | Action 3 |
-        |          |
-        |__________|
+         ___________________
+        |                   |
+        | Action 1          |
+        | Action 2          |
+        |-------------------|
+        | Profile plug-ins  |
+        | Show top functions|
+        |___________________|
 
         """
 
         index = self.overview_plugin_view.indexAt(pos)
-        actions = index.data(Roles.PluginValidActionsRole)
-
-        if not actions:
+        if not index.isValid():
             return
 
+        actions = index.data(Roles.PluginValidActionsRole) or []
+
         menu = QtWidgets.QMenu(self)
         plugin_id = index.data(Roles.ObjectIdRole)
-        plugin_item = self.plugin_model.plugin_items[plugin_id]
+        plugin_item = self.plugin_model.plugin_items.get(plugin_id)
+        if plugin_item is None:
+            return
         print("plugin is: %s" % plugin_item.plugin)
 
         for action in actions:
@@ -757,11 +816,44 @@ class Window(QtWidgets.QDialog):
             qaction.triggered.connect(partial(self.act, plugin_item, action))
             menu.addAction(qaction)
 
+        if actions:
+            menu.addSeparator()
+
+        profiler = self.controller.profiler
+
+        qaction = QtWidgets.QAction(self.tr("Profile plug-ins"), self)
+        qaction.setCheckable(True)
+        qaction.setChecked(profiler.enabled)
+        qaction.toggled.connect(self.on_profile_toggled)
+        menu.addAction(qaction)
+
+        if profiler.has_profile(plugin_id):
+            qaction = QtWidgets.QAction(self.tr("Show top functions"), self)
+            qaction.triggered.connect(
+                partial(self.show_top_functions, plugin_item)
+            )
+            menu.addAction(qaction)
+
         menu.popup(self.overview_plugin_view.viewport().mapToGlobal(pos))
 
+    def on_profile_toggled(self, state):
+        self.controller.profiler.enabled = state
+        self.info(self.tr("Profiling enabled") if state
+                  else self.tr("Profiling disabled"))
+
+    def show_top_functions(self, plugin_item):
+        plugin = plugin_item.plugin
+        text = self.controller.profiler.top(plugin.id)
+        if text is None:
+            return
+
+        title = "%s - %s" % (
+            self.tr("Top functions"), plugin.label or plugin.__name__
+        )
+        widgets.ProfileView(title, text, parent=self).show()
+
     def update_compatibility(self):
         self.plugin_model.update_compatibility()
-        self.plugin_proxy.invalidateFilter()
 
     def on_was_reset(self):
         # Append context object to instances model
@@ -809,6 +901,7 @@ class Window(QtWidgets.QDialog):
         self.footer_button_play.setFocus()
 
     def on_passed_group(self, order):
+        self.apply_pending()
 
         for group_item in self.instance_model.group_items.values():
             if self.overview_instance_view.isExpanded(group_item.index()):
@@ -840,6 +933,8 @@ class Window(QtWidgets.QDialog):
             )
 
     def on_was_stopped(self):
+        self.apply_pending()
+
         errored = self.controller.errored
         self.footer_button_play.setEnabled(not errored)
         self.footer_button_validate.setEnabled(
@@ -859,6 +954,8 @@ class Window(QtWidgets.QDialog):
         )
 
     def on_was_finished(self):
+        self.apply_pending()
+
         self.footer_button_play.setEnabled(False)
         self.footer_button_validate.setEnabled(False)
         self.footer_button_reset.setEnabled(True)
@@ -877,58 +974,127 @@ class Window(QtWidgets.QDialog):
         self.footer_widget.setProperty("success", success_val)
         self.footer_widget.style().polish(self.footer_widget)
 
-        for instance_item in (
-            self.instance_model.instance_items.values()
-        ):
-            instance_item.setData(
-                {InstanceStates.HasFinished: True},
-                Roles.PublishFlagsRole
-            )
+        items = list(self.instance_model.instance_items.values())
+        items.extend(self.instance_model.group_items.values())
 
-        for group_item in self.instance_model.group_items.values():
-            group_item.setData(
-                {GroupStates.HasFinished: True},
-                Roles.PublishFlagsRole
-            )
+        self.instance_model.blockSignals(True)
+
+        try:
+            for item in items:
+                item.setData(
+                    {InstanceStates.HasFinished: True},
+                    Roles.PublishFlagsRole
+                )
+
+        finally:
+            self.instance_model.blockSignals(False)
+
+        model.emit_changed(self.instance_model, items)
 
         self.update_compatibility()
 
     def on_was_processed(self, result):
-        existing_ids = set(self.instance_model.instance_items.keys())
-        existing_ids.remove(self.controller.context.id)
-        for instance in self.controller.context:
-            if instance.id not in existing_ids:
-                self.instance_model.append(instance)
-            else:
-                existing_ids.remove(instance.id)
+        records, record_ids = self.terminal_model.store_result(result)
+
+        # Applied once the frame is over, along with others
+        self.pending_timer.start()
+        self.pending_results.append(dict(result, record_ids=record_ids))
+        self.append_records(records, record_ids)
+
+    def apply_pending(self):
+        """Apply results and changes since the last frame, in one go
+
+        Pairs may finish faster than the screen refreshes, and so models
+        are updated once per frame rather than once per result.
 
-        for instance_id in existing_ids:
-            self.instance_model.remove(instance_id)
+        """
+
+        self.pending_timer.stop()
 
-        if result.get("error"):
-            # Toggle from artist to overview tab on error
-            if self.tabs["artist"].isChecked():
-                self.tabs["overview"].toggle()
+        results, self.pending_results = self.pending_results, []
+        items, self.pending_items = self.pending_items, []
+        records, self.pending_records = self.pending_records, []
+        record_ids, self.pending_record_ids = self.pending_record_ids, []
 
-        result["records"] = self.terminal_model.prepare_records(result)
+        if self.state["is_closing"]:
+            return
 
-        plugin_item = self.plugin_model.update_with_result(result)
-        instance_item = self.instance_model.update_with_result(result)
+        if results:
+            if any(result.get("error") for result in results):
+                # Toggle from artist to overview tab on error
+                if self.tabs["artist"].isChecked():
+                    self.tabs["overview"].toggle()
 
-        self.terminal_model.update_with_result(result)
-        while not self.terminal_model.items_to_set_widget.empty():
-            item = self.terminal_model.items_to_set_widget.get()
-            widget = widgets.TerminalDetail(item.data(QtCore.Qt.DisplayRole))
-            index = self.terminal_proxy.mapFromSource(item.index())
-            self.terminal_view.setIndexWidget(index, widget)
+            plugin_items = self.plugin_model.update_with_results(results)
+            instance_items = self.instance_model.update_with_results(results)
+
+        model.emit_changed(self.instance_model, items)
+        model.emit_changed(self.plugin_model, items)
+
+        self.terminal_model.extend(records, record_ids)
+
+        if not results:
+            return
 
         self.update_compatibility()
 
         if self.perspective_widget.isVisible():
-            self.perspective_widget.update_context(
-                plugin_item, instance_item
+            self.perspective_widget.update_contexts(
+                list(zip(plugin_items, instance_items))
             )
 
+    def on_context_changed(self, changes):
+        """Apply instances added, removed and changed since last told
+
+        Items are added and removed right away, ahead of the pair about to
+        be processed or its result, whereas changed items are shown along
+        with results, once the frame is over.
+
+        """
+
+        instance_items = self.instance_model.instance_items
+
+        removed = set(
+            id(instance_items[instance_id])
+            for instance_id in changes["removed"]
+            if instance_id in instance_items
+        )
+
+        if removed:
+            # Deleted along with their rows
+            self.pending_items = [
+                item for item in self.pending_items
+                if id(item) not in removed
+            ]
+
+        for instance_id in changes["removed"]:
+            if instance_id in instance_items:
+                self.instance_model.remove(instance_id)
+
+        for instance in changes["added"]:
+            if instance.id not in instance_items:
+                self.instance_model.append(instance)
+
+        items = [
+            instance_items[instance_id]
+            for instance_id in changes["changed"]
+            if instance_id in instance_items
+        ]
+
+        if items:
+            self.pending_items.extend(items)
+            self.pending_timer.start()
+
+    def append_records(self, records, record_ids=None):
+        """Append `records` to the terminal, after any still pending"""
+        record_ids = record_ids or [None] * len(records)
+
+        if not self.pending_timer.isActive():
+            return self.terminal_model.extend(records, record_ids)
+
+        self.pending_records.extend(records)
+        self.pending_record_ids.extend(record_ids)
+
     # -------------------------------------------------------------------------
     #
     # Functions
@@ -937,6 +1103,7 @@ class Window(QtWidgets.QDialog):
 
     def reset(self):
         """Prepare GUI for reset"""
+        self.apply_pending()
         self.info(self.tr("About to reset.."))
 
         self.presets_button.setEnabled(False)
@@ -952,6 +1119,9 @@ class Window(QtWidgets.QDialog):
         self.intent_model.reset()
         self.terminal_model.reset()
 
+        # Its records are forgotten by the store along with the controller
+        self.perspective_widget.reset()
+
         self.footer_button_stop.setEnabled(False)
         self.footer_button_reset.setEnabled(False)
         self.footer_button_validate.setEnabled(False)
@@ -964,7 +1134,7 @@ class Window(QtWidgets.QDialog):
         self.comment_box.placeholder.setVisible(False)
         self.comment_box.placeholder.setVisible(True)
         # Launch controller reset
-        util.defer(500, self.controller.reset)
+        util.schedule(self.controller.reset)
 
     def validate(self):
         self.info(self.tr("Preparing validate.."))
@@ -973,7 +1143,16 @@ class Window(QtWidgets.QDialog):
         self.footer_button_validate.setEnabled(False)
         self.footer_button_play.setEnabled(False)
 
-        util.defer(5, self.controller.validate)
+        util.schedule(self.controller.validate)
+
+    def revalidate(self):
+        self.info(self.tr("Preparing re-validate.."))
+        self.footer_button_stop.setEnabled(True)
+        self.footer_button_reset.setEnabled(False)
+        self.footer_button_validate.setEnabled(False)
+        self.footer_button_play.setEnabled(False)
+
+        util.schedule(self.controller.revalidate)
 
     def publish(self):
         self.info(self.tr("Preparing publish.."))
@@ -983,7 +1162,7 @@ class Window(QtWidgets.QDialog):
         self.footer_button_validate.setEnabled(False)
         self.footer_button_play.setEnabled(False)
 
-        util.defer(5, self.controller.publish)
+        util.schedule(self.controller.publish)
 
     def act(self, plugin_item, action):
         self.info("%s %s.." % (self.tr("Preparing"), action))
@@ -1000,13 +1179,15 @@ class Window(QtWidgets.QDialog):
         )
 
         # Give Qt time to draw
-        util.defer(100, lambda: self.controller.act(
+        util.schedule(lambda: self.controller.act(
             plugin_item.plugin, action
         ))
 
         self.info(self.tr("Action prepared."))
 
     def on_was_acted(self, result):
+        self.apply_pending()
+
         self.footer_button_reset.setEnabled(True)
         self.footer_button_stop.setEnabled(False)
 
@@ -1014,11 +1195,10 @@ class Window(QtWidgets.QDialog):
         plugin_item = self.plugin_model.plugin_items[result["plugin"].id]
         action_state = plugin_item.data(Roles.PluginActionProgressRole)
         action_state |= PluginActionStates.HasFinished
-        result["records"] = self.terminal_model.prepare_records(result)
+        records, record_ids = self.terminal_model.store_result(result)
 
         error = result.get("error")
         if error:
-            records = result.get("records") or []
             action_state |= PluginActionStates.HasFailed
             fname, line_no, func, exc = error.traceback
 
@@ -1031,13 +1211,66 @@ class Window(QtWidgets.QDialog):
                 "traceback": error.formatted_traceback
             })
 
-            result["records"] = records
+            record_ids.append(self.controller.record_store.add(records[-1]))
+
+        result = dict(result, record_ids=record_ids)
 
         plugin_item.setData(action_state, Roles.PluginActionProgressRole)
 
         self.plugin_model.update_with_result(result)
         self.instance_model.update_with_result(result)
-        self.terminal_model.update_with_result(result)
+        self.terminal_model.extend(records, record_ids)
+
+        # Offer to re-validate what the action touched
+        if self.controller.is_dirty():
+            self.footer_button_validate.setEnabled(True)
+
+    def on_was_revalidated(self, pairs):
+        self.apply_pending()
+
+        context_id = self.controller.context.id
+        errors = self.controller.pair_errors
+
+        self.plugin_model.update_errors(
+            set(plugin.id for plugin, _ in pairs),
+            set(plugin_id for plugin_id, _ in errors)
+        )
+        self.instance_model.update_errors(
+            set((instance.id if instance else context_id)
+                for _, instance in pairs),
+            set(instance_id for _, instance_id in errors)
+        )
+
+        self.update_compatibility()
+        self.on_was_stopped()
+
+        if not self.controller.errored:
+            self.footer_widget.setProperty("success", -1)
+            self.footer_widget.style().polish(self.footer_widget)
+            self.info(self.tr("Re-validated successfully."))
+
+    def on_was_overdue(self, watch):
+        message = "%s is over its time budget of %ss" % (
+            watch.plugin.__name__, watch.budget
+        )
+
+        record_item = {
+            "label": message,
+            "type": "record",
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "name": "pyblish_lite.watchdog",
+            "msg": message,
+            "traceback": watch.stack,
+        }
+
+        if watch.instance is not None:
+            record_item["instance"] = watch.instance.data["name"]
+
+        self.append_records([record_item])
+
+    def on_was_expired(self):
+        self.info(self.tr("Out of time, stopping.."))
 
     def closeEvent(self, event):
         """Perform post-flight checks before closing
@@ -1054,19 +1287,32 @@ class Window(QtWidgets.QDialog):
 
         if self.state["is_closing"]:
 
+            if leaks.is_enabled():
+                leaks.track_session(self)
+                self.destroyed.connect(leaks.report_later)
+
             # Explicitly clear potentially referenced data
             self.info(self.tr("Cleaning up models.."))
-            self.intent_model.deleteLater()
-            self.plugin_model.deleteLater()
-            self.terminal_model.deleteLater()
-            self.terminal_proxy.deleteLater()
-            self.plugin_proxy.deleteLater()
-
             self.artist_view.setModel(None)
             self.overview_instance_view.setModel(None)
             self.overview_plugin_view.setModel(None)
             self.terminal_view.setModel(None)
 
+            # Items refer to instances, plug-ins and records
+            self.instance_model.reset()
+            self.plugin_model.reset()
+            self.terminal_model.reset()
+            self.intent_model.clear()
+
+            for obj in (self.intent_model,
+                        self.instance_model,
+                        self.artist_proxy,
+                        self.plugin_model,
+                        self.plugin_proxy,
+                        self.terminal_model,
+                        self.terminal_proxy):
+                obj.deleteLater()
+
             self.info(self.tr("Cleaning up controller.."))
             self.controller.cleanup()
 
@@ -1077,6 +1323,9 @@ class Window(QtWidgets.QDialog):
         self.info(self.tr("Closing.."))
 
         def on_problem():
+            if self.state["is_closing"]:
+                return
+
             self.heads_up(
                 "Warning", "Had trouble closing down. "
                 "Please tell someone and try again."
@@ -1086,8 +1335,14 @@ class Window(QtWidgets.QDialog):
         if self.controller.is_running:
             self.info(self.tr("..as soon as processing is finished.."))
             self.controller.stop()
-            self.finished.connect(self.close)
-            util.defer(2000, on_problem)
+            self.controller.was_stopped.connect(self.close)
+            self.controller.was_finished.connect(self.close)
+
+            # Owned by the window, such that it goes along with it
+            timer = QtCore.QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(on_problem)
+            timer.start(int(2000 * util.delay_multiplier()))
             return event.ignore()
 
         self.state["is_closing"] = True
@@ -1120,10 +1375,10 @@ class Window(QtWidgets.QDialog):
         info.setText(message)
 
         # Include message in terminal
-        self.terminal_model.append({
+        self.append_records([{
             "label": message,
             "type": "info"
-        })
+        }])
 
         self.animation_info_msg.stop()
         self.animation_info_msg.start()
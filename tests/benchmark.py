@@ -0,0 +1,252 @@
+"""Throughput of the controller, on synthetic sessions
+
+Builds `instances` instances across `families` families, and `plugins`
+plug-ins spread over the order groups, each logging `records` records per
+pair and failing at `error_rate`. A session is then reset, validated and
+published without delay, as with PYBLISH_DELAY=0.
+
+Results are written as JSON, for comparison over time.
+
+Usage:
+    $ python -m tests.benchmark --instances 200 --plugins 40 -o out.json
+
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+import pyblish.api
+import pyblish_lite
+from pyblish_lite import control, util
+from pyblish_lite.vendor.Qt import QtCore
+
+# Sets PYBLISH_DELAY=0 and creates the application
+from . import app  # noqa
+
+
+def make_session(instances=100,
+                 families=5,
+                 plugins=20,
+                 records=1,
+                 error_rate=0.0,
+                 seed=0):
+    """Return synthetic plug-ins, the first of which collects instances"""
+    rand = random.Random(seed)
+    family_names = ["family%d" % index for index in range(families)]
+    instance_names = ["instance%04d" % index for index in range(instances)]
+
+    class CollectSynthetic(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder - 0.49
+
+        def process(self, context):
+            for index, name in enumerate(instance_names):
+                context.create_instance(
+                    name, family=family_names[index % families]
+                )
+
+    group_range = util.OrderGroups.group_range()
+    groups = [
+        order for order in util.OrderGroups.groups()
+        if order is not None
+    ]
+
+    session = [CollectSynthetic]
+    for index in range(plugins):
+        # Within group, after the collector above
+        upper = groups[index % len(groups)]
+        order = upper - group_range * (0.9 - 0.8 * rand.random())
+
+        failing = set(
+            name for name in instance_names if rand.random() < error_rate
+        )
+
+        def process(self, instance, failing=failing):
+            for record in range(records):
+                self.log.info("Record %d of %s", record, instance)
+
+            if instance.name in failing:
+                raise ValueError("Synthetic failure of %s" % instance)
+
+        session.append(type("Synthetic%03d" % index, (
+            pyblish.api.InstancePlugin,), {
+            "order": order,
+            "families": [family_names[index % families]],
+            "process": process,
+        }))
+
+    return session
+
+
+def _peak_rss():
+    """Return peak resident memory of this process in bytes, or None"""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes, except on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_phase(ctrl, phase, trace):
+    app = QtCore.QCoreApplication.instance()
+    processed = []
+    ctrl.was_processed.connect(processed.append)
+
+    if trace:
+        tracemalloc.start()
+
+    started = time.time()
+    phase()
+    while ctrl.is_running:
+        app.processEvents()
+    elapsed = time.time() - started
+
+    result = {
+        "seconds": elapsed,
+        "pairs": len(processed),
+        "pairsPerSecond": len(processed) / elapsed if elapsed else None,
+        "errors": sum(1 for r in processed if r["error"] is not None),
+    }
+
+    if trace:
+        result["peakTracedBytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    ctrl.was_processed.disconnect(processed.append)
+    return result
+
+
+def run_session(session, trace=False):
+    """Return timings of reset, validate and publish of `session`"""
+    pyblish.api.deregister_all_plugins()
+    for plugin in session:
+        pyblish.api.register_plugin(plugin)
+
+    gc.collect()
+
+    try:
+        ctrl = control.Controller()
+        phases = [
+            ("reset", _run_phase(ctrl, ctrl.reset, trace)),
+            ("validate", _run_phase(ctrl, ctrl.validate, trace)),
+            ("publish", _run_phase(ctrl, ctrl.publish, trace)),
+        ]
+
+        # Errors stop publishing, as they would in production
+        pairs = sum(phase["pairs"] for _, phase in phases)
+        seconds = sum(phase["seconds"] for _, phase in phases)
+        instances = len(ctrl.context)
+
+        ctrl.cleanup()
+
+    finally:
+        pyblish.api.deregister_all_plugins()
+
+    return {
+        "phases": dict(phases),
+        "pairs": pairs,
+        "seconds": seconds,
+        "pairsPerSecond": pairs / seconds if seconds else None,
+        "instances": instances,
+    }
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def run(repeat=3, trace=False, **options):
+    """Run benchmark `repeat` times, returning JSON-compatible results"""
+    session = make_session(**options)
+    runs = [run_session(session, trace) for _ in range(repeat)]
+
+    return {
+        "version": pyblish_lite.__version__,
+        "pyblish": pyblish.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "options": dict(options, repeat=repeat),
+        "runs": runs,
+        "median": {
+            "pairsPerSecond": _median(
+                [r["pairsPerSecond"] or 0 for r in runs]
+            ),
+            "phases": dict(
+                (name, _median([r["phases"][name]["seconds"] for r in runs]))
+                for name in ("reset", "validate", "publish")
+            ),
+        },
+        "peakRssBytes": _peak_rss(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmark",
+        description=__doc__.split("\n")[0]
+    )
+    parser.add_argument("--instances", type=int, default=100)
+    parser.add_argument("--families", type=int, default=5)
+    parser.add_argument("--plugins", type=int, default=20)
+    parser.add_argument("--records", type=int, default=1,
+                        help="Log records per pair")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of pairs to fail, from 0 to 1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Measure peak allocations of each phase, "
+                             "at the expense of throughput")
+    parser.add_argument("-o", "--output",
+                        help="Write results to this file, "
+                             "rather than standard output")
+
+    kwargs = parser.parse_args(argv)
+
+    if kwargs.tracemalloc and tracemalloc is None:
+        parser.error("tracemalloc requires Python 3.4+")
+
+    results = run(
+        repeat=kwargs.repeat,
+        trace=kwargs.tracemalloc,
+        instances=kwargs.instances,
+        families=kwargs.families,
+        plugins=kwargs.plugins,
+        records=kwargs.records,
+        error_rate=kwargs.error_rate,
+        seed=kwargs.seed,
+    )
+
+    text = json.dumps(results, indent=4, sort_keys=True)
+
+    if kwargs.output:
+        with open(kwargs.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
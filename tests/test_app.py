@@ -0,0 +1,64 @@
+import pyblish.api
+from pyblish_lite import app, window
+from pyblish_lite.vendor.Qt import QtCore
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+
+class Window(QtCore.QObject):
+    """Stand-in for window.Window, as tests run without QApplication"""
+
+    def __init__(self, controller, parent=None):
+        super(Window, self).__init__(parent)
+        self.controller = controller
+        self.state = {"is_closing": False}
+
+    def setFont(self, font):
+        pass
+
+    def setStyleSheet(self, css):
+        pass
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+    app._window = None
+
+
+@with_setup(clean)
+def test_reopen_window():
+    """A window reopened before the first is destroyed is kept"""
+    clean()
+
+    original = window.Window
+    window.Window = Window
+
+    try:
+        first = app.create_window()
+        assert app.create_window() is first
+
+        # Closed, yet to be destroyed
+        first.state["is_closing"] = True
+        second = app.create_window()
+        assert second is not first
+
+        first.deleteLater()
+        QtCore.QCoreApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete
+        )
+
+        assert app.create_window() is second
+
+        second.deleteLater()
+        QtCore.QCoreApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete
+        )
+
+        assert app._window is None
+
+    finally:
+        window.Window = original
+        clean()
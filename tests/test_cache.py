@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+
+import pyblish.api
+from pyblish_lite import cache, control
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+@with_setup(clean)
+def test_replay():
+    """Results of cacheable plug-ins are replayed with the same inputs"""
+    clean()
+
+    count = {"#": 0}
+    state = {"resolution": 1080}
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance(
+                "A", families=["myFamily"], resolution=state["resolution"]
+            )
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["myFamily"]
+        cacheable = True
+        requires_data = ["resolution"]
+
+        def process(self, instance):
+            count["#"] += 1
+            self.log.info("Validated")
+
+    pyblish.api.register_plugin(MyCollector)
+    pyblish.api.register_plugin(MyValidator)
+
+    directory = tempfile.mkdtemp()
+
+    def validate():
+        results = []
+        ctrl = control.Controller()
+        ctrl.result_cache = cache.ResultCache(directory, 1024 * 1024)
+        ctrl.was_processed.connect(results.append)
+        ctrl.reset()
+        ctrl.validate()
+
+        return [
+            result for result in results
+            if result["plugin"].__name__ == "MyValidator"
+        ][0]
+
+    try:
+        result = validate()
+        assert count["#"] == 1
+        assert not result.get("cached")
+
+        result = validate()
+        assert count["#"] == 1
+        assert result["cached"]
+        assert [r.msg for r in result["records"]] == ["Validated"]
+
+        # Changed inputs are processed again
+        state["resolution"] = 720
+        result = validate()
+        assert count["#"] == 2
+        assert not result.get("cached")
+
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_eviction():
+    """Least recently used results are evicted beyond the size"""
+    directory = tempfile.mkdtemp()
+    result = {"success": True, "records": []}
+
+    try:
+        results = cache.ResultCache(directory, 1024 * 1024)
+        results.store("a", result)
+        size = os.path.getsize(results.path("a"))
+
+        results.size = size * 2
+        results.store("b", result)
+        os.utime(results.path("a"), (0, 0))
+        results.store("c", result)
+
+        assert sorted(os.listdir(directory)) == ["b.result", "c.result"]
+
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_eviction_scans_once():
+    """Stored results are only listed on disk once"""
+    directory = tempfile.mkdtemp()
+    result = {"success": True, "records": []}
+
+    try:
+        results = cache.ResultCache(directory, 1024 * 1024)
+        results.store("a", result)
+        size = os.path.getsize(results.path("a"))
+
+        scans = []
+        scan = results._scan
+
+        def counted():
+            scans.append(True)
+            scan()
+
+        results._scan = counted
+        results.size = size * 3
+
+        for name in "bcdefgh":
+            results.store(name, result)
+
+        # Replayed results are used most recently
+        results.replay(
+            "f", pyblish.api.InstancePlugin, pyblish.api.Context(), None
+        )
+        results.store("i", result)
+
+        assert not scans, scans
+        assert sorted(os.listdir(directory)) == [
+            "f.result", "h.result", "i.result"
+        ]
+
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_cache_data():
+    """Inputs of cached results are declared apart from dependencies"""
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        cacheable = True
+        cache_data = ["resolution"]
+
+    # Not scheduled by the dependency graph
+    assert not control.is_declared(MyValidator)
+
+    context = pyblish.api.Context()
+    instance = context.create_instance("A", resolution=1080)
+    before = cache.key(MyValidator, context, instance)
+
+    instance.data["resolution"] = 720
+    assert cache.key(MyValidator, context, instance) != before
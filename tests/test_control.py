@@ -1,6 +1,16 @@
+import os
+import logging
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
 import pyblish.api
 import pyblish.lib
-from pyblish_lite import control
+from pyblish_lite import control, pool, settings, watchdog
+from pyblish_lite.vendor.Qt import QtCore
 
 # Vendor libraries
 from nose.tools import (
@@ -13,6 +23,13 @@ def clean():
     pyblish.api.deregister_all_plugins()
 
 
+def wait(ctrl):
+    """Process events until `ctrl` is done processing"""
+    app = QtCore.QCoreApplication.instance()
+    while ctrl.is_running:
+        app.processEvents()
+
+
 @with_setup(clean)
 def test_something():
     """Anything runs"""
@@ -309,6 +326,320 @@ def test_far_negative_orders():
     assert count["#"] == 3, count
 
 
+@with_setup(clean)
+def test_process_in_thread():
+    """Plug-ins may be processed on a worker thread"""
+
+    threads = []
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("MyInstance")
+            threads.append(threading.current_thread())
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            threads.append(threading.current_thread())
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.use_worker_thread = True
+
+    try:
+        ctrl.reset()
+        wait(ctrl)
+
+        assert len(threads) == 1, threads
+
+        ctrl.publish()
+        wait(ctrl)
+
+    finally:
+        ctrl.cleanup()
+
+    assert len(threads) == 2, threads
+    assert threading.current_thread() not in threads, threads
+
+
+@with_setup(clean)
+def test_about_to_block():
+    """Pairs expected to outlast the frame are announced on the GUI thread"""
+    clean()
+
+    class MyFastCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("MyInstance")
+
+    class MySlowValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            time.sleep(0.05)
+
+    for plugin in [MyFastCollector, MySlowValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    current = []
+    blocked = []
+
+    ctrl = control.Controller()
+    ctrl.about_to_process.connect(
+        lambda plugin, instance: current.append(plugin.__name__)
+    )
+    ctrl.about_to_block.connect(lambda: blocked.append(current[-1]))
+
+    def mine():
+        # Leaving out plug-ins of pyblish itself
+        return [
+            name for name in blocked
+            if name in ("MyFastCollector", "MySlowValidator")
+        ]
+
+    ctrl.reset()
+    ctrl.publish()
+
+    # Neither had been processed before
+    assert_equals(mine(), ["MyFastCollector", "MySlowValidator"])
+
+    del blocked[:]
+    ctrl.reset()
+    ctrl.publish()
+
+    # Only the validator takes longer than a frame
+    assert_equals(mine(), ["MySlowValidator"])
+
+    clean()
+
+
+@with_setup(clean)
+def test_parallel_instances():
+    """Instances of parallel plug-ins are processed concurrently"""
+
+    processed = []
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C", "D"):
+                context.create_instance(name)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        parallel = True
+
+        def process(self, instance):
+            self.log.info(instance.name)
+            processed.append(threading.current_thread())
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    results = []
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+    ctrl.reset()
+    ctrl.publish()
+
+    assert len(processed) == 4, processed
+    assert threading.current_thread() not in processed, processed
+
+    # Records of other concurrent pairs are left out
+    for result in results:
+        if result["plugin"] is not MyValidator:
+            continue
+
+        messages = [record.msg for record in result["records"]]
+        assert messages == [result["instance"].name], messages
+
+
+@with_setup(clean)
+def test_parallel_root_level():
+    """Parallel pairs leave the level of the root logger as it was"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for index in range(8):
+                context.create_instance("I%d" % index)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        parallel = True
+
+        def process(self, instance):
+            # Finish out of order
+            time.sleep(0.01 * (int(instance.name[1:]) % 3))
+            self.log.debug(instance.name)
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    results = []
+
+    root_logger = logging.getLogger()
+    level = root_logger.level
+    root_logger.setLevel(logging.WARNING)
+
+    try:
+        ctrl = control.Controller()
+        ctrl.was_processed.connect(results.append)
+        ctrl.reset()
+        ctrl.publish()
+
+        assert root_logger.level == logging.WARNING, root_logger.level
+
+    finally:
+        root_logger.setLevel(level)
+
+    # Debug records of every pair are kept
+    for result in results:
+        if result["plugin"] is MyValidator:
+            messages = [record.msg for record in result["records"]]
+            assert messages == [result["instance"].name], messages
+
+    clean()
+
+
+@with_setup(clean)
+def test_parallel_without_delay():
+    """Many parallel plug-ins are processed without an event loop"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A")
+            context.create_instance("B")
+
+    def process(self, instance):
+        pass
+
+    for index in range(400):
+        pyblish.api.register_plugin(type(
+            "MyValidator%d" % index,
+            (pyblish.api.InstancePlugin,),
+            {
+                "order": pyblish.api.ValidatorOrder + index * 0.0001,
+                "parallel": True,
+                "process": process,
+            }
+        ))
+
+    pyblish.api.register_plugin(MyCollector)
+
+    results = []
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+    ctrl.reset()
+    ctrl.publish()
+
+    processed = [
+        result for result in results
+        if result["plugin"].__name__.startswith("MyValidator")
+    ]
+
+    assert len(processed) == 800, len(processed)
+    assert all(result["success"] for result in processed)
+
+    clean()
+
+
+@with_setup(clean)
+def test_process_pool():
+    """Multiprocess plug-ins are processed in a worker process"""
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("MyInstance", pid=os.getpid())
+
+    pyblish.api.register_plugin(MyCollector)
+
+    tempdir = tempfile.mkdtemp()
+    with open(os.path.join(tempdir, "extract_pid.py"), "w") as f:
+        f.write("""
+import os
+import pyblish.api
+
+
+class ExtractPid(pyblish.api.InstancePlugin):
+    order = pyblish.api.ExtractorOrder
+    multiprocess = True
+
+    def process(self, instance):
+        self.log.info("Extracting")
+        instance.data["extractedBy"] = os.getpid()
+""")
+
+    pyblish.api.register_plugin_path(tempdir)
+
+    results = []
+
+    try:
+        ctrl = control.Controller()
+        ctrl.was_processed.connect(results.append)
+        ctrl.reset()
+        ctrl.publish()
+
+    finally:
+        pyblish.api.deregister_plugin_path(tempdir)
+        shutil.rmtree(tempdir)
+        pool.shutdown()
+
+    result = results[-1]
+    instance = result["instance"]
+
+    assert result["success"], result
+    assert instance.data["pid"] == os.getpid()
+    assert instance.data["extractedBy"] != os.getpid()
+    assert [r.msg for r in result["records"]] == ["Extracting"]
+
+
+def test_process_pool_executable():
+    """Worker processes are started with the configured interpreter"""
+    if not hasattr(multiprocessing, "get_context"):
+        # Python 2 forks the current process instead
+        return
+
+    tempdir = tempfile.mkdtemp()
+    marker = os.path.join(tempdir, "started")
+    executable = os.path.join(tempdir, "python")
+
+    with open(executable, "w") as f:
+        f.write("#!/bin/sh\ntouch \"%s\"\nexec \"%s\" \"$@\"\n" % (
+            marker, sys.executable
+        ))
+    os.chmod(executable, 0o755)
+
+    original = settings.ProcessPoolExecutable
+    settings.ProcessPoolExecutable = executable
+
+    try:
+        assert pool.get_pool(1).apply(sum, ([1, 2],)) == 3
+        assert os.path.exists(marker)
+
+    finally:
+        pool.shutdown()
+        settings.ProcessPoolExecutable = original
+        multiprocessing.get_context("spawn").set_executable(sys.executable)
+        shutil.rmtree(tempdir)
+
+
 def test_controller_signals():
     """was_finished emitted on completing any process
 
@@ -360,3 +691,475 @@ def test_controller_signals():
         "was_published": 1,
         "was_finished": 3,
     })
+
+
+@with_setup(clean)
+def test_execution_plan():
+    """Plan is compiled once collected, and recompiled when invalidated"""
+    count = {"#": 0}
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"])
+            context.create_instance("B", families=["myFamily"])
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["myFamily"]
+
+        def process(self, instance):
+            count["#"] += 1
+
+    class OtherValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["otherFamily"]
+
+    for plugin in (MyCollector, MyValidator, OtherValidator):
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.reset()
+
+    steps = dict((step.plugin.__name__, step) for step in ctrl.plan)
+    assert steps["OtherValidator"].pairs is None
+    assert [instance.name for _, instance in steps["MyValidator"].pairs] == [
+        "A", "B"
+    ]
+
+    # Toggling an instance invalidates the plan
+    ctrl.context[0].data["publish"] = False
+    ctrl.invalidate_plan()
+    ctrl.validate()
+
+    assert count["#"] == 1
+    steps = dict((step.plugin.__name__, step) for step in ctrl.plan)
+    assert [instance.name for _, instance in steps["MyValidator"].pairs] == [
+        "B"
+    ]
+
+
+@with_setup(clean)
+def test_dependency_graph():
+    """Plug-ins declaring their data run as soon as their data is ready"""
+    clean()
+
+    provided = threading.Event()
+    count = {"concurrent": False, "required": None}
+
+    class ProvideX(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+        provides_data = ["x"]
+
+        def process(self, context):
+            # Only set if ProvideY runs concurrently
+            count["concurrent"] = provided.wait(5)
+            context.data["x"] = 1
+
+    class ProvideY(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder + 0.1
+        provides_data = ["y"]
+
+        def process(self, context):
+            provided.set()
+            context.data["y"] = 2
+
+    class RequireX(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder - 0.1
+        requires_data = ["x"]
+
+        def process(self, context):
+            count["required"] = context.data.get("x")
+
+    for plugin in (ProvideX, ProvideY, RequireX):
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.use_dependency_graph = True
+    ctrl.reset()
+    ctrl.validate()
+
+    assert count["concurrent"]
+    assert count["required"] == 1
+
+
+def test_dependency_cycle():
+    """Plug-ins requiring data of one another are detected"""
+
+    class A(pyblish.api.ContextPlugin):
+        requires_data = ["b"]
+        provides_data = ["a"]
+
+    class B(pyblish.api.ContextPlugin):
+        requires_data = ["a"]
+        provides_data = ["b"]
+
+    class C(pyblish.api.ContextPlugin):
+        provides_data = ["c"]
+
+    assert control.dependency_waves([C, A]) == [[0, 1]]
+
+    try:
+        control.dependency_waves([A, B, C])
+    except control.DependencyCycle as e:
+        assert e.plugins == [A, B]
+    else:
+        assert False, "Cycle was not detected"
+
+
+@with_setup(clean)
+def test_revalidate():
+    """Only validators of data touched by an action are re-run"""
+    clean()
+
+    count = {"A": 0, "B": 0, "extracted": 0}
+
+    class Repair(pyblish.api.Action):
+        on = "failed"
+
+        def process(self, context, plugin):
+            for instance in context:
+                instance.data["fixed"] = True
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"], fixed=False)
+            context.create_instance("B", families=["myFamily"], fixed=True)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["myFamily"]
+        actions = [Repair]
+
+        def process(self, instance):
+            count[instance.name] += 1
+            assert instance.data["fixed"], "Not fixed"
+
+    class MyExtractor(pyblish.api.ContextPlugin):
+        order = pyblish.api.ExtractorOrder
+
+        def process(self, context):
+            count["extracted"] += 1
+
+    for plugin in (MyCollector, MyValidator, MyExtractor):
+        pyblish.api.register_plugin(plugin)
+
+    revalidated = []
+
+    ctrl = control.Controller()
+    ctrl.was_revalidated.connect(revalidated.extend)
+    ctrl.reset()
+    ctrl.validate()
+
+    assert ctrl.errored
+    assert count == {"A": 1, "B": 1, "extracted": 0}
+
+    validator = [p for p in ctrl.plugins if p.__name__ == "MyValidator"][0]
+    ctrl.act(validator, Repair)
+
+    assert ctrl.is_dirty()
+    assert ctrl.dirty_instances == set([ctrl.context[0].id])
+
+    ctrl.revalidate()
+
+    assert not ctrl.errored
+    assert not ctrl.is_dirty()
+    assert count == {"A": 2, "B": 1, "extracted": 0}
+    assert [(p.__name__, i.name) for p, i in revalidated] == [
+        ("MyValidator", "A")
+    ]
+
+    ctrl.publish()
+
+    assert count["extracted"] == 1
+
+
+@with_setup(clean)
+def test_revalidate_stop():
+    """Revalidation stops when asked, leaving what is left to revalidate"""
+    clean()
+
+    count = {"first": 0, "second": 0}
+    ctrl = control.Controller()
+
+    class Repair(pyblish.api.Action):
+        def process(self, context, plugin):
+            context.data["fixed"] = True
+
+    class FirstValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+        actions = [Repair]
+
+        def process(self, context):
+            count["first"] += 1
+            if context.data.get("fixed"):
+                ctrl.stop()
+
+    class SecondValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder + 0.1
+
+        def process(self, context):
+            count["second"] += 1
+
+    for plugin in (FirstValidator, SecondValidator):
+        pyblish.api.register_plugin(plugin)
+
+    stopped = []
+    revalidated = []
+
+    ctrl.was_stopped.connect(lambda: stopped.append(True))
+    ctrl.was_revalidated.connect(revalidated.extend)
+    ctrl.reset()
+    ctrl.validate()
+
+    generator = ctrl.pair_generator
+    del stopped[:]
+
+    validator = [
+        p for p in ctrl.plugins if p.__name__ == "FirstValidator"
+    ][0]
+    ctrl.act(validator, Repair)
+    ctrl.revalidate()
+
+    assert stopped
+    assert not revalidated
+    assert count == {"first": 2, "second": 1}, count
+    assert ctrl.is_dirty()
+    assert ctrl.pair_generator is generator
+
+    clean()
+
+
+@with_setup(clean)
+def test_preload():
+    """Plug-ins preloaded are discovered again only if registered anew"""
+    clean()
+
+    count = {"#": 0}
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            count["#"] += 1
+
+    class MyValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+    pyblish.api.register_plugin(MyCollector)
+
+    ctrl = control.Controller()
+    ctrl.preload()
+    plugins = ctrl.plugins
+
+    ctrl.reset()
+
+    assert ctrl.plugins is plugins
+    assert count["#"] == 1
+
+    # Registrations after preloading are picked up
+    ctrl.preload()
+    plugins = ctrl.plugins
+
+    pyblish.api.register_plugin(MyValidator)
+    pyblish.api.register_host("myHost")
+
+    try:
+        ctrl.reset()
+    finally:
+        pyblish.api.deregister_host("myHost")
+
+    assert ctrl.plugins is not plugins
+    assert "MyValidator" in [p.__name__ for p in ctrl.plugins]
+
+    ctrl.preload()
+    pyblish.api.deregister_all_plugins()
+    ctrl.reset()
+
+    assert "MyCollector" not in [p.__name__ for p in ctrl.plugins]
+
+    clean()
+
+
+@with_setup(clean)
+def test_timeout():
+    """Pairs over budget on a thread of their own are abandoned"""
+    clean()
+
+    release = threading.Event()
+    processed = []
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        timeout = 0.2
+
+        def process(self, instance):
+            if instance.name == "B":
+                release.wait(5)
+
+    class MyOtherValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder + 0.1
+
+        def process(self, context):
+            processed.append(context.data["cancelToken"].cancelled)
+
+    for plugin in [MyCollector, MyValidator, MyOtherValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    def publish(ctrl):
+        results = []
+        ctrl.watchdog.interval = 0.05
+        ctrl.was_processed.connect(results.append)
+
+        try:
+            ctrl.reset()
+            wait(ctrl)
+            ctrl.publish()
+            wait(ctrl)
+        finally:
+            release.set()
+            ctrl.cleanup()
+            release.clear()
+
+        return dict(
+            (result["instance"].name, result["error"])
+            for result in results
+            if result["plugin"].__name__ == "MyValidator"
+        )
+
+    for mode in ("parallel", "worker"):
+        MyValidator.parallel = mode == "parallel"
+
+        ctrl = control.Controller()
+        ctrl.use_worker_thread = mode == "worker"
+        errors = publish(ctrl)
+
+        assert errors["A"] is None, mode
+        assert isinstance(errors["B"], watchdog.PairTimeout), mode
+        assert "release.wait(5)" in errors["B"].formatted_traceback, mode
+
+        # Processing carries on
+        assert processed.pop() is False, mode
+
+    # Plug-ins may poll for cancellation
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            ctrl.stop()
+            processed.append(context.data["cancelToken"].cancelled)
+
+    clean()
+    pyblish.api.register_plugin(MyCollector)
+
+    ctrl = control.Controller()
+    ctrl.reset()
+
+    assert processed == [True]
+
+
+@with_setup(clean)
+def test_timings():
+    """Wall and CPU time is recorded per pair"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            # Busy, rather than idle
+            started = time.time()
+            while time.time() - started < 0.05:
+                pass
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    results = []
+
+    ctrl = control.Controller()
+    ctrl.was_processed.connect(results.append)
+    ctrl.reset()
+    ctrl.validate()
+
+    validator = [p for p in ctrl.plugins if p.__name__ == "MyValidator"][0]
+    wall, cpu = ctrl.plugin_timing(validator.id)
+
+    assert wall >= 0.1, wall
+    assert 0 < cpu <= wall, (cpu, wall)
+
+    wall, cpu = ctrl.instance_timing(ctrl.context[0].id)
+    assert 0.05 <= wall < 0.1, wall
+
+    for result in results:
+        assert sorted(result["timing"]) == ["cpu", "wall"]
+
+
+@with_setup(clean)
+def test_context_changed():
+    """Changes to the context are emitted ahead of the pair they follow"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", family="myFamily")
+            context.create_instance("B", family="myFamily")
+
+    class MyValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, context):
+            context.remove(context[1])
+            context[0].data["label"] = "Validated"
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    events = []
+
+    ctrl = control.Controller()
+    ctrl.context_changed.connect(
+        lambda changes: events.append(("changed", changes))
+    )
+    ctrl.was_processed.connect(
+        lambda result: events.append(("processed", result["plugin"]))
+    )
+    ctrl.reset()
+    ctrl.validate()
+
+    changes = [
+        (index, changes) for index, (event, changes) in enumerate(events)
+        if event == "changed"
+    ]
+
+    index, collected = [
+        (index, changes) for index, changes in changes if changes["added"]
+    ][0]
+    assert [i.name for i in collected["added"]] == ["A", "B"]
+    assert events[index + 1][1].__name__ == "MyCollector"
+
+    index, validated = changes[-1]
+    instance_a = ctrl.context[0]
+    assert validated["added"] == []
+    assert len(validated["removed"]) == 1
+    assert validated["changed"] == {instance_a.id: set(["label"])}
+    assert events[index + 1][1].__name__ == "MyValidator"
@@ -0,0 +1,191 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pyblish.api
+import pyblish.logic
+from pyblish_lite import discovery, settings
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+plugin_source = """
+import pyblish.api
+
+class {name}(pyblish.api.ContextPlugin):
+    order = {order}
+    targets = {targets}
+"""
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+def write(directory, name, order=0, targets=("default",), mtime=None):
+    path = os.path.join(directory, name.lower() + ".py")
+    with open(path, "w") as f:
+        f.write(plugin_source.format(
+            name=name, order=order, targets=list(targets)
+        ))
+
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+    return path
+
+
+@with_setup(clean)
+def test_discovery_cache():
+    """Unchanged modules are served from cache"""
+    clean()
+
+    directory = tempfile.mkdtemp()
+    original = settings.DiscoveryCacheFile
+    settings.DiscoveryCacheFile = os.path.join(directory, "cache.json")
+    discovery.invalidate()
+
+    try:
+        write(directory, "CollectA", order=0, mtime=1000)
+        write(directory, "CollectB", order=0.1, mtime=1000)
+        farm = write(directory, "CollectFarm", targets=["farm"], mtime=1000)
+
+        plugins = discovery.discover(paths=[directory], targets=["default"])
+
+        expected = pyblish.logic.plugins_by_targets(
+            pyblish.api.discover(paths=[directory]), ["default"]
+        )
+        assert [p.__name__ for p in plugins] == [
+            p.__name__ for p in expected
+        ] == ["CollectA", "CollectB"]
+
+        # Only modified modules are imported again
+        write(directory, "CollectB", order=0.2, mtime=2000)
+        rediscovered = discovery.discover(
+            paths=[directory], targets=["default"]
+        )
+
+        assert rediscovered[0] is plugins[0]
+        assert rediscovered[1] is not plugins[1]
+        assert rediscovered[1].order == 0.2
+
+        # Modules with no plug-in of interest are not imported in
+        # a new session, until modified
+        discovery._modules.clear()
+        discovery._index = None
+        discovery._last = None
+        sys.modules.pop(farm, None)
+
+        plugins = discovery.discover(paths=[directory], targets=["default"])
+
+        assert [p.__name__ for p in plugins] == ["CollectA", "CollectB"]
+        assert farm not in sys.modules
+
+        plugins = discovery.discover(paths=[directory], targets=["farm"])
+        assert [p.__name__ for p in plugins] == ["CollectFarm"]
+
+    finally:
+        discovery.invalidate()
+        settings.DiscoveryCacheFile = original
+        shutil.rmtree(directory)
+
+
+@with_setup(clean)
+def test_parallel_import():
+    """Modules compiled on threads are discovered as pyblish does"""
+    clean()
+
+    directory = tempfile.mkdtemp()
+    original = settings.DiscoveryCacheFile, settings.DiscoveryThreads
+    settings.DiscoveryCacheFile = os.path.join(directory, "cache.json")
+    settings.DiscoveryThreads = 4
+    discovery.invalidate()
+
+    try:
+        for index in range(20):
+            write(directory, "Collect%d" % index, order=index % 3)
+
+        # Broken modules are skipped, as with pyblish
+        with open(os.path.join(directory, "broken.py"), "w") as f:
+            f.write("def (")
+
+        plugins = discovery.discover(paths=[directory])
+        expected = pyblish.api.discover(paths=[directory])
+
+        assert len(plugins) == 20
+        assert [p.__name__ for p in plugins] == [
+            p.__name__ for p in expected
+        ]
+
+        timings = dict(discovery.timings())
+        timing = timings[os.path.join(directory, "collect0.py")]
+        assert sorted(timing) == ["compile", "execute", "read"]
+
+    finally:
+        discovery.invalidate()
+        settings.DiscoveryCacheFile, settings.DiscoveryThreads = original
+        shutil.rmtree(directory)
+
+
+@with_setup(clean)
+def test_discovery_cache_toggled():
+    """Plug-ins toggled in a session are as imported on next reset"""
+    clean()
+
+    directory = tempfile.mkdtemp()
+    original = settings.DiscoveryCacheFile
+    settings.DiscoveryCacheFile = os.path.join(directory, "cache.json")
+    discovery.invalidate()
+
+    try:
+        with open(os.path.join(directory, "validate.py"), "w") as f:
+            f.write(
+                "import pyblish.api\n"
+                "\n"
+                "class ValidateOptional(pyblish.api.ContextPlugin):\n"
+                "    order = pyblish.api.ValidatorOrder\n"
+                "    optional = True\n"
+            )
+
+        plugin, = discovery.discover(paths=[directory])
+        assert plugin.active
+
+        # As by the window, once unchecked
+        plugin.active = False
+        plugin.actions = []
+
+        rediscovered, = discovery.discover(paths=[directory])
+        assert rediscovered is plugin
+        assert rediscovered.active
+        assert "actions" not in rediscovered.__dict__
+
+        # Also once the paths are listed anew
+        discovery._last = None
+        plugin.active = False
+
+        rediscovered, = discovery.discover(paths=[directory])
+        assert rediscovered is plugin
+        assert rediscovered.active
+
+        # Registered plug-ins are reused and restored alike
+        class CollectRegistered(pyblish.api.ContextPlugin):
+            order = pyblish.api.CollectorOrder
+            optional = True
+
+        pyblish.api.register_plugin(CollectRegistered)
+
+        registered = discovery.discover(paths=[directory])[0]
+        assert registered.__name__ == "CollectRegistered"
+        registered.active = False
+
+        rediscovered = discovery.discover(paths=[directory])[0]
+        assert rediscovered is registered
+        assert rediscovered.active
+
+    finally:
+        discovery.invalidate()
+        settings.DiscoveryCacheFile = original
+        shutil.rmtree(directory)
@@ -0,0 +1,93 @@
+import copy
+import pickle
+
+import pyblish.api
+from pyblish_lite import control, families
+
+from nose.tools import with_setup
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+def test_family_index():
+    """Families are counted as instances are added, changed and removed"""
+    context = families.ObservedContext()
+    index = context.family_index
+
+    model = context.create_instance("A", family="model", families=["review"])
+    rig = context.create_instance("B", family="rig")
+
+    assert sorted(index.families()) == ["model", "review", "rig"]
+    assert index.instances("model") == [model]
+    assert index.instances() == [model, rig]
+
+    model.data["families"].append("lookdev")
+    assert index.count("lookdev") == 1
+
+    rig.data["publish"] = False
+    assert sorted(index.families()) == ["lookdev", "model", "review"]
+    assert index.instances("rig") == [rig]
+    assert index.instances("rig", active_only=True) == []
+
+    version = index.version
+    rig.data["family"] = "camera"
+    assert index.changed_since(version) == set(["rig", "camera"])
+
+    context.remove(model)
+    assert index.families() == []
+    assert index.instances() == [rig]
+
+
+def test_family_index_copies():
+    """Data of instances is copied and pickled without its index"""
+    context = families.ObservedContext()
+    instance = context.create_instance("A", families=["review"])
+
+    for data in (copy.deepcopy(instance.data),
+                 pickle.loads(pickle.dumps(instance.data))):
+        assert type(data) is dict
+        assert type(data["families"]) is list
+        assert data["families"] == ["review"]
+
+
+@with_setup(clean)
+def test_plan_follows_family_index():
+    """Instances deactivated during processing are not processed further"""
+    clean()
+
+    extracted = []
+
+    class CollectInstances(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", family="a", publish=True)
+            context.create_instance("B", family="a", publish=True)
+
+    class ValidateB(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["a"]
+
+        def process(self, instance):
+            if instance.name == "B":
+                instance.data["publish"] = False
+
+    class ExtractA(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+        families = ["a"]
+
+        def process(self, instance):
+            extracted.append(instance.name)
+
+    for plugin in (CollectInstances, ValidateB, ExtractA):
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.reset()
+    ctrl.publish()
+
+    assert extracted == ["A"], extracted
+
+    clean()
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+
+import pyblish.api
+from pyblish_lite import headless, util
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+@with_setup(clean)
+def test_headless_publish():
+    """Headless publish summarizes every pair"""
+    clean()
+
+    count = {"#": 0}
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"])
+
+    class MyExtractor(pyblish.api.InstancePlugin):
+        order = pyblish.api.ExtractorOrder
+        families = ["myFamily"]
+
+        def process(self, instance):
+            count["#"] += 1
+            self.log.info("Extracting")
+
+    pyblish.api.register_plugin(MyCollector)
+    pyblish.api.register_plugin(MyExtractor)
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+
+    try:
+        assert headless.publish(path) == 0
+
+        with open(path) as f:
+            summary = json.load(f)
+    finally:
+        os.remove(path)
+
+    assert count["#"] == 1
+    assert summary["success"]
+
+    result = [
+        result for result in summary["results"]
+        if result["plugin"] == "MyExtractor"
+    ][0]
+    assert result["instance"] == "A"
+    assert result["records"] == [{"level": "INFO", "message": "Extracting"}]
+
+
+@with_setup(clean)
+def test_headless_failure():
+    """Failed validation exits with non-zero status, without extracting"""
+    clean()
+
+    count = {"#": 0}
+
+    class MyValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, context):
+            assert False, "I was programmed to fail"
+
+    class MyExtractor(pyblish.api.ContextPlugin):
+        order = pyblish.api.ExtractorOrder
+
+        def process(self, context):
+            count["#"] += 1
+
+    pyblish.api.register_plugin(MyValidator)
+    pyblish.api.register_plugin(MyExtractor)
+
+    summary = headless.run()
+
+    assert not summary["success"]
+    assert count["#"] == 0
+    errors = [
+        result["error"] for result in summary["results"]
+        if result["plugin"] == "MyValidator"
+    ]
+    assert errors[0].startswith("I was programmed to fail")
+
+
+@with_setup(clean)
+def test_headless_unexpected_error():
+    """Errors outside of plug-ins fail the publish, leaving no delay set"""
+    clean()
+
+    class MyValidator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def __init__(self):
+            raise RuntimeError("Not even processed")
+
+    pyblish.api.register_plugin(MyValidator)
+
+    delay = os.environ.get("PYBLISH_DELAY")
+    os.environ["PYBLISH_DELAY"] = "2"
+    multiplier, util._delay_multiplier = util._delay_multiplier, 2.0
+
+    try:
+        summary = headless.run()
+
+        assert os.environ["PYBLISH_DELAY"] == "2"
+        assert util._delay_multiplier == 2.0
+
+    finally:
+        if delay is None:
+            os.environ.pop("PYBLISH_DELAY")
+        else:
+            os.environ["PYBLISH_DELAY"] = delay
+
+        util._delay_multiplier = multiplier
+
+    assert not summary["success"]
+    assert len(summary["errors"]) == 1, summary["errors"]
+    assert "Not even processed" in summary["errors"][0]
@@ -0,0 +1,95 @@
+import gc
+import logging
+import weakref
+
+import pyblish.api
+from pyblish_lite import control, leaks, model
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+    del leaks._tracked[:]
+
+
+@with_setup(clean)
+def test_cleanup():
+    """Nothing of a session outlives its controller"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"])
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["myFamily"]
+
+        def process(self, instance):
+            self.log.info("Validating %s" % instance)
+            raise ValueError("Invalid")
+
+    pyblish.api.register_plugin(MyCollector)
+    pyblish.api.register_plugin(MyValidator)
+
+    ctrl = control.Controller()
+    results = []
+
+    # E.g. a window, holding on to results
+    ctrl.was_processed.connect(results.append)
+
+    # Captured records of errors would keep their tracebacks alive
+    log = logging.getLogger("pyblish.plugin")
+    log.propagate = False
+
+    try:
+        ctrl.reset()
+        ctrl.validate()
+    finally:
+        log.propagate = True
+
+    assert results
+
+    leaks.track(ctrl, "Controller")
+    leaks.track(ctrl.context, "Context")
+    leaks.track(ctrl.context[0], "Instance")
+
+    ctrl.cleanup()
+    assert ctrl.context is None
+
+    ctrl = None
+    del results[:]
+    assert leaks.report() == []
+
+
+@with_setup(clean)
+def test_report():
+    """Objects still alive are reported"""
+    clean()
+
+    context = pyblish.api.Context()
+    leaks.track(context, "Context")
+
+    assert leaks.report() == ["Context"]
+
+    del context
+    assert leaks.report() == []
+
+
+def test_terminal_proxies():
+    """Terminal proxies are forgotten once deleted"""
+    proxy = model.TerminalProxy(None)
+    ref = weakref.ref(proxy)
+    assert proxy in model.TerminalProxy.instances
+
+    del proxy
+    gc.collect()
+
+    assert ref() is None
+    model.TerminalProxy.change_filter("info", True)
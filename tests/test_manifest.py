@@ -0,0 +1,91 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pyblish.api
+from pyblish_lite import control, discovery, manifest, settings
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+plugin_source = """
+import pyblish.api
+
+class {name}(pyblish.api.InstancePlugin):
+    order = pyblish.api.ValidatorOrder
+    families = ["myFamily"]
+    label = "{name} label"
+
+    def process(self, instance):
+        instance.data["{name}"] = True
+"""
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+    pyblish.api.deregister_all_paths()
+
+
+def write(directory, name, mtime):
+    path = os.path.join(directory, name.lower() + ".py")
+    with open(path, "w") as f:
+        f.write(plugin_source.format(name=name))
+
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@with_setup(clean)
+def test_lazy_plugins():
+    """Plug-ins in a manifest are imported once processed"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"])
+
+    directory = tempfile.mkdtemp()
+    validator = write(directory, "ValidateLazy", mtime=1000)
+
+    manifest.generate(directory)
+    sys.modules.pop(validator, None)
+
+    original = (settings.LazyPlugins, settings.DiscoveryCacheFile)
+    settings.LazyPlugins = True
+    settings.DiscoveryCacheFile = os.path.join(directory, "cache.json")
+    discovery.invalidate()
+
+    pyblish.api.register_plugin(MyCollector)
+    pyblish.api.register_plugin_path(directory)
+
+    try:
+        ctrl = control.Controller()
+        ctrl.reset()
+
+        stub = [p for p in ctrl.plugins if p.__name__ == "ValidateLazy"][0]
+        assert manifest.is_stub(stub)
+        assert stub.label == "ValidateLazy label"
+        assert validator not in sys.modules
+
+        ctrl.validate()
+
+        assert validator in sys.modules
+        assert ctrl.context[0].data["ValidateLazy"]
+
+        # Files modified since the manifest are imported as usual
+        write(directory, "ValidateLazy", mtime=2000)
+        plugins = discovery.discover(lazy=True)
+
+        assert not manifest.is_stub(
+            [p for p in plugins if p.__name__ == "ValidateLazy"][0]
+        )
+
+    finally:
+        discovery.invalidate()
+        settings.LazyPlugins, settings.DiscoveryCacheFile = original
+        shutil.rmtree(directory)
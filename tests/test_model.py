@@ -1,8 +1,11 @@
 # -*- coding=UTF-8 -*-
 import logging
 
-from pyblish_lite import model
+import pyblish.api
+from pyblish_lite import control, model, records, settings
+from pyblish_lite.constants import PluginStates, Roles
 from pyblish_lite.vendor import six
+from pyblish_lite.vendor.Qt import QtGui
 
 
 def test_label_nonstring():
@@ -29,3 +32,270 @@ def test_label_nonstring():
     for item in model_:
         assert isinstance(item.data(model.Label), six.text_type), (
             "\"%s\" wasn't a string!" % item.data(model.Label))
+
+
+def test_terminal_model():
+    """Terminal rows are labels, with details read from the record store"""
+    store = records.RecordStore()
+    records_ = [
+        {"label": "Record %d\nMore" % index,
+         "type": "record",
+         "levelno": logging.INFO,
+         "msg": "Record %d" % index}
+        for index in range(1000)
+    ]
+
+    model_ = model.TerminalModel(store)
+    model_.update_with_result({
+        "records": records_,
+        "record_ids": [store.add(record) for record in records_],
+    })
+    model_.append({"label": "About to reset..", "type": "info"})
+
+    assert model_.rowCount() == 1001
+
+    label = model_.index(10, 0)
+    assert label.data() == "Record 10"
+    assert label.data(Roles.TypeRole) == model.TerminalLabelType
+    assert label.data(Roles.TerminalItemTypeRole) == "log_info"
+    assert model_.rowCount(label) == 1
+
+    detail = model_.index(0, 0, label)
+    assert detail.parent() == label
+    assert detail.data(Roles.TypeRole) == model.TerminalDetailType
+    assert "Record&nbsp;10" in detail.data()
+    assert model_.rowCount(detail) == 0
+
+    # Records without an id are kept as-is
+    info = model_.index(1000, 0)
+    assert model_.index(0, 0, info).data() == "About to reset.."
+
+    model_.reset()
+    store.close()
+    assert model_.rowCount() == 0
+
+
+def test_terminal_record_ids():
+    """Records given by id are read from the store a page at a time"""
+    store = records.RecordStore()
+    record_ids = [
+        store.add({"label": "Record %d" % index, "type": "info"})
+        for index in range(1000)
+    ]
+
+    paged = []
+    page = store.page
+
+    def read(ids):
+        paged.append(len(ids))
+        return page(ids)
+
+    store.page = read
+
+    model_ = model.TerminalModel(store)
+    model_.set_record_ids(record_ids)
+
+    assert model_.rowCount() == 0
+    assert model_.canFetchMore()
+    assert not paged, "Should not have read before being fetched"
+
+    model_.fetchMore()
+    assert model_.rowCount() == settings.TerminalPageSize
+    assert paged == [settings.TerminalPageSize]
+
+    while model_.canFetchMore():
+        model_.fetchMore()
+
+    assert model_.rowCount() == 1000
+    assert max(paged) == settings.TerminalPageSize
+    assert model_.index(999, 0).data() == "Record 999"
+
+    # Nothing left over from before
+    model_.set_record_ids(record_ids[:1])
+    model_.fetchMore()
+    assert model_.rowCount() == 1
+    assert not model_.canFetchMore()
+
+    store.close()
+
+
+def test_terminal_detail_lines():
+    """Long values are cut short in details, and rendered once"""
+    traceback = "\n".join("Line %d" % index for index in range(1000))
+    error = {"label": "Error", "type": "error", "traceback": traceback}
+
+    model_ = model.TerminalModel()
+    model_.append(error)
+
+    rendered = []
+    prepare_detail_text = model_.prepare_detail_text
+
+    def render(*args):
+        rendered.append(args)
+        return prepare_detail_text(*args)
+
+    model_.prepare_detail_text = render
+
+    detail = model_.index(0, 0, model_.index(0, 0))
+    text = detail.data()
+
+    lines = settings.TerminalDetailLines
+    assert "Line&nbsp;%d" % (lines - 1) in text
+    assert "Line&nbsp;%d" % lines not in text
+    assert model.detail_note("Traceback", 1000 - lines) in text
+
+    title, remainder = detail.data(Roles.TerminalRemainderRole)[0]
+    assert title == "Traceback"
+    assert remainder == traceback.split("\n")[lines:]
+
+    # Rendered once, then cached
+    assert detail.data() == text
+    assert len(rendered) == 1
+
+    # Full text remains available
+    assert "Line&nbsp;999" in model_.prepare_detail_text(error)
+
+
+def test_emit_changed():
+    """Changes of many items are emitted once per parent"""
+    model_ = QtGui.QStandardItemModel()
+    groups = [QtGui.QStandardItem("Group %d" % index) for index in range(2)]
+    for group in groups:
+        model_.appendRow(group)
+        group.appendRows([QtGui.QStandardItem(str(row)) for row in range(5)])
+
+    changed = []
+    model_.dataChanged.connect(
+        lambda first, last, *args: changed.append(
+            (first.parent().row(), first.row(), last.row())
+        )
+    )
+
+    model_.blockSignals(True)
+    items = [groups[0].child(1), groups[0].child(3), groups[1].child(4)]
+    for item in items:
+        item.setText("Changed")
+    model_.blockSignals(False)
+
+    model.emit_changed(model_, items + [None])
+
+    assert sorted(changed) == [(-1, 0, 1), (0, 1, 3), (1, 4, 4)], changed
+
+
+def test_update_compatibility():
+    """Only plug-ins of changed families are checked anew"""
+    pyblish.api.deregister_all_plugins()
+
+    class CollectInstances(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", family="a", publish=True)
+            context.create_instance("B", family="b", publish=True)
+
+    class ValidateA(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["a"]
+
+    class ValidateB(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["b"]
+
+    class ValidateC(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["c"]
+
+    for plugin in (CollectInstances, ValidateA, ValidateB, ValidateC):
+        pyblish.api.register_plugin(plugin)
+
+    try:
+        ctrl = control.Controller()
+        ctrl.reset()
+
+        model_ = model.PluginModel(ctrl)
+        for plugin in ctrl.plugins:
+            model_.append(plugin)
+
+        proxy = model.PluginFilterProxy()
+        proxy.setSourceModel(model_)
+
+        def visible():
+            return sorted(
+                proxy.index(row, 0, proxy.index(group, 0)).data()
+                for group in range(proxy.rowCount())
+                for row in range(proxy.rowCount(proxy.index(group, 0)))
+                if proxy.index(row, 0, proxy.index(group, 0)).data() in (
+                    "ValidateA", "ValidateB", "ValidateC"
+                )
+            )
+
+        model_.update_compatibility()
+        assert visible() == ["ValidateA", "ValidateB"]
+
+        checked = []
+        is_compatible = ctrl.family_index.is_compatible
+
+        def check(plugin):
+            checked.append(plugin.__name__)
+            return is_compatible(plugin)
+
+        ctrl.family_index.is_compatible = check
+
+        instance_b = [i for i in ctrl.context if i.name == "B"][0]
+        instance_b.data["publish"] = False
+        model_.update_compatibility()
+
+        assert checked == ["ValidateB"], checked
+        assert visible() == ["ValidateA"]
+
+        # Nothing changed
+        model_.update_compatibility()
+        assert checked == ["ValidateB"], checked
+
+    finally:
+        pyblish.api.deregister_all_plugins()
+
+
+def test_update_compatibility_exact():
+    """Exact plug-ins follow removal of other families of an instance"""
+    pyblish.api.deregister_all_plugins()
+
+    class CollectInstances(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance(
+                "A", family="a", families=["b"], publish=True
+            )
+
+    class ValidateExact(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["a"]
+        match = pyblish.api.Exact
+
+    for plugin in (CollectInstances, ValidateExact):
+        pyblish.api.register_plugin(plugin)
+
+    try:
+        ctrl = control.Controller()
+        ctrl.reset()
+
+        model_ = model.PluginModel(ctrl)
+        for plugin in ctrl.plugins:
+            model_.append(plugin)
+
+        item = model_.plugin_items[ValidateExact.id]
+
+        def is_compatible():
+            states = item.data(Roles.PublishFlagsRole)
+            return bool(states & PluginStates.IsCompatible)
+
+        model_.update_compatibility()
+        assert not is_compatible()
+
+        ctrl.context[0].data["families"].remove("b")
+        model_.update_compatibility()
+        assert is_compatible()
+
+    finally:
+        pyblish.api.deregister_all_plugins()
@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+
+import pyblish.api
+from pyblish_lite import control, settings
+
+# Vendor libraries
+from nose.tools import (
+    with_setup,
+)
+
+
+def clean():
+    pyblish.api.deregister_all_plugins()
+
+
+def busy_work():
+    return sum(i * i for i in range(1000))
+
+
+@with_setup(clean)
+def test_profile():
+    """Each pair is profiled, and merged into a profile of the session"""
+    clean()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", families=["myFamily"])
+            context.create_instance("B", families=["myFamily"])
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["myFamily"]
+
+        def process(self, instance):
+            busy_work()
+
+    pyblish.api.register_plugin(MyCollector)
+    pyblish.api.register_plugin(MyValidator)
+
+    directory = tempfile.mkdtemp()
+    original = settings.ProfileDirectory
+    settings.ProfileDirectory = directory
+
+    try:
+        ctrl = control.Controller()
+        ctrl.profiler.enabled = True
+        ctrl.reset()
+        ctrl.validate()
+
+        validator = [p for p in ctrl.plugins if p.__name__ == "MyValidator"][0]
+
+        files = sorted(os.listdir(directory))
+        assert len([f for f in files if "MyValidator" in f]) == 2, files
+        assert len([f for f in files if "MyCollector" in f]) == 1, files
+        assert "session.pstats" in files, files
+
+        assert ctrl.profiler.has_profile(validator.id)
+        assert "busy_work" in ctrl.profiler.top(validator.id)
+
+        # Off by default
+        ctrl = control.Controller()
+        ctrl.profiler.enabled = False
+        ctrl.reset()
+        assert not ctrl.profiler.paths
+
+    finally:
+        settings.ProfileDirectory = original
+        shutil.rmtree(directory)
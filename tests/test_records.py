@@ -0,0 +1,125 @@
+import logging
+import os
+import shutil
+import tempfile
+
+import pyblish.api
+from pyblish_lite import control, model, records
+
+
+def record(index, levelno=20):
+    return {
+        "label": "Record %d" % index,
+        "type": "record",
+        "levelno": levelno,
+        "msg": "Record %d " % index + "x" * 100,
+    }
+
+
+def test_spill():
+    """Records beyond budget are spilled to disk, and read back"""
+    directory = tempfile.mkdtemp()
+    size = records.size_of(record(0))
+
+    store = records.RecordStore(budget=size * 10, directory=directory)
+
+    try:
+        ids = [store.add(record(index)) for index in range(100)]
+
+        # Newest records remain in memory
+        assert store.size <= size * 10
+        assert 80 < store.spilled < 100
+        assert ids[-1] in store._ordinary
+        assert os.path.exists(store.path)
+
+        assert store.get(ids[0]) == record(0)
+        assert store.get(ids[-1]) == record(99)
+        assert store.page(ids[::-1]) == [
+            record(index) for index in reversed(range(100))
+        ]
+
+        store.reset()
+        assert len(store) == 0
+        assert store.spilled == 0
+
+    finally:
+        store.close()
+        assert not os.listdir(directory)
+        shutil.rmtree(directory)
+
+
+def test_severe_records_remain():
+    """Warnings and errors are the last to be spilled"""
+    directory = tempfile.mkdtemp()
+    size = records.size_of(record(0))
+
+    store = records.RecordStore(budget=size * 10, directory=directory)
+
+    try:
+        warning = store.add(record(0, levelno=30))
+        error = store.add({"label": "Failed", "type": "error"})
+
+        for index in range(1, 100):
+            store.add(record(index))
+
+        assert warning in store._severe
+        assert error in store._severe
+        assert store.get(error)["label"] == "Failed"
+
+    finally:
+        store.close()
+        shutil.rmtree(directory)
+
+
+def test_spilled_results():
+    """Records spilled to disk are not kept alive by results"""
+    pyblish.api.deregister_all_plugins()
+
+    class MyCollector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for index in range(10):
+                context.create_instance("I%d" % index)
+
+    class MyValidator(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, instance):
+            for index in range(10):
+                self.log.info("Record %d " % index + "x" * 100)
+
+    for plugin in [MyCollector, MyValidator]:
+        pyblish.api.register_plugin(plugin)
+
+    ctrl = control.Controller()
+    ctrl.record_store.budget = records.size_of(record(0)) * 10
+    terminal = model.TerminalModel(ctrl.record_store)
+
+    # As the window does
+    ctrl.was_processed.connect(
+        lambda result: terminal.extend(*terminal.store_result(result))
+    )
+
+    try:
+        ctrl.reset()
+        ctrl.publish()
+
+        assert ctrl.record_store.spilled > 50, ctrl.record_store.spilled
+
+        for result in ctrl.context.data["results"]:
+            assert "record_ids" not in result, result
+            assert all(
+                isinstance(record, logging.LogRecord)
+                for record in result["records"]
+            ), result["records"]
+
+        # Spilled rows are read back from disk
+        first = terminal._rows[0]
+        assert first.record is None
+        assert first.record_id not in ctrl.record_store._ordinary
+        assert terminal.record(first)["type"] == "record"
+
+    finally:
+        ctrl.cleanup()
+        pyblish.api.deregister_all_plugins()
@@ -0,0 +1,108 @@
+import os
+import time
+
+from pyblish_lite import util
+from pyblish_lite.vendor.Qt import QtCore
+
+
+def with_delay(multiplier):
+    """Run the decorated test with `multiplier` applied to delays"""
+    def decorator(func):
+        def wrapper():
+            previous = util._delay_multiplier
+            util._delay_multiplier = multiplier
+            try:
+                func()
+            finally:
+                util._delay_multiplier = previous
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+def test_delay_multiplier():
+    """Delays are multiplied as per PYBLISH_DELAY, read once"""
+    previous = util._delay_multiplier
+    util._delay_multiplier = None
+
+    try:
+        os.environ["PYBLISH_DELAY"] = "2.5"
+        assert util.delay_multiplier() == 2.5
+
+        os.environ["PYBLISH_DELAY"] = "0"
+        assert util.delay_multiplier() == 2.5, "Should have been read once"
+
+    finally:
+        os.environ["PYBLISH_DELAY"] = "0"
+        util._delay_multiplier = previous
+
+
+@with_delay(1)
+def test_scheduler_budget():
+    """Frames expire once their budget is spent"""
+    scheduler = util.FrameScheduler(budget=50.0)
+    scheduler.start()
+
+    assert not scheduler.expired()
+    assert 0 < scheduler.remaining() <= 50.0
+
+    time.sleep(0.06)
+    assert scheduler.expired()
+
+
+@with_delay(1)
+def test_scheduler_latency():
+    """Time spent by the event loop is taken off the next frame"""
+    scheduler = util.FrameScheduler(budget=50.0)
+    scheduler.start()
+
+    # Yielded, and held up by the event loop
+    scheduler.yielded = time.time() - 0.04
+    scheduler.start()
+
+    assert scheduler.latency > 0
+    assert scheduler.yielded is None
+    assert scheduler.remaining() < 50.0 - scheduler.latency + 1
+
+    # Never less than the minimum, however busy the event loop
+    scheduler.latency = 1000.0
+    scheduler.start()
+    assert 0 < scheduler.remaining() <= scheduler.minimum
+
+
+@with_delay(1)
+def test_scheduler_yield():
+    """Scheduled work runs once the event loop has had its turn"""
+    app = QtCore.QCoreApplication.instance()
+    scheduler = util.FrameScheduler()
+    scheduler.start()
+
+    called = []
+    scheduler.schedule(lambda: called.append(True))
+
+    assert not called, "Should have waited for the event loop"
+    assert scheduler.yielded is not None
+
+    end = time.time() + 1
+    while not called and time.time() < end:
+        app.processEvents()
+
+    assert called
+
+
+@with_delay(0)
+def test_scheduler_synchronous():
+    """Without delay, frames never expire and work runs right away"""
+    scheduler = util.FrameScheduler(budget=0.0)
+    scheduler.start()
+
+    time.sleep(0.01)
+    assert not scheduler.expired()
+
+    called = []
+    scheduler.schedule(lambda: called.append(True))
+
+    assert called
+    assert scheduler.yielded is None